@@ -0,0 +1,47 @@
+import signal
+import time
+from typing import Optional
+
+# semnalul prin care procesul principal anuleaza jobul curent al unui lucrator (doar pe Unix)
+SEMNAL_ANULARE = getattr(signal, 'SIGUSR1', None)
+
+
+class Anulat(Exception):
+    """Ridicata de `JetonAnulare.verifica` cand jobul curent si-a depasit termenul."""
+
+
+class JetonAnulare:
+    """
+    Anulare cooperativa a jobului curent dintr-un proces lucrator: lucratorul fixeaza termenul
+    inainte de job (`porneste`), iar buclele principale ale solverilor apeleaza `verifica()`,
+    care ridica `Anulat` dupa termen. Solverul se opreste curat, iar lucratorul raporteaza
+    TIMEOUT si ramane in pool, fara sa fie oprit fortat si inlocuit. Acelasi mecanism opreste
+    un job anulat din afara (de ex. solverii care au pierdut cursa din portofoliu): semnalul
+    SEMNAL_ANULARE expira termenul (`anuleaza`).
+    Fara termen (de ex. solverii apelati direct, in afara pool-ului) verificarea costa un
+    singur test.
+    """
+    __slots__ = ('termen',)
+
+    def __init__(self):
+        self.termen: Optional[float] = None      # momentul (perf_counter) dupa care jobul e anulat
+
+    def porneste(self, timeout: Optional[float]) -> None:
+        """Fixeaza termenul jobului care incepe acum (None = fara termen)."""
+        self.termen = None if timeout is None else time.perf_counter() + timeout
+
+    def opreste(self) -> None:
+        self.termen = None
+
+    def anuleaza(self) -> None:
+        """Expira imediat termenul jobului curent."""
+        self.termen = float('-inf')
+
+    def verifica(self) -> None:
+        """Ridica `Anulat` daca termenul jobului curent a trecut."""
+        if self.termen is not None and time.perf_counter() > self.termen:
+            raise Anulat()
+
+
+# jetonul procesului curent, fixat de bucla lucratorului (vezi pool_lucratori)
+JETON = JetonAnulare()
@@ -0,0 +1,365 @@
+import io
+import json
+import contextlib
+import os
+import sys
+import time
+import random
+import argparse
+import platform
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from fnc import iter_formulas
+from main import _run_batch, SOLVERS, SOLVERI_CU_CONTOARE, DEFAULT_TIMEOUT
+from pool_lucratori import PoolLucratori, OK, TIMEOUT
+from selectie import caracteristici, calibreaza, MOTOARE
+
+Formula = Set[FrozenSet[int]]
+
+# solverii rulati implicit (Rezolutie explodeaza pe familiile structurate; se cere explicit)
+SOLVERI_IMPLICITI = ('DP', 'DPLL', 'DPLL-Trail', 'CDCL')
+
+# regresiile de timp sub acest prag absolut (secunde) sunt considerate zgomot
+PRAG_ABSOLUT_TIMP = 0.005
+
+# ---------------------------------------------------------------- generatoare
+
+
+def k_sat_aleator(n: int, raport: float = 4.26, k: int = 3, seed: int = 0) -> Formula:
+    """
+    k-SAT aleator uniform: round(raport * n) clauze cu cate k variabile distincte si semne
+    aleatoare. Pentru 3-SAT, raportul 4.26 este in jurul tranzitiei de faza (cele mai grele).
+    """
+    rnd = random.Random(seed)
+    clauze: Formula = set()
+    while len(clauze) < round(raport * n):
+        clauze.add(frozenset(v if rnd.random() < 0.5 else -v for v in rnd.sample(range(1, n + 1), k)))
+    return clauze
+
+
+def porumbei(n: int) -> Formula:
+    """
+    Principiul cutiei (pigeonhole): n + 1 porumbei in n cutii, fiecare porumbel intr-o cutie,
+    cel mult unul pe cutie. Mereu UNSAT si exponential pentru rezolutie si DPLL.
+    Variabila p(i, j) = porumbelul i sta in cutia j.
+    """
+    def p(i: int, j: int) -> int:
+        return i * n + j + 1
+
+    clauze: Formula = {frozenset(p(i, j) for j in range(n)) for i in range(n + 1)}
+    for j in range(n):
+        for i in range(n + 1):
+            for i2 in range(i + 1, n + 1):
+                clauze.add(frozenset((-p(i, j), -p(i2, j))))
+    return clauze
+
+
+def colorare(noduri: int, muchii: int, culori: int = 3, seed: int = 0) -> Formula:
+    """
+    Colorarea unui graf aleator cu `noduri` si `muchii` cu `culori` culori: fiecare nod are
+    cel putin o culoare, cel mult una, iar capetele fiecarei muchii au culori diferite.
+    Variabila x(v, c) = nodul v are culoarea c.
+    """
+    rnd = random.Random(seed)
+
+    def x(v: int, c: int) -> int:
+        return v * culori + c + 1
+
+    clauze: Formula = set()
+    for v in range(noduri):
+        clauze.add(frozenset(x(v, c) for c in range(culori)))
+        for c in range(culori):
+            for c2 in range(c + 1, culori):
+                clauze.add(frozenset((-x(v, c), -x(v, c2))))
+    perechi = set()
+    while len(perechi) < muchii:
+        u, v = sorted(rnd.sample(range(noduri), 2))
+        perechi.add((u, v))
+    for u, v in sorted(perechi):
+        for c in range(culori):
+            clauze.add(frozenset((-x(u, c), -x(v, c))))
+    return clauze
+
+
+def lant(n: int, satisfiabil: bool = False) -> Formula:
+    """
+    Lant de implicatii x1 -> x2 -> ... -> xn, cu x1 adevarat; cu `satisfiabil=False`
+    se cere si -xn. Rezolvat doar prin propagarea unitatilor: masoara costul ei pe pas.
+    """
+    clauze: Formula = {frozenset((-i, i + 1)) for i in range(1, n)}
+    clauze.add(frozenset((1,)))
+    if not satisfiabil:
+        clauze.add(frozenset((-n,)))
+    return clauze
+
+
+def suita_implicita(seed: int = 0, intrare: Optional[str] = 'intrare.txt') -> Dict[str, Dict[str, Formula]]:
+    """
+    Cazurile de benchmark, fiecare cu formulele lui (nume -> formula), reproductibile din `seed`:
+    3-SAT aleator la tranzitia de faza, principiul cutiei, colorari de grafuri, lanturi de
+    implicatii si formulele din `intrare` (daca fisierul exista).
+    """
+    suita: Dict[str, Dict[str, Formula]] = {
+        '3sat-n20': {f"n20-{i}": k_sat_aleator(20, seed=seed * 1000 + i) for i in range(10)},
+        '3sat-n30': {f"n30-{i}": k_sat_aleator(30, seed=seed * 1000 + 100 + i) for i in range(3)},
+        'porumbei': {f"php-{n}": porumbei(n) for n in (4, 5)},
+        'colorare': {f"col-{i}": colorare(24, 55, seed=seed * 1000 + 200 + i) for i in range(4)},
+        # DPLL recursiv depaseste limita de recursivitate a Python-ului pe lanturi mult mai lungi
+        'lant': {'lant-300': lant(300), 'lant-300-sat': lant(300, True)},
+    }
+    if intrare and os.path.isfile(intrare):
+        suita['intrare'] = dict(iter_formulas(intrare))
+    return suita
+
+
+# ---------------------------------------------------------------- masurare
+
+
+def percentila(valori: List[float], p: float) -> float:
+    """Percentila `p` (0..100) prin metoda rangului cel mai apropiat; valorile nu trebuie sortate."""
+    ordonate = sorted(valori)
+    k = max(0, min(len(ordonate) - 1, -(-len(ordonate) * p // 100) - 1))
+    return ordonate[int(k)]
+
+
+class _Colector:
+    """Aduna inregistrarile unei rulari de batch (apelat ca `inregistrari` de _run_batch)."""
+
+    def __init__(self):
+        self.rezultate: Dict[str, List[Tuple[str, str, Any]]] = {}
+
+    def __call__(self, formula: str, solver: str, stare: str, valoare: Any) -> None:
+        self.rezultate.setdefault(solver, []).append((formula, stare, valoare))
+
+
+def _rezumat_rulare(rezultate: List[Tuple[str, str, Any]]) -> Dict[str, Any]:
+    """
+    Timpul total, varful de memorie, contoarele adunate, verdictele si duratele pe formula
+    (None la timeout / eroare) ale unei rulari a unui solver.
+    """
+    timp = 0.0
+    varf = 0.0
+    contoare: Dict[str, float] = {}
+    verdicte: Dict[str, Optional[bool]] = {}
+    durate: Dict[str, Optional[float]] = {}
+    timeouturi = erori = 0
+    for formula, stare, valoare in rezultate:
+        if stare != OK:
+            timeouturi += stare == TIMEOUT
+            erori += stare != TIMEOUT
+            verdicte[formula] = None
+            durate[formula] = None
+            continue
+        timp += valoare.durata or 0.0
+        durate[formula] = valoare.durata
+        varf = max(varf, valoare.peak_kib or 0.0)
+        verdicte[formula] = valoare.sat
+        for k, v in valoare.statistici.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool) and not k.startswith('t_'):
+                contoare[k] = contoare.get(k, 0) + v
+    return {'timp': timp, 'peak_kib': varf, 'contoare': contoare, 'verdicte': verdicte,
+            'durate': durate, 'timeouturi': timeouturi, 'erori': erori}
+
+
+def _o_rulare(formule: Dict[str, Formula], solveri: List[str], pool: PoolLucratori,
+              optiuni: Dict[str, Dict[str, Any]], timeout: float, nivel_masurare: str) -> Dict[str, Dict[str, Any]]:
+    """O trecere a batch-ului peste formulele cazului; rezumatul ei pe fiecare solver."""
+    colector = _Colector()
+    # liniile obisnuite ale batch-ului nu se afiseaza; rezultatele vin prin `colector`
+    with contextlib.redirect_stdout(io.StringIO()):
+        _run_batch(formule, solveri, io.StringIO(), optiuni, pool, timeout=timeout,
+                   nivel_masurare=nivel_masurare, inregistrari=colector)
+    return {n: _rezumat_rulare(colector.rezultate.get(n, [])) for n in solveri}
+
+
+def ruleaza_caz(formule: Dict[str, Formula], solveri: List[str], pool: PoolLucratori,
+                repetari: int = 5, incalzire: int = 1, timeout: float = DEFAULT_TIMEOUT,
+                memorie: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Ruleaza un caz prin `_run_batch` (acelasi drum ca modul batch), de `incalzire` ori fara
+    inregistrare si apoi de `repetari` ori, la nivelul de masurare 'timp'. Cu `memorie`, o
+    trecere separata la nivelul 'tracemalloc' da varful de memorie, fara sa incetineasca
+    repetarile cronometrate. Pentru fiecare solver rezultatul contine: timpul total al cazului
+    (mediana, p90, minim, toate repetarile), varful de memorie (KiB, None fara `memorie`),
+    contoarele interne (din ultima repetare, fara timpii pe faze), numarul de verdicte
+    SAT/UNSAT/UNK, timeout-urile, erorile si mediana duratei pe fiecare formula (`durate`,
+    None daca formula nu a raspuns in toate repetarile; folosita de `calibreaza`).
+    """
+    optiuni = {n: {'contoare': True} for n in solveri if n in SOLVERI_CU_CONTOARE}
+    rulari: Dict[str, List[Dict[str, Any]]] = {n: [] for n in solveri}
+    for i in range(incalzire + repetari):
+        rezumat = _o_rulare(formule, solveri, pool, optiuni, timeout, 'timp')
+        if i >= incalzire:
+            for n in solveri:
+                rulari[n].append(rezumat[n])
+    varfuri = _o_rulare(formule, solveri, pool, optiuni, timeout, 'tracemalloc') if memorie else {}
+
+    rezultat: Dict[str, Dict[str, Any]] = {}
+    for n, lista in rulari.items():
+        timpi = [r['timp'] for r in lista]
+        ultima = lista[-1]
+        verdicte = list(ultima['verdicte'].values())
+        durate = {f: None if any(r['durate'][f] is None for r in lista)
+                  else percentila([r['durate'][f] for r in lista], 50)
+                  for f in ultima['durate']}
+        rezultat[n] = {
+            'mediana': percentila(timpi, 50),
+            'p90': percentila(timpi, 90),
+            'minim': min(timpi),
+            'timpi': timpi,
+            'peak_kib': varfuri[n]['peak_kib'] if memorie else None,
+            'contoare': ultima['contoare'],
+            'sat': verdicte.count(True),
+            'unsat': verdicte.count(False),
+            'unk': verdicte.count(None),
+            'timeouturi': ultima['timeouturi'],
+            'erori': ultima['erori'],
+            'durate': durate,
+        }
+    return rezultat
+
+
+def ruleaza_suita(suita: Dict[str, Dict[str, Formula]], solveri: List[str], nr_lucratori: int = 1,
+                  afiseaza: Callable[[str], None] = print, **optiuni) -> Dict[str, Any]:
+    """
+    Ruleaza toate cazurile suitei pe un singur pool si returneaza documentul JSON al benchmark-ului:
+    `meta` (platforma, parametri) si `rezultate[caz][solver]` (vezi `ruleaza_caz`).
+    Implicit un singur lucrator, ca solverii sa nu concureze pe nuclee intre ei.
+    """
+    document: Dict[str, Any] = {
+        'meta': {'python': platform.python_version(), 'platforma': platform.platform(),
+                 'data': time.strftime('%Y-%m-%d %H:%M:%S'), 'lucratori': nr_lucratori,
+                 **optiuni},
+        'rezultate': {},
+    }
+    with PoolLucratori(nr_lucratori) as pool:
+        for caz, formule in suita.items():
+            document['rezultate'][caz] = rezultate = ruleaza_caz(formule, solveri, pool, **optiuni)
+            for n, r in rezultate.items():
+                peak = f"{r['peak_kib']:.1f}KiB" if r['peak_kib'] is not None else "-"
+                afiseaza(f"{caz:<10} {n:<10} mediana {r['mediana']:.4f}s  p90 {r['p90']:.4f}s  "
+                         f"peak {peak}  SAT/UNSAT/UNK {r['sat']}/{r['unsat']}/{r['unk']}"
+                         + (f"  timeout {r['timeouturi']}" if r['timeouturi'] else "")
+                         + (f"  erori {r['erori']}" if r['erori'] else ""))
+    return document
+
+
+# ---------------------------------------------------------------- comparatie
+
+
+def compara(curent: Dict[str, Any], baza: Dict[str, Any], prag: float = 0.2,
+            prag_absolut: float = PRAG_ABSOLUT_TIMP) -> List[str]:
+    """
+    Compara doua documente de benchmark si returneaza regresiile, ca mesaje:
+    - mediana timpului a crescut cu peste `prag` (fractie) si cu peste `prag_absolut` secunde
+    - varful de memorie a crescut cu peste `prag`
+    - un solver da alte verdicte sau are mai multe timeout-uri/erori (regresie de corectitudine)
+    Perechile caz x solver care lipsesc din `baza` sunt ignorate.
+    """
+    regresii: List[str] = []
+    for caz, solveri in curent['rezultate'].items():
+        for n, r in solveri.items():
+            b = baza.get('rezultate', {}).get(caz, {}).get(n)
+            if b is None:
+                continue
+            eticheta = f"{caz}/{n}"
+            if r['mediana'] > b['mediana'] * (1 + prag) and r['mediana'] - b['mediana'] > prag_absolut:
+                regresii.append(f"{eticheta}: timp {b['mediana']:.4f}s -> {r['mediana']:.4f}s "
+                                f"(+{(r['mediana'] / b['mediana'] - 1) * 100 if b['mediana'] else float('inf'):.0f}%)")
+            if b['peak_kib'] and r['peak_kib'] is not None and r['peak_kib'] > b['peak_kib'] * (1 + prag):
+                regresii.append(f"{eticheta}: memorie {b['peak_kib']:.1f}KiB -> {r['peak_kib']:.1f}KiB")
+            if (r['sat'], r['unsat']) != (b['sat'], b['unsat']) and not (r['unk'] or b['unk']):
+                regresii.append(f"{eticheta}: verdicte SAT/UNSAT {b['sat']}/{b['unsat']} -> {r['sat']}/{r['unsat']}")
+            if r['timeouturi'] + r['erori'] > b['timeouturi'] + b['erori']:
+                regresii.append(f"{eticheta}: timeout-uri/erori {b['timeouturi'] + b['erori']} -> "
+                                f"{r['timeouturi'] + r['erori']}")
+    return regresii
+
+
+def masuratori_calibrare(suita: Dict[str, Dict[str, Formula]],
+                         document: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Optional[float]]]]:
+    """
+    Perechile (trasaturile formulei, durata fiecarui motor general al solver-ului automat)
+    pentru `selectie.calibreaza`, din formulele suitei si documentul rularii ei.
+    """
+    masuratori = []
+    for caz, formule in suita.items():
+        rezultate = document['rezultate'].get(caz, {})
+        for nume, formula in formule.items():
+            durate = {m: rezultate[m]['durate'].get(nume) if m in rezultate else None for m in MOTOARE}
+            masuratori.append((caracteristici(formula), durate))
+    return masuratori
+
+
+# ---------------------------------------------------------------- linia de comanda
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Optiunile benchmark-ului."""
+    parser = argparse.ArgumentParser(description="Benchmark reproductibil pentru solverii FNC")
+    parser.add_argument('--solver', action='append', choices=list(SOLVERS.keys()),
+                        help=f"solver masurat (se poate repeta; implicit {', '.join(SOLVERI_IMPLICITI)})")
+    parser.add_argument('--caz', action='append', metavar='NUME',
+                        help="ruleaza doar acest caz din suita (se poate repeta)")
+    parser.add_argument('--seed', type=int, default=0, help="samanta generatoarelor (implicit 0)")
+    parser.add_argument('--intrare', default='intrare.txt', metavar='CALE',
+                        help="fisierul DIMACS inclus ca un caz separat ('' pentru a-l omite)")
+    parser.add_argument('--repetari', type=int, default=5, help="repetari masurate (implicit 5)")
+    parser.add_argument('--incalzire', type=int, default=1, help="rulari de incalzire nemasurate (implicit 1)")
+    parser.add_argument('--timeout', type=float, default=60.0, help="timeout pe formula x solver (implicit 60s)")
+    parser.add_argument('--lucratori', type=int, default=1, help="procese lucratoare (implicit 1)")
+    parser.add_argument('--fara-memorie', action='store_true',
+                        help="sari trecerea cu tracemalloc (fara varf de memorie)")
+    parser.add_argument('--iesire', default=None, metavar='CALE', help="scrie rezultatele ca JSON")
+    parser.add_argument('--baza', default=None, metavar='CALE',
+                        help="JSON de referinta; codul de iesire e 1 daca exista regresii")
+    parser.add_argument('--prag', type=float, default=0.2,
+                        help="cresterea relativa tolerata fata de baza (implicit 0.2 = 20%%)")
+    parser.add_argument('--calibreaza', default=None, metavar='CALE',
+                        help=f"recalculeaza pragurile solver-ului Auto din duratele masurate ale "
+                             f"{', '.join(MOTOARE)} si le scrie ca JSON (pentru --auto-praguri)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    suita = suita_implicita(args.seed, args.intrare or None)
+    if args.caz:
+        necunoscute = set(args.caz) - set(suita)
+        if necunoscute:
+            print(f"Cazuri necunoscute: {', '.join(sorted(necunoscute))} "
+                  f"(disponibile: {', '.join(suita)})", file=sys.stderr)
+            return 2
+        suita = {c: f for c, f in suita.items() if c in args.caz}
+    solveri = args.solver or list(SOLVERI_IMPLICITI)
+    if args.calibreaza:
+        solveri += [m for m in MOTOARE if m not in solveri]
+
+    document = ruleaza_suita(suita, solveri, args.lucratori, repetari=args.repetari,
+                             incalzire=args.incalzire, timeout=args.timeout, memorie=not args.fara_memorie)
+    document['meta']['seed'] = args.seed
+    if args.iesire:
+        with open(args.iesire, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+        print(f"\n>> Rezultatele au fost scrise in '{args.iesire}' <<")
+    if args.calibreaza:
+        praguri = calibreaza(masuratori_calibrare(suita, document))
+        with open(args.calibreaza, 'w', encoding='utf-8') as f:
+            json.dump(praguri, f, indent=2)
+        print(f"\nPraguri calibrate pentru Auto: {praguri} (scrise in '{args.calibreaza}')")
+
+    if args.baza:
+        with open(args.baza, encoding='utf-8') as f:
+            baza = json.load(f)
+        regresii = compara(document, baza, args.prag)
+        if regresii:
+            print(f"\nRegresii fata de '{args.baza}' (prag {args.prag:.0%}):")
+            for r in regresii:
+                print("  " + r)
+            return 1
+        print(f"\nNicio regresie fata de '{args.baza}' (prag {args.prag:.0%}).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
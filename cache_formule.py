@@ -0,0 +1,155 @@
+import sys
+from collections import OrderedDict
+from typing import FrozenSet, Optional, Dict, List
+
+# o sub-formula, cheia cache-ului: multimea clauzelor ei
+Formula = FrozenSet[FrozenSet[int]]
+
+# cost aproximativ (in bytes) al unei intrari, pe langa multimea exterioara a formulei:
+# intrarea din dictionar, valoarea si structurile politicii de evictie
+_OCTETI_INTRARE = 120
+
+
+def octeti_intrare(cheie: Formula) -> int:
+    """
+    Costul aproximativ al unei intrari: multimea exterioara a formulei, pe care cache-ul o tine
+    in viata, plus _OCTETI_INTRARE. Clauzele nu se numara: sunt aceleasi obiecte ca in
+    formulele din care provin, impartite cu restul cautarii.
+    """
+    return sys.getsizeof(cheie) + _OCTETI_INTRARE
+
+
+class CacheFormule:
+    """
+    Cache marginit pentru rezultatele sub-formulelor (formula -> bool).
+    Cheia este chiar formula (frozenset de clauze): hash-ul ei e calculat o singura data si tinut
+    minte de Python in obiect, iar la un hit formula este comparata exact, deci doua
+    sub-formule diferite nu pot imparti niciodata un rezultat.
+    - `max_intrari` si/sau `max_octeti` limiteaza dimensiunea (None = fara limita pe acel criteriu);
+      octetii se numara pe intrare (vezi `octeti_intrare`), doar daca `max_octeti` e dat
+    - `politica` este 'lru' (cel mai putin recent folosit) sau 'clock' (a doua sansa)
+    - contorizeaza hit-urile, ratarile si evictiile
+    """
+
+    def __init__(self, max_intrari: Optional[int] = 100_000,
+                 max_octeti: Optional[int] = None,
+                 politica: str = 'lru'):
+        if politica not in ('lru', 'clock'):
+            raise ValueError(f"Politica de evictie necunoscuta: '{politica}'")
+        self.capacitate = max(1, max_intrari if max_intrari is not None else sys.maxsize)
+        self.max_octeti = max_octeti
+        self.octeti = 0            # octetii intrarilor (numarati doar cu `max_octeti`)
+        self.politica = politica
+        self.hituri = 0
+        self.ratari = 0
+        self.evictii = 0
+
+        # LRU: dictionar ordonat dupa ultima folosire
+        self._lru: "OrderedDict[Formula, bool]" = OrderedDict()
+        # CLOCK: tablouri circulare de chei/valori/biti de referinta + pozitia fiecarei chei;
+        # pozitiile eliberate (cheie None) se refolosesc
+        self._poz: Dict[Formula, int] = {}
+        self._chei: List[Optional[Formula]] = []
+        self._valori: List[bool] = []
+        self._ref: List[bool] = []
+        self._libere: List[int] = []
+        self._ac = 0   # acul ceasului
+
+    def __len__(self) -> int:
+        return len(self._lru) if self.politica == 'lru' else len(self._poz)
+
+    def _octeti(self, cheie: Formula) -> int:
+        return octeti_intrare(cheie) if self.max_octeti is not None else 0
+
+    def _plin(self, octeti_noi: int) -> bool:
+        """Mai e nevoie de o evictie ca sa intre o intrare noua de `octeti_noi`?"""
+        if not len(self):
+            return False
+        return len(self) >= self.capacitate or \
+            (self.max_octeti is not None and self.octeti + octeti_noi > self.max_octeti)
+
+    def cauta(self, cheie: Formula) -> Optional[bool]:
+        """Returneaza rezultatul memorat sau None daca formula nu e in cache."""
+        if self.politica == 'lru':
+            val = self._lru.get(cheie)
+            if val is not None:
+                self._lru.move_to_end(cheie)
+        else:
+            i = self._poz.get(cheie)
+            val = None
+            if i is not None:
+                self._ref[i] = True
+                val = self._valori[i]
+        if val is None:
+            self.ratari += 1
+        else:
+            self.hituri += 1
+        return val
+
+    def pune(self, cheie: Formula, valoare: bool) -> None:
+        """Memoreaza rezultatul, scotand intrari vechi cat timp s-ar depasi limitele."""
+        if self.politica == 'lru':
+            lru = self._lru
+            if self.max_octeti is None:
+                # doar limita pe numar: calea scurta, fara numararea octetilor
+                lru[cheie] = valoare
+                lru.move_to_end(cheie)
+                if len(lru) > self.capacitate:
+                    lru.popitem(last=False)
+                    self.evictii += 1
+                return
+            if cheie in lru:
+                lru[cheie] = valoare
+                lru.move_to_end(cheie)
+                return
+            octeti = octeti_intrare(cheie)
+            while self._plin(octeti):
+                vechi, _ = lru.popitem(last=False)
+                self.octeti -= octeti_intrare(vechi)
+                self.evictii += 1
+            lru[cheie] = valoare
+            self.octeti += octeti
+            return
+
+        i = self._poz.get(cheie)
+        if i is not None:
+            self._valori[i] = valoare
+            self._ref[i] = True
+            return
+        octeti = self._octeti(cheie)
+        while self._plin(octeti):
+            self._evacueaza()
+        if self._libere:
+            i = self._libere.pop()
+            self._chei[i] = cheie
+            self._valori[i] = valoare
+            self._ref[i] = False
+        else:
+            i = len(self._chei)
+            self._chei.append(cheie)
+            self._valori.append(valoare)
+            self._ref.append(False)
+        self._poz[cheie] = i
+        self.octeti += octeti
+
+    def _evacueaza(self) -> None:
+        """CLOCK: avanseaza acul pana la o intrare fara bit de referinta (a doua sansa) si o scoate."""
+        n = len(self._chei)
+        while self._chei[self._ac] is None or self._ref[self._ac]:
+            self._ref[self._ac] = False
+            self._ac = (self._ac + 1) % n
+        vechi = self._chei[self._ac]
+        del self._poz[vechi]
+        self.octeti -= self._octeti(vechi)
+        self.evictii += 1
+        self._chei[self._ac] = None
+        self._libere.append(self._ac)
+        self._ac = (self._ac + 1) % n
+
+    def statistici(self) -> Dict[str, int]:
+        """Contoarele cache-ului, pentru linia de rezultate."""
+        return {
+            'cache_hit': self.hituri,
+            'cache_miss': self.ratari,
+            'cache_evict': self.evictii,
+        }
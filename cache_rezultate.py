@@ -0,0 +1,105 @@
+import time
+import hashlib
+import sqlite3
+from typing import Iterable, Optional, Set, Tuple, NamedTuple
+
+# fisierul implicit al cache-ului persistent
+CALE_IMPLICITA = 'rezultate_cache.sqlite'
+
+
+def hash_canonic(formula: Iterable[Iterable[int]]) -> str:
+    """
+    Hash SHA-256 al formei canonice a unei formule: literalii fiecarei clauze sortati,
+    clauzele fara duplicate si sortate. Nu depinde de ordinea clauzelor sau a literalilor,
+    deci aceeasi instanta are aceeasi cheie indiferent de fisierul din care vine.
+    Merge atat pe multimi de frozenset-uri, cat si pe FormulaCompacta.
+    """
+    clauze = sorted({tuple(sorted(c)) for c in formula})
+    h = hashlib.sha256()
+    for c in clauze:
+        h.update(" ".join(map(str, c)).encode('ascii'))
+        h.update(b" 0\n")
+    return h.hexdigest()
+
+
+class RezultatMemorat(NamedTuple):
+    """Un rezultat gasit in cache: verdict, timpul si varful de memorie ale rularii originale."""
+    sat: bool
+    durata: float
+    peak_kib: float
+
+
+class CacheRezultate:
+    """
+    Cache persistent (SQLite) de rezultate, cu cheia (hash canonic al formulei, solver).
+    - `ocolite`: solveri pentru care nu se citeste din cache (rezultatul nou se scrie totusi)
+    - `invalideaza`: sterge rezultatele memorate pentru anumiti solveri
+    Contorizeaza cate cautari au fost servite din cache (`hituri`) si cate nu (`ratari`).
+    """
+
+    def __init__(self, cale: str = CALE_IMPLICITA, ocolite: Iterable[str] = ()):
+        self.cale = cale
+        self.ocolite: Set[str] = set(ocolite)
+        self.hituri = 0
+        self.ratari = 0
+        self._nesalvate = 0   # scrieri de la ultimul commit
+        self._db = sqlite3.connect(cale)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rezultate ("
+            " hash TEXT NOT NULL,"
+            " solver TEXT NOT NULL,"
+            " sat INTEGER NOT NULL,"
+            " durata REAL NOT NULL,"
+            " peak_kib REAL NOT NULL,"
+            " creat REAL NOT NULL,"
+            " PRIMARY KEY (hash, solver))"
+        )
+        self._db.commit()
+
+    def __enter__(self) -> "CacheRezultate":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.inchide()
+
+    def inchide(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+    def cauta(self, cheie: str, solver: str) -> Optional[RezultatMemorat]:
+        """Rezultatul memorat pentru (formula, solver), sau None (si pentru solverii ocoliti)."""
+        if solver in self.ocolite:
+            return None
+        rand = self._db.execute(
+            "SELECT sat, durata, peak_kib FROM rezultate WHERE hash = ? AND solver = ?",
+            (cheie, solver)
+        ).fetchone()
+        if rand is None:
+            self.ratari += 1
+            return None
+        self.hituri += 1
+        return RezultatMemorat(bool(rand[0]), rand[1], rand[2])
+
+    def salveaza(self, cheie: str, solver: str, sat: bool, durata: float, peak_kib: float) -> None:
+        """Memoreaza (sau inlocuieste) rezultatul unui solver pe o formula."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO rezultate (hash, solver, sat, durata, peak_kib, creat)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (cheie, solver, int(sat), durata, peak_kib, time.time())
+        )
+        # grupam scrierile, ca sa nu sincronizam fisierul dupa fiecare formula
+        self._nesalvate += 1
+        if self._nesalvate >= 64:
+            self._db.commit()
+            self._nesalvate = 0
+
+    def invalideaza(self, solvers: Optional[Iterable[str]] = None) -> int:
+        """Sterge rezultatele solverilor dati (toate, daca `solvers` e None). Returneaza cate randuri."""
+        if solvers is None:
+            cur = self._db.execute("DELETE FROM rezultate")
+        else:
+            solvers = list(solvers)
+            semne = ", ".join("?" * len(solvers))
+            cur = self._db.execute(f"DELETE FROM rezultate WHERE solver IN ({semne})", solvers)
+        self._db.commit()
+        return cur.rowcount
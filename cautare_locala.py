@@ -0,0 +1,241 @@
+import random
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
+
+from masurare_performanta import timp_si_memorie, Masurare, Contoare, NIVEL_IMPLICIT
+
+ALGORITMI = ('walksat', 'probsat')
+
+# valori implicite uzuale pentru 3-SAT aleator
+ZGOMOT_IMPLICIT = 0.567          # WalkSAT: probabilitatea unui pas aleator
+CB_IMPLICIT = 2.38               # probSAT: exponentul functiei (eps + break) ** -cb
+RESTARTURI_IMPLICITE = 5         # incercari (atribuiri initiale aleatoare) pana la abandon
+# flip-uri pe incercare, implicit proportionale cu numarul de variabile: cautarea locala nu
+# poate dovedi UNSAT, deci bugetul trebuie sa se termine repede cu UNK, nu in timeout
+FLIPURI_PE_VARIABILA = 50
+FLIPURI_MINIME = 1000
+FLIPURI_MAXIME = 50000
+
+
+class _CautareLocala:
+    """
+    Starea cautarii locale pe o formula, totul in liste plate indexate dupa variabila/clauza:
+    - literalii interni ca in MotorDPLL: variabila v -> 2*v (pozitiv) / 2*v+1 (negativ)
+    - `adevarate[ci]`: cati literali ai clauzei ci sunt adevarati
+    - `critic[ci]`: XOR-ul variabilelor adevarate din ci; cand adevarate[ci] == 1 este chiar
+      variabila critica, cea care ar strica clauza daca ar fi inversata
+    - `strica[v]` / `repara[v]`: cate clauze devin nesatisfacute / satisfacute la inversarea lui v,
+      actualizate incremental la fiecare flip (doar clauzele atinse de v)
+    - `nesatisfacute` plus `pozitie`: multimea clauzelor false, cu stergere in O(1)
+    """
+
+    def __init__(self, clauze: List[List[int]], nr_var: int, rnd: random.Random):
+        self.clauze = clauze
+        self.nr_var = nr_var
+        self.rnd = rnd
+        self.aparitii: List[List[int]] = [[] for _ in range(2 * nr_var)]
+        for ci, c in enumerate(clauze):
+            for p in c:
+                self.aparitii[p].append(ci)
+
+    def initializeaza(self) -> None:
+        """Atribuire initiala aleatoare si recalcularea completa a tabelelor."""
+        rnd = self.rnd
+        n = self.nr_var
+        # valoare[p] = 1 daca literalul intern p este adevarat
+        self.valoare = valoare = [0] * (2 * n)
+        for v in range(n):
+            valoare[2 * v + (rnd.random() < 0.5)] = 1
+        self.adevarate = adevarate = [0] * len(self.clauze)
+        self.critic = critic = [0] * len(self.clauze)
+        self.strica = strica = [0] * n
+        self.repara = repara = [0] * n
+        self.nesatisfacute: List[int] = []
+        self.pozitie = [-1] * len(self.clauze)
+        for ci, c in enumerate(self.clauze):
+            for p in c:
+                if valoare[p]:
+                    adevarate[ci] += 1
+                    critic[ci] ^= p >> 1
+            if adevarate[ci] == 0:
+                self._adauga_nesatisfacuta(ci)
+                for p in c:
+                    repara[p >> 1] += 1
+            elif adevarate[ci] == 1:
+                strica[critic[ci]] += 1
+
+    def _adauga_nesatisfacuta(self, ci: int) -> None:
+        self.pozitie[ci] = len(self.nesatisfacute)
+        self.nesatisfacute.append(ci)
+
+    def _scoate_nesatisfacuta(self, ci: int) -> None:
+        nes = self.nesatisfacute
+        i = self.pozitie[ci]
+        ultima = nes.pop()
+        if ultima != ci:
+            nes[i] = ultima
+            self.pozitie[ultima] = i
+        self.pozitie[ci] = -1
+
+    def inverseaza(self, v: int) -> None:
+        """Inverseaza variabila v si actualizeaza incremental tabelele."""
+        valoare = self.valoare
+        adevarate = self.adevarate
+        critic = self.critic
+        strica = self.strica
+        repara = self.repara
+        clauze = self.clauze
+        p = 2 * v + valoare[2 * v]        # literalul care devine adevarat
+        valoare[p] = 1
+        valoare[p ^ 1] = 0
+
+        for ci in self.aparitii[p]:
+            n = adevarate[ci]
+            if n == 0:
+                # clauza devine satisfacuta, cu v ca unic literal adevarat
+                self._scoate_nesatisfacuta(ci)
+                for q in clauze[ci]:
+                    repara[q >> 1] -= 1
+                strica[v] += 1
+            elif n == 1:
+                strica[critic[ci]] -= 1
+            adevarate[ci] = n + 1
+            critic[ci] ^= v
+
+        for ci in self.aparitii[p ^ 1]:
+            n = adevarate[ci]
+            critic[ci] ^= v
+            if n == 1:
+                # v era unicul literal adevarat: clauza devine falsa
+                self._adauga_nesatisfacuta(ci)
+                for q in clauze[ci]:
+                    repara[q >> 1] += 1
+                strica[v] -= 1
+            elif n == 2:
+                strica[critic[ci]] += 1
+            adevarate[ci] = n - 1
+
+    def alege_walksat(self, clauza: List[int], zgomot: float) -> (int, bool):
+        """
+        WalkSAT/SKC: o variabila cu strica == 0 se inverseaza fara risc; altfel, cu probabilitatea
+        `zgomot` o variabila aleatoare, iar in rest cea cu strica minim (departajare dupa repara).
+        Returneaza (variabila, pasul a fost aleator).
+        """
+        strica = self.strica
+        repara = self.repara
+        cea_mai_buna = min((q >> 1 for q in clauza), key=lambda v: (strica[v], -repara[v]))
+        if strica[cea_mai_buna] and self.rnd.random() < zgomot:
+            return self.rnd.choice(clauza) >> 1, True
+        return cea_mai_buna, False
+
+    def alege_probsat(self, clauza: List[int], cb: float) -> int:
+        """probSAT (varianta polinomiala): variabila v este aleasa cu probabilitatea ~ (eps + strica[v]) ** -cb."""
+        strica = self.strica
+        ponderi = [(1.0 + strica[q >> 1]) ** -cb for q in clauza]
+        prag = self.rnd.random() * sum(ponderi)
+        for q, w in zip(clauza, ponderi):
+            prag -= w
+            if prag <= 0:
+                return q >> 1
+        return clauza[-1] >> 1
+
+    def model(self, variabile: List[int]) -> List[int]:
+        """Atribuirea curenta ca literali DIMACS (variabile[i] = variabila originala a lui i)."""
+        return [v if self.valoare[2 * i] else -v for i, v in enumerate(variabile)]
+
+
+@timp_si_memorie
+def walksat(clauze: Set[FrozenSet[int]], algoritm: str = 'walksat', zgomot: float = ZGOMOT_IMPLICIT,
+            cb: float = CB_IMPLICIT, max_flipuri: Optional[int] = None,
+            max_restarturi: int = RESTARTURI_IMPLICITE, seed: Optional[int] = 0,
+            contoare: bool = False, model: bool = False):
+    """
+    Cautare locala stocastica (incompleta): porneste dintr-o atribuire aleatoare si inverseaza
+    cate o variabila dintr-o clauza falsa aleasa la intamplare, pana cand toate clauzele sunt
+    satisfacute sau se epuizeaza `max_flipuri` (apoi restart, de cel mult `max_restarturi` ori).
+    Implicit `max_flipuri` este FLIPURI_PE_VARIABILA pe variabila, intre FLIPURI_MINIME si
+    FLIPURI_MAXIME.
+    - `algoritm='walksat'`: pas lacom dupa strica/repara, cu `zgomot` pasi aleatori
+    - `algoritm='probsat'`: alegere probabilista dupa strica, cu exponentul `cb`
+    - `seed` face rularea reproductibila (None = aleator)
+    Raspunde True (cu modelul, daca `model=True`) sau None (necunoscut) cand renunta;
+    False doar pentru o formula cu clauza vida. Cu `contoare=True` raporteaza flip-urile,
+    restarturile si pasii aleatori.
+    """
+    if algoritm not in ALGORITMI:
+        raise ValueError(f"Algoritm de cautare locala necunoscut: '{algoritm}'")
+    st = Contoare() if contoare else None
+
+    def rezultat(sat: Optional[bool], lista: Optional[List[int]] = None):
+        if not model and not st:
+            return sat
+        if not model:
+            return sat, st.ca_dict()
+        return sat, st.ca_dict() if st else {}, lista
+
+    # renumerotam variabilele si scoatem tautologiile
+    var_id: Dict[int, int] = {}
+    variabile: List[int] = []
+    interne: List[List[int]] = []
+    for c in clauze:
+        if not c:
+            return rezultat(False)
+        if any(-l in c for l in c):
+            continue
+        lits = []
+        for l in c:
+            v = var_id.get(abs(l))
+            if v is None:
+                v = var_id[abs(l)] = len(variabile)
+                variabile.append(abs(l))
+            lits.append(2 * v + (l < 0))
+        interne.append(lits)
+
+    if max_flipuri is None:
+        max_flipuri = min(max(FLIPURI_PE_VARIABILA * len(variabile), FLIPURI_MINIME), FLIPURI_MAXIME)
+    cautare = _CautareLocala(interne, len(variabile), random.Random(seed))
+    rnd = cautare.rnd
+    for incercare in range(max(1, max_restarturi)):
+        if incercare and st:
+            st.adauga('restarturi')
+        cautare.initializeaza()
+        nes = cautare.nesatisfacute
+        for _ in range(max_flipuri):
+            if not nes:
+                break
+            clauza = interne[nes[int(rnd.random() * len(nes))]]
+            if algoritm == 'walksat':
+                v, aleator = cautare.alege_walksat(clauza, zgomot)
+                if aleator and st:
+                    st.adauga('pasi_aleatori')
+            else:
+                v = cautare.alege_probsat(clauza, cb)
+            cautare.inverseaza(v)
+            if st:
+                st.adauga('flipuri')
+        if not nes:
+            return rezultat(True, cautare.model(variabile))
+    return rezultat(None)
+
+
+def cu_trecere_locala(fn: Callable, clauze: Set[FrozenSet[int]], flipuri_locale: int = 10000,
+                      **optiuni) -> Masurare:
+    """
+    Trecere rapida de cautare locala inaintea solver-ului complet `fn`: `walksat` incearca
+    `flipuri_locale` flip-uri (fara restart); daca gaseste un model, raspunsul lui este cel final,
+    altfel `fn` ruleaza normal cu `optiuni`. Timpii celor doua treceri se aduna, iar
+    `trecere_locala` (sat / esuat) arata care a raspuns.
+    """
+    locala = walksat(clauze, max_flipuri=flipuri_locale, max_restarturi=1,
+                     nivel_masurare=optiuni.get('nivel_masurare', NIVEL_IMPLICIT),
+                     model=bool(optiuni.get('model')))
+    if locala.sat:
+        locala.statistici = dict(locala.statistici, trecere_locala='sat')
+        return locala
+    masurare = fn(clauze, **optiuni)
+    if masurare.durata is not None and locala.durata is not None:
+        masurare.durata += locala.durata
+        masurare.durata_cpu += locala.durata_cpu
+    if locala.peak_kib is not None and masurare.peak_kib is not None:
+        masurare.peak_kib = max(masurare.peak_kib, locala.peak_kib)
+    masurare.statistici = dict(masurare.statistici, trecere_locala='esuat')
+    return masurare
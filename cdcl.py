@@ -0,0 +1,331 @@
+import heapq
+from typing import Callable, Set, FrozenSet, List, Iterable, Sequence, Tuple
+from masurare_performanta import timp_si_memorie  # decorator care masoara timpul si memoria
+from motor_dpll import MotorDPLL, NEATRIBUIT, ADEVARAT, FALS
+
+
+def luby(i: int) -> int:
+    """Al i-lea termen (de la 1) al secventei Luby: 1 1 2 1 1 2 4 1 1 2 1 1 2 4 8 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class MotorCDCL(MotorDPLL):
+    """
+    Motor CDCL construit peste trail-ul si literalii urmariti din MotorDPLL:
+    - analiza conflictelor 1UIP, cu minimizarea locala a clauzei invatate
+    - backjumping non-cronologic la al doilea cel mai mare nivel din clauza invatata
+    - euristica VSIDS (activitati pe variabile, cu decadere) si salvarea fazei
+    - restarturi Luby sau geometrice
+    - stergerea periodica a clauzelor invatate, dupa LBD si activitate
+    """
+
+    def __init__(self, clauze: Iterable[Iterable[int]] = (),
+                 restart: str = 'luby',
+                 unitate_restart: int = 100,
+                 factor_geometric: float = 1.5,
+                 decadere_var: float = 0.95,
+                 decadere_clauze: float = 0.999):
+        if restart not in ('luby', 'geometric'):
+            raise ValueError(f"Strategie de restart necunoscuta: '{restart}'")
+        self.activitate: List[float] = []     # variabila -> scor VSIDS
+        self.faza: List[int] = []             # variabila -> ultima polaritate (0 pozitiv, 1 negativ)
+        self._heap: List[Tuple[float, int]] = []
+        self._vazut: List[bool] = []
+        self.invatata: List[bool] = []        # clauza -> este invatata?
+        self.lbd: List[int] = []              # clauza -> LBD (doar pentru cele invatate)
+        self.act_clauza: List[float] = []     # clauza -> activitate (doar pentru cele invatate)
+        self.inc_var = 1.0
+        self.inc_clauza = 1.0
+        self.decadere_var = decadere_var
+        self.decadere_clauze = decadere_clauze
+        self.restart = restart
+        self.unitate_restart = unitate_restart
+        self.factor_geometric = factor_geometric
+        self.nr_invatate = 0
+        self.max_invatate = 0
+        self.conflicte = 0
+        super().__init__(clauze)
+
+    # ---------------------------------------------------------------- clauze
+
+    def _cod(self, lit: int) -> int:
+        v = self.var_id.get(abs(lit))
+        if v is None:
+            v = len(self.variabile)
+            self.activitate.append(0.0)
+            self.faza.append(1)
+            self._vazut.append(False)
+            heapq.heappush(self._heap, (0.0, v))
+        return super()._cod(lit)
+
+    def _adauga_urmarita(self, lits: List[int], invatata: bool = False, lbd: int = 0) -> int:
+        ci = super()._adauga_urmarita(lits)
+        self.invatata.append(invatata)
+        self.lbd.append(lbd)
+        self.act_clauza.append(self.inc_clauza if invatata else 0.0)
+        if invatata:
+            self.nr_invatate += 1
+        return ci
+
+    # ----------------------------------------------------------------- trail
+
+    def _revino(self, nivel: int) -> None:
+        if len(self.limite) <= nivel:
+            return
+        # salvam faza si punem variabilele inapoi in heap-ul de decizii
+        act = self.activitate
+        faza = self.faza
+        heap = self._heap
+        for p in self.trail[self.limite[nivel]:]:
+            v = p >> 1
+            faza[v] = p & 1
+            heapq.heappush(heap, (-act[v], v))
+        super()._revino(nivel)
+        if len(heap) > 8 * len(act) + 64:
+            # prea multe intrari vechi: reconstruim heap-ul doar din variabilele libere
+            self._heap = [(-act[v], v) for v in range(len(act)) if self.valoare[2 * v] == NEATRIBUIT]
+            heapq.heapify(self._heap)
+
+    # ----------------------------------------------------------------- VSIDS
+
+    def _creste_var(self, v: int) -> None:
+        act = self.activitate
+        act[v] += self.inc_var
+        if act[v] > 1e100:
+            # rescalam toate activitatile ca sa nu iesim din domeniul float
+            for i in range(len(act)):
+                act[i] *= 1e-100
+            self.inc_var *= 1e-100
+            self._heap = [(-act[u], u) for u in range(len(act)) if self.valoare[2 * u] == NEATRIBUIT]
+            heapq.heapify(self._heap)
+        elif self.valoare[2 * v] == NEATRIBUIT:
+            heapq.heappush(self._heap, (-act[v], v))
+
+    def _creste_clauza(self, ci: int) -> None:
+        act = self.act_clauza
+        act[ci] += self.inc_clauza
+        if act[ci] > 1e20:
+            for i in range(len(act)):
+                act[i] *= 1e-20
+            self.inc_clauza *= 1e-20
+
+    def _alege_literal(self) -> int:
+        """Variabila neatribuita cu activitatea cea mai mare, cu faza salvata."""
+        heap = self._heap
+        act = self.activitate
+        valoare = self.valoare
+        while heap:
+            a, v = heapq.heappop(heap)
+            # intrarile vechi (activitate schimbata sau variabila atribuita) se sar
+            if valoare[2 * v] == NEATRIBUIT and -a == act[v]:
+                return 2 * v + self.faza[v]
+        for v in range(len(self.variabile)):
+            if valoare[2 * v] == NEATRIBUIT:
+                return 2 * v + self.faza[v]
+        return -1
+
+    # ------------------------------------------------------- analiza conflict
+
+    def _analizeaza(self, ci: int) -> Tuple[List[int], int, int]:
+        """
+        Analiza 1UIP: parcurgem trail-ul inapoi de la conflict, rezolvand cu motivele
+        literalilor de la nivelul curent pana ramane unul singur (primul UIP).
+        Returneaza (clauza invatata cu UIP-ul negat pe pozitia 0, nivelul de backjump, LBD).
+        """
+        vazut = self._vazut
+        nivel = self.nivel
+        motiv = self.motiv
+        trail = self.trail
+        nivel_curent = len(self.limite)
+
+        invatata = [-1]
+        cale = 0
+        p = -1
+        idx = len(trail) - 1
+        while True:
+            if self.invatata[ci]:
+                self._creste_clauza(ci)
+            c = self.clauze[ci]
+            for q in (c if p == -1 else c[1:]):
+                v = q >> 1
+                if not vazut[v] and nivel[v] > 0:
+                    vazut[v] = True
+                    self._creste_var(v)
+                    if nivel[v] >= nivel_curent:
+                        cale += 1
+                    else:
+                        invatata.append(q)
+            # urmatorul literal de pe trail implicat in conflict
+            while not vazut[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            vazut[p >> 1] = False
+            cale -= 1
+            if cale == 0:
+                break
+            ci = motiv[p >> 1]
+        invatata[0] = p ^ 1
+
+        # minimizare locala: scoatem literalii al caror motiv e acoperit de restul clauzei
+        pastrati = [invatata[0]]
+        for q in invatata[1:]:
+            m = motiv[q >> 1]
+            if m < 0 or any(not vazut[r >> 1] and nivel[r >> 1] > 0 for r in self.clauze[m][1:]):
+                pastrati.append(q)
+        for q in invatata[1:]:
+            vazut[q >> 1] = False
+        invatata = pastrati
+
+        # nivelul de backjump: cel mai mare nivel dupa cel curent, pus pe pozitia 1
+        nivel_bj = 0
+        if len(invatata) > 1:
+            i_max = max(range(1, len(invatata)), key=lambda i: nivel[invatata[i] >> 1])
+            invatata[1], invatata[i_max] = invatata[i_max], invatata[1]
+            nivel_bj = nivel[invatata[1] >> 1]
+        lbd = len({nivel[q >> 1] for q in invatata})
+        return invatata, nivel_bj, lbd
+
+    # ------------------------------------------------- stergere clauze invatate
+
+    def _reduce_baza(self) -> None:
+        """
+        Se apeleaza doar la nivelul 0 (dupa restart), cand niciun motiv nu mai e folosit:
+        pastram clauzele originale, clauzele 'glue' (LBD <= 2) si jumatatea mai buna
+        din restul clauzelor invatate; apoi reconstruim listele de literali urmariti.
+        """
+        valoare = self.valoare
+        candidati = [ci for ci in range(len(self.clauze))
+                     if self.invatata[ci] and self.lbd[ci] > 2]
+        candidati.sort(key=lambda ci: (self.lbd[ci], -self.act_clauza[ci]))
+        sterse = set(candidati[len(candidati) // 2:])
+        # clauzele invatate satisfacute permanent la nivelul 0 pleaca si ele
+        self._pastreaza(lambda ci, c: ci not in sterse and not (
+            self.invatata[ci] and any(valoare[q] == ADEVARAT for q in c)))
+
+    def simplifica(self) -> None:
+        """
+        Scoate din baza toate clauzele (originale si invatate) satisfacute la nivelul 0,
+        de ex. cele dezactivate printr-un selector fixat la fals (vezi `SolverIncremental.pop`).
+        """
+        self._revino(0)
+        if self.inconsistent or self._propaga() >= 0:
+            self.inconsistent = True
+            return
+        valoare = self.valoare
+        self._pastreaza(lambda ci, c: not any(valoare[q] == ADEVARAT for q in c))
+
+    def _pastreaza(self, pastrata: Callable[[int, List[int]], bool]) -> None:
+        """Pastreaza doar clauzele pentru care `pastrata(ci, clauza)` e adevarat; refa literalii urmariti."""
+        clauze, invatata, lbd, act = [], [], [], []
+        for ci, c in enumerate(self.clauze):
+            if not pastrata(ci, c):
+                continue
+            clauze.append(c)
+            invatata.append(self.invatata[ci])
+            lbd.append(self.lbd[ci])
+            act.append(self.act_clauza[ci])
+        self.clauze, self.invatata, self.lbd, self.act_clauza = clauze, invatata, lbd, act
+        self.nr_invatate = sum(invatata)
+
+        for lista in self.urmariti:
+            lista.clear()
+        for ci, c in enumerate(clauze):
+            self.urmariti[c[0]].append(ci)
+            self.urmariti[c[1]].append(ci)
+        for p in self.trail:
+            self.motiv[p >> 1] = -1
+
+    # ---------------------------------------------------------------- cautare
+
+    def _limita_restart(self, nr: int) -> int:
+        """Numarul de conflicte permis pana la restartul cu numarul `nr` (de la 1)."""
+        if self.restart == 'luby':
+            return self.unitate_restart * luby(nr)
+        return int(self.unitate_restart * self.factor_geometric ** (nr - 1))
+
+    def rezolva(self, ipoteze: Sequence[int] = ()) -> bool:
+        """
+        Bucla CDCL: propagam; la conflict invatam o clauza si sarim inapoi;
+        altfel decidem dupa VSIDS. La fiecare restart revenim la nivelul 0
+        si, daca baza de clauze invatate a crescut prea mult, o reducem.
+        `ipoteze` (literali interni) sunt decise primele, cate una pe nivel, ca in MiniSat:
+        False inseamna atunci UNSAT sub ipoteze, iar formula ramane consistenta.
+        Clauzele invatate nu depind de ipoteze (acestea sunt decizii), deci raman valabile.
+        """
+        if self.inconsistent:
+            return False
+        self._revino(0)
+        if not self.max_invatate:
+            self.max_invatate = max(len(self.clauze) // 3, 2000)
+
+        nr_restart = 1
+        limita = self._limita_restart(nr_restart)
+        conflicte_restart = 0
+
+        while True:
+            ci = self._propaga()
+            if ci >= 0:
+                self.conflicte += 1
+                conflicte_restart += 1
+                if not self.limite:
+                    self.inconsistent = True
+                    return False
+                invatata, nivel_bj, lbd = self._analizeaza(ci)
+                self._revino(nivel_bj)
+                if len(invatata) == 1:
+                    self._atribuie(invatata[0], -1)
+                else:
+                    self._atribuie(invatata[0], self._adauga_urmarita(invatata, True, lbd))
+                self.inc_var /= self.decadere_var
+                self.inc_clauza /= self.decadere_clauze
+                continue
+
+            if conflicte_restart >= limita:
+                self._revino(0)
+                nr_restart += 1
+                limita = self._limita_restart(nr_restart)
+                conflicte_restart = 0
+                if self.nr_invatate > self.max_invatate:
+                    self._reduce_baza()
+                    self.max_invatate = int(self.max_invatate * 1.1)
+                continue
+
+            if len(self.limite) < len(ipoteze):
+                p = ipoteze[len(self.limite)]
+                if self.valoare[p] == FALS:
+                    return False
+                if self.valoare[p] == ADEVARAT:
+                    # ipoteza e deja implicata: nivel gol, ca numerotarea sa ramana aliniata
+                    self.limite.append(len(self.trail))
+                    self.inversat.append(False)
+                else:
+                    self._decide(p)
+                continue
+
+            p = self._alege_literal()
+            if p < 0:
+                return True
+            self._decide(p)
+
+
+@timp_si_memorie
+def cdcl(clauze: Set[FrozenSet[int]], model: bool = False):
+    """
+    CDCL: invatare de clauze din conflicte, backjumping, VSIDS, restarturi Luby
+    si stergerea clauzelor invatate dupa LBD.
+    Cu `model=True` returneaza si atribuirea gasita, la SAT.
+    """
+    motor = MotorCDCL(clauze)
+    sat = motor.rezolva()
+    if not model:
+        return sat
+    return sat, {}, motor.model() if sat else None
@@ -0,0 +1,189 @@
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from subsumare import ClauzeMultimi, MULTIMI
+
+# o clauza ca pereche de masti (literali pozitivi, literali negativi): bitul i = variabila i
+Clauza = Tuple[int, int]
+
+# peste atatea variabile mastile devin intregi lungi, iar operatiile pe ele (si parcurgerea
+# bitilor) ajung mai scumpe decat multimile; `alege_forma` revine atunci la frozenset
+PRAG_BITI = 256
+
+# valorile optiunilor --dp-clauze / --rezolutie-clauze (vezi `alege_forma`)
+FORME_CLAUZE = ('auto', 'biti', 'multimi')
+
+# cate descompuneri masca -> literali tine minte o forma inainte sa o ia de la capat
+MEMO_LITERALI = 1 << 16
+
+_GOL: FrozenSet[Clauza] = frozenset()
+
+
+class ClauzeBiti:
+    """
+    Clauzele ca perechi de masti de biti (intregi Python): bitul i din prima masca inseamna
+    literalul pozitiv al variabilei i, din a doua literalul negat. Operatiile DP si Rezolutie
+    devin cateva operatii pe cuvinte, fara multimi intermediare:
+    - rezolvent pe variabila cu bitul b: ((p1 | p2) & ~b, (n1 | n2) & ~b)
+    - tautologie: p & n != 0
+    - d inclus in c: d.p & ~c.p == 0 si d.n & ~c.n == 0 (exact, fara semnaturi)
+    In afara clauzelor (liste de aparitii, unitati, pasii pentru model) literalii raman DIMACS.
+    """
+
+    def __init__(self, variabile: Iterable[int]):
+        self.variabile: List[int] = list(variabile)     # variabile[i] = variabila bitului i
+        self.bit: Dict[int, int] = {v: 1 << i for i, v in enumerate(self.variabile)}
+        # aceeasi clauza e descompusa de mai multe ori (index, subsumare, unitati), deci
+        # descompunerile recente se pastreaza
+        self._literali: Dict[Clauza, List[int]] = {}
+
+    def din_literali(self, literali: Iterable[int]) -> Clauza:
+        p = n = 0
+        bit = self.bit
+        literali = set(literali)
+        for l in literali:
+            if l > 0:
+                p |= bit[l]
+            else:
+                n |= bit[-l]
+        # literalii sunt deja cunoscuti, deci descompunerea nu mai trebuie facuta
+        if len(self._literali) >= MEMO_LITERALI:
+            self._literali.clear()
+        self._literali[p, n] = list(literali)
+        return p, n
+
+    def literali(self, clauza: Clauza) -> List[int]:
+        """Literalii DIMACS ai clauzei."""
+        rez = self._literali.get(clauza)
+        if rez is not None:
+            return rez
+        if len(self._literali) >= MEMO_LITERALI:
+            self._literali.clear()
+        variabile = self.variabile
+        p, n = clauza
+        rez = []
+        while p:
+            b = p & -p
+            rez.append(variabile[b.bit_length() - 1])
+            p ^= b
+        while n:
+            b = n & -n
+            rez.append(-variabile[b.bit_length() - 1])
+            n ^= b
+        self._literali[clauza] = rez
+        return rez
+
+    def lungime(self, clauza: Clauza) -> int:
+        return clauza[0].bit_count() + clauza[1].bit_count()
+
+    def semnatura(self, clauza: Clauza) -> int:
+        # testul de incluziune pe masti e deja exact; pastram doar lungimea, ca filtru ieftin
+        return clauza[0].bit_count() + clauza[1].bit_count()
+
+    def tautologie(self, clauza: Clauza) -> bool:
+        return bool(clauza[0] & clauza[1])
+
+    def fara(self, clauza: Clauza, lit: int) -> Clauza:
+        """Clauza fara literalul `lit`."""
+        b = self.bit[abs(lit)]
+        return clauza[0] & ~b, clauza[1] & ~b
+
+    def rezolvent(self, c1: Clauza, c2: Clauza, lit: int) -> Optional[Clauza]:
+        """Rezolventul lui c1 (care contine `lit`) cu c2 (care contine -`lit`); None daca e tautologie."""
+        b = self.bit[abs(lit)]
+        p = (c1[0] | c2[0]) & ~b
+        n = (c1[1] | c2[1]) & ~b
+        return None if p & n else (p, n)
+
+    def index(self) -> 'IndexBiti':
+        return IndexBiti(self)
+
+
+class IndexBiti:
+    """
+    Acelasi index ca `subsumare.IndexSubsumare` (liste de aparitii literal DIMACS -> clauze),
+    pentru clauze pe masti de biti. Candidatii se iau tot din listele de aparitii, dar
+    comparatia este exacta pe masti; `semnaturi` tine doar lungimea fiecarei clauze.
+    """
+
+    def __init__(self, forma: ClauzeBiti):
+        self.forma = forma
+        self.aparitii: Dict[int, Set[Clauza]] = {}
+        self.semnaturi: Dict[Clauza, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.semnaturi)
+
+    def __contains__(self, clauza: Clauza) -> bool:
+        return clauza in self.semnaturi
+
+    def __iter__(self) -> Iterator[Clauza]:
+        return iter(self.semnaturi)
+
+    def cu_literal(self, lit: int) -> Set[Clauza]:
+        """Clauzele care contin literalul `lit` (multimea interna, nu se modifica din afara)."""
+        return self.aparitii.get(lit, _GOL)
+
+    def numar(self, lit: int) -> int:
+        """Numarul de clauze care contin literalul `lit`."""
+        return len(self.aparitii.get(lit, _GOL))
+
+    def adauga(self, clauza: Clauza, semn: Optional[int] = None) -> None:
+        if clauza in self.semnaturi:
+            return
+        self.semnaturi[clauza] = self.forma.semnatura(clauza) if semn is None else semn
+        for l in self.forma.literali(clauza):
+            ap = self.aparitii.get(l)
+            if ap is None:
+                self.aparitii[l] = {clauza}
+            else:
+                ap.add(clauza)
+
+    def sterge(self, clauza: Clauza) -> None:
+        del self.semnaturi[clauza]
+        for l in self.forma.literali(clauza):
+            ap = self.aparitii[l]
+            ap.discard(clauza)
+            if not ap:
+                del self.aparitii[l]
+
+    def subsumata(self, clauza: Clauza, semn: Optional[int] = None) -> bool:
+        """True daca baza contine o clauza inclusa in `clauza` (sau egala cu ea)."""
+        if clauza in self.semnaturi:
+            return True
+        # complementele se calculeaza o singura data; testul pe candidat e exact
+        fara_p, fara_n = ~clauza[0], ~clauza[1]
+        aparitii = self.aparitii
+        for l in self.forma.literali(clauza):
+            for dp, dn in aparitii.get(l, _GOL):
+                if not (dp & fara_p or dn & fara_n):
+                    return True
+        return False
+
+    def subsumate_de(self, clauza: Clauza, semn: Optional[int] = None) -> List[Clauza]:
+        """Clauzele din baza care includ strict `clauza`."""
+        k = self.forma.semnatura(clauza) if semn is None else semn
+        semnaturi = self.semnaturi
+        if not k:
+            return [d for d in semnaturi if semnaturi[d]]
+        # orice clauza care include `clauza` contine si literalul ei cel mai rar
+        aparitii = self.aparitii
+        rar = min(self.forma.literali(clauza), key=lambda l: len(aparitii.get(l, _GOL)))
+        p, n = clauza
+        return [d for d in aparitii.get(rar, _GOL)
+                if semnaturi[d] > k and not (p & ~d[0] or n & ~d[1])]
+
+
+Forma = Union[ClauzeMultimi, ClauzeBiti]
+
+
+def alege_forma(clauze: Iterable[Iterable[int]], biti: Optional[bool] = None) -> Forma:
+    """
+    Forma clauzelor pentru DP / Rezolutie: `biti=True` masti de biti, `False` frozenset,
+    `None` (implicit) masti doar daca formula are cel mult PRAG_BITI variabile.
+    """
+    if biti is False:
+        return MULTIMI
+    variabile = sorted({abs(l) for c in clauze for l in c})
+    if biti is None and len(variabile) > PRAG_BITI:
+        return MULTIMI
+    return ClauzeBiti(variabile)
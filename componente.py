@@ -0,0 +1,138 @@
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Any
+
+from masurare_performanta import Masurare
+from pool_lucratori import PoolLucratori, OK
+from fnc import apeleaza_cu_clauze, ca_clauze
+
+
+def componente(clauze: Iterable[FrozenSet[int]]) -> List[List[FrozenSet[int]]]:
+    """
+    Imparte formula in componente conexe: doua clauze sunt in aceeasi componenta daca
+    au (direct sau printr-un lant de clauze) o variabila comuna. Componentele nu au
+    variabile comune, deci formula e SAT daca si numai daca fiecare componenta e SAT.
+    Foloseste union-find pe variabile (cu injumatatirea drumului).
+    O clauza vida formeaza singura o componenta.
+    """
+    parinte: Dict[int, int] = {}
+
+    def radacina(v: int) -> int:
+        p = parinte.setdefault(v, v)
+        while p != v:
+            bunic = parinte[p]
+            parinte[v] = bunic
+            v, p = p, bunic
+        return v
+
+    lista = list(clauze)
+    for c in lista:
+        it = iter(c)
+        prim = next(it, None)
+        if prim is None:
+            continue
+        r = radacina(abs(prim))
+        for l in it:
+            r2 = radacina(abs(l))
+            if r2 != r:
+                parinte[r2] = r
+
+    grupe: Dict[int, List[FrozenSet[int]]] = {}
+    goale: List[List[FrozenSet[int]]] = []
+    for c in lista:
+        prim = next(iter(c), None)
+        if prim is None:
+            goale.append([c])
+        else:
+            grupe.setdefault(radacina(abs(prim)), []).append(c)
+    return goale + list(grupe.values())
+
+
+def _verdict_combinat(verdicte: Iterable[Optional[bool]]) -> Optional[bool]:
+    """False daca o componenta e UNSAT, None daca vreuna e necunoscuta, altfel True."""
+    verdicte = list(verdicte)
+    if False in verdicte:
+        return False
+    if None in verdicte:
+        return None
+    return True
+
+
+def combina_masurari(masurari: List[Masurare]) -> Masurare:
+    """
+    Rezultatul formulei din rezultatele componentelor: timpii se aduna, memoria este varful
+    maxim, contoarele numerice se aduna; `componente` spune in cate parti a fost impartita.
+    La SAT, modelul este reuniunea modelelor componentelor (daca toate au unul).
+    """
+    if len(masurari) == 1:
+        return masurari[0]
+
+    def suma(camp: str):
+        valori = [getattr(m, camp) for m in masurari if getattr(m, camp) is not None]
+        return sum(valori) if valori else None
+
+    varfuri = [m.peak_kib for m in masurari if m.peak_kib is not None]
+    statistici: Dict[str, Any] = {}
+    for m in masurari:
+        for k, v in m.statistici.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                statistici[k] = statistici.get(k, 0) + v
+    statistici['componente'] = len(masurari)
+    sat = _verdict_combinat(m.sat for m in masurari)
+    model = None
+    if sat and all(m.model is not None for m in masurari):
+        model = sorted((l for m in masurari for l in m.model), key=abs)
+    return Masurare(sat, suma('durata'), suma('durata_cpu'), max(varfuri) if varfuri else None,
+                    suma('curr'), masurari[0].nivel, statistici, model)
+
+
+def rezolva_pe_componente(fn: Callable, clauze: Set[FrozenSet[int]], **optiuni) -> Masurare:
+    """
+    Ruleaza solver-ul `fn` pe fiecare componenta a formulei, de la cea mai mica la cea mai mare,
+    in procesul curent; se opreste la prima componenta UNSAT.
+    Rezultatul (vezi `combina_masurari`) acopera doar componentele rezolvate.
+    """
+    parti = componente(clauze)
+    if len(parti) <= 1:
+        return fn(clauze, **optiuni)
+    masurari = []
+    for parte in sorted(parti, key=len):
+        masurari.append(fn(set(parte), **optiuni))
+        if masurari[-1].sat is False:
+            break
+    return combina_masurari(masurari)
+
+
+def rezolva_paralel(pool: PoolLucratori, fn: Callable, formula, optiuni: Dict[str, Any] = None,
+                    timeout: Optional[float] = None) -> Tuple[str, Any]:
+    """
+    Trimite fiecare componenta a formulei ca job separat in `pool` si combina rezultatele.
+    La primul raspuns UNSAT, joburile ramase sunt anulate.
+    Returneaza (stare, valoare) ca un singur job din PoolLucratori: daca o componenta
+    nu s-a terminat cu OK (si nicio alta nu e UNSAT), starea ei devine starea formulei.
+    """
+    parti = componente(ca_clauze(formula))
+    if len(parti) <= 1:
+        (stare, valoare), = pool.executa_ordonat([(apeleaza_cu_clauze, (fn, formula), optiuni or {}, timeout)])
+        return stare, valoare
+    joburi = {pool.trimite(apeleaza_cu_clauze, (fn, set(parte)), optiuni or {}, timeout)
+              for parte in parti}
+    masurari: List[Masurare] = []
+    esec: Optional[Tuple[str, Any]] = None
+    unsat = False
+    while joburi:
+        job_id, stare, valoare = pool.urmatorul_rezultat()
+        if job_id not in joburi:
+            continue
+        joburi.discard(job_id)
+        if unsat:
+            continue    # raspunsurile joburilor anulate
+        if stare != OK:
+            esec = esec or (stare, valoare)
+            continue
+        masurari.append(valoare)
+        if valoare.sat is False:
+            unsat = True
+            for alt_job in joburi:
+                pool.anuleaza(alt_job)
+    if esec and not unsat:
+        return esec
+    return OK, combina_masurari(masurari)
@@ -0,0 +1,175 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Any
+
+from motor_dpll import MotorDPLL, NEATRIBUIT, FALS
+from masurare_performanta import Masurare, NIVEL_IMPLICIT
+from pool_lucratori import PoolLucratori, OK
+from fnc import ca_clauze
+
+# cate variabile (cele mai frecvente, neatribuite) sunt evaluate prin lookahead la fiecare impartire
+CANDIDATI_LOOKAHEAD = 24
+
+
+class _Lookahead(MotorDPLL):
+    """
+    Motorul DPLL folosit doar pentru faza de lookahead: pune un cub pe trail,
+    incearca pe rand ambele valori ale variabilelor candidate si masoara cate
+    atribuiri forteaza fiecare (prin propagarea unitatilor).
+    """
+
+    def aplica_cub(self, cub: List[int]) -> bool:
+        """Pune literalii cubului ca decizii si propaga. False daca apare un conflict."""
+        self._revino(0)
+        if self.inconsistent or self._propaga() >= 0:
+            return False
+        for lit in cub:
+            p = self._cod(lit)
+            if self.valoare[p] == FALS:
+                return False
+            if self.valoare[p] == NEATRIBUIT:
+                self._decide(p)
+                if self._propaga() >= 0:
+                    return False
+        return True
+
+    def _incearca(self, p: int) -> int:
+        """Cate atribuiri forteaza literalul intern `p` (-1 la conflict); revine apoi."""
+        nivel = len(self.limite)
+        inainte = len(self.trail)
+        self._decide(p)
+        conflict = self._propaga() >= 0
+        fortate = len(self.trail) - inainte
+        self._revino(nivel)
+        return -1 if conflict else fortate
+
+    def alege_impartire(self, cub: List[int]) -> Tuple[Optional[int], List[int]]:
+        """
+        Alege variabila pe care se imparte cubul (deja aplicat).
+        Un literal care duce la conflict (failed literal) forteaza opusul lui: acesta e
+        adaugat la cub si aplicat imediat. Returneaza (literal DIMACS de impartire, cubul extins);
+        literalul e None daca toate variabilele sunt atribuite, iar cubul e None daca
+        cubul s-a dovedit contradictoriu.
+        """
+        while True:
+            valoare = self.valoare
+            ap = self.aparitii
+            libere = [v for v in range(len(self.variabile)) if valoare[2 * v] == NEATRIBUIT]
+            if not libere:
+                return None, cub
+            libere.sort(key=lambda v: ap[2 * v] + ap[2 * v + 1], reverse=True)
+
+            cel_mai_bun, scor_maxim, fortat = None, -1, None
+            for v in libere[:CANDIDATI_LOOKAHEAD]:
+                poz, neg = self._incearca(2 * v), self._incearca(2 * v + 1)
+                if poz < 0 and neg < 0:
+                    return None, None
+                if poz < 0 or neg < 0:
+                    fortat = 2 * v + 1 if poz < 0 else 2 * v
+                    break
+                # produsul favorizeaza variabilele care simplifica ambele ramuri
+                scor = (poz + 1) * (neg + 1)
+                if scor > scor_maxim:
+                    cel_mai_bun, scor_maxim = v, scor
+
+            if fortat is None:
+                lit = self.variabile[cel_mai_bun]
+                return (lit if ap[2 * cel_mai_bun] >= ap[2 * cel_mai_bun + 1] else -lit), cub
+            lit = self.variabile[fortat >> 1]
+            cub = cub + [-lit if fortat & 1 else lit]
+            self._decide(fortat)
+            if self._propaga() >= 0:
+                return None, None
+
+
+def genereaza_cuburi(clauze: Iterable[Iterable[int]], nr_cuburi: int) -> Tuple[Optional[bool], List[List[int]]]:
+    """
+    Faza de lookahead: imparte formula in cel mult `nr_cuburi` cuburi (atribuiri partiale,
+    ca liste de literali DIMACS) care acopera impreuna tot spatiul de cautare ramas.
+    Cuburile contradictorii sunt aruncate pe loc. Returneaza (verdict, cuburi), unde
+    verdictul este True daca lookahead-ul a gasit deja o atribuire completa (singurul cub
+    este atunci chiar atribuirea, adica un model), False daca toate cuburile au fost respinse,
+    altfel None.
+    """
+    motor = _Lookahead(clauze)
+    # impartim mereu cubul cel mai scurt (in latime), ca arborele sa ramana echilibrat
+    cuburi: Deque[List[int]] = deque([[]])
+    while cuburi and len(cuburi) < nr_cuburi:
+        cub = cuburi.popleft()
+        if not motor.aplica_cub(cub):
+            continue
+        lit, cub = motor.alege_impartire(cub)
+        if cub is None:
+            continue
+        if lit is None:
+            return True, [motor.model()]
+        cuburi.append(cub + [lit])
+        cuburi.append(cub + [-lit])
+    return (False if not cuburi else None), list(cuburi)
+
+
+def rezolva_cub(fn: Callable, formula, cub: List[int], **optiuni):
+    """Ruleaza solver-ul `fn` pe formula la care se adauga literalii cubului ca clauze unitare."""
+    clauze = set(ca_clauze(formula))
+    clauze.update(frozenset((l,)) for l in cub)
+    return fn(clauze, **optiuni)
+
+
+def ruleaza_cuburi(pool: PoolLucratori, fn: Callable, formula, nr_cuburi: int,
+                   optiuni: Dict[str, Any] = None, timeout: Optional[float] = None) -> Tuple[str, Any]:
+    """
+    Cube-and-conquer pentru o singura formula: lookahead-ul (in procesul curent) produce
+    `nr_cuburi` cuburi, rezolvate apoi in paralel de `fn` pe lucratorii din `pool`.
+    La primul cub SAT restul sunt anulate; UNSAT se raporteaza doar cand toate cuburile
+    au fost respinse. `timeout` se aplica intregii formule.
+    Returneaza (stare, Masurare) ca un singur job din PoolLucratori; durata este timpul de
+    perete al intregii operatii, iar varful de memorie este cel mai mare dintre cuburi.
+    La SAT, modelul (daca solver-ul il da) este cel al cubului satisfacut: include literalii cubului;
+    daca lookahead-ul singur decide SAT, modelul este atribuirea gasita de el.
+    """
+    t0 = time.perf_counter()
+    nivel = (optiuni or {}).get('nivel_masurare', NIVEL_IMPLICIT)
+    clauze = ca_clauze(formula)
+    verdict, cuburi = genereaza_cuburi(clauze, nr_cuburi)
+    statistici = {'cuburi': len(cuburi), 't_lookahead': round(time.perf_counter() - t0, 6)}
+    if verdict is not None:
+        return OK, Masurare(verdict, time.perf_counter() - t0, nivel=nivel, statistici=statistici,
+                            model=cuburi[0] if verdict else None)
+
+    joburi: Set[int] = set()
+    for cub in cuburi:
+        ramas = None if timeout is None else max(0.0, timeout - (time.perf_counter() - t0))
+        joburi.add(pool.trimite(rezolva_cub, (fn, clauze, cub), optiuni or {}, ramas))
+
+    varfuri: List[float] = []
+    esec: Optional[Tuple[str, Any]] = None
+    sat = False
+    model = None
+    refutate = 0
+    while joburi:
+        job_id, stare, valoare = pool.urmatorul_rezultat()
+        if job_id not in joburi:
+            continue
+        joburi.discard(job_id)
+        if sat:
+            continue    # raspunsurile cuburilor anulate
+        if stare != OK or valoare.sat is None:
+            esec = esec or (stare, valoare)
+            continue
+        if valoare.peak_kib is not None:
+            varfuri.append(valoare.peak_kib)
+        if valoare.sat:
+            sat = True
+            model = valoare.model
+            for alt_job in joburi:
+                pool.anuleaza(alt_job)
+        else:
+            refutate += 1
+
+    statistici['cuburi_refutate'] = refutate
+    if esec and not sat and esec[0] != OK:
+        return esec
+    # un cub cu raspuns necunoscut (si niciunul SAT) lasa formula necunoscuta
+    verdict = True if sat else (None if esec else False)
+    return OK, Masurare(verdict, time.perf_counter() - t0, peak_kib=max(varfuri) if varfuri else None,
+                        nivel=nivel, statistici=statistici, model=model)
@@ -1,97 +1,296 @@
-from typing import Set, FrozenSet
-from masurare_performanta import timp_si_memorie  # decorator care masoara timpul si memoria
+import time
+import heapq
+from typing import Dict, List, Set, FrozenSet, Optional, Tuple, Union
+from masurare_performanta import timp_si_memorie, Contoare  # decorator care masoara timpul si memoria
+from clauze_biti import Forma, alege_forma
+from anulare import JETON  # anularea cooperativa a jobului curent (termenul din lucrator)
 
-def alege_variabila(clauze: Set[FrozenSet[int]]) -> int:
+def cost_eliminare(pozitive: int, negative: int) -> int:
     """
-    Pentru fiecare variabila v, calculam de cate ori apare v si -v.
-    Returneaza variabila cu frecventa totala maxima.
+    Estimarea cresterii bazei la eliminarea unei variabile care apare in `pozitive`
+    clauze pozitiv si in `negative` clauze negat: se adauga cel mult pozitive*negative
+    rezolventi si dispar toate clauzele variabilei.
     """
-    frecvente = {}
-    for cl in clauze:
-        for lit in cl:
-            frecvente[lit] = frecvente.get(lit, 0) + 1
-    # agregam pe variabila (abs)
-    scor = {}
-    for lit, cnt in frecvente.items():
-        var = abs(lit)
-        scor[var] = scor.get(var, 0) + cnt
-    # alegem variabila cu scor maxim
-    return max(scor, key=lambda v: scor[v])
+    return pozitive * negative - pozitive - negative
 
 
 @timp_si_memorie
-def dp(clauze_initiale: Set[FrozenSet[int]]) -> bool:
-    # pornim cu o copie mutabila a clauzelor
-    clauze_mod = set(clauze_initiale)
+def dp(clauze_initiale: Set[FrozenSet[int]], contoare: bool = False,
+       crestere_maxima: Optional[int] = None, model: bool = False, biti: Optional[bool] = None):
+    """
+    Algoritmul Davis–Putnam: propagare unitati, literali puri si eliminarea variabilelor
+    prin rezolutie. Variabilele se elimina in ordinea costului estimat (vezi `cost_eliminare`).
+    Cu `crestere_maxima` setat, o eliminare care ar creste baza cu mai mult de atatea clauze
+    este refuzata si se face in schimb o ramificare DPLL pe acea variabila.
+    Cu `contoare=True` returneaza si contoarele interne (variabile eliminate,
+    rezolventi generati, tautologii sarite, clauze subsumate, ramificari) si timpii pe faze.
+    Cu `model=True` pastreaza pasii facuti (unitati, literali puri, clauzele fiecarei variabile
+    eliminate) si, la SAT, reconstruieste un model refacandu-i in ordine inversa.
+    `biti` alege forma clauzelor (vezi `clauze_biti.alege_forma`): masti de biti (True),
+    frozenset (False) sau automat dupa numarul de variabile (None).
+    """
+    st = Contoare() if contoare else None
+    clauze_initiale = list(clauze_initiale)
+    forma = alege_forma(clauze_initiale, biti)
+    # tautologiile sunt mereu adevarate si nu intra in baza
+    clauze = []
+    for c in clauze_initiale:
+        c = forma.din_literali(c)
+        if forma.tautologie(c):
+            if st:
+                st.adauga('tautologii_sarite')
+        else:
+            clauze.append(c)
+    sat, atribuire = _dp(clauze, st, crestere_maxima, model, forma)
+    if model:
+        return sat, st.ca_dict() if st else {}, \
+            sorted((v if val else -v for v, val in atribuire.items()), key=abs) if sat else None
+    return (sat, st.ca_dict()) if st else sat
+
+
+# un pas al algoritmului, pentru reconstructia modelului: un literal fixat (unitate sau pur)
+# sau (variabila eliminata, clauzele ei pozitive, clauzele ei negative), in forma `Forma`
+Pas = Union[int, Tuple[int, list, list]]
+
+
+def _reconstruieste(pasi: List[Pas], model: Dict[int, bool], forma: Forma) -> Dict[int, bool]:
+    """
+    Extinde `model` (modelul formulei ramase) la formula initiala, refacand pasii invers:
+    - un literal fixat devine adevarat (variabila lui nu mai apare in pasii urmatori)
+    - o variabila eliminata v devine falsa daca toate clauzele ei pozitive sunt deja
+      satisfacute fara v, altfel adevarata; rezolventii garanteaza atunci clauzele negative
+    Variabilele libere intalnite pe drum sunt fixate la fals.
+    """
+    def adevarat(l: int) -> bool:
+        return model.setdefault(abs(l), False) == (l > 0)
+
+    for pas in reversed(pasi):
+        if isinstance(pas, int):
+            model[abs(pas)] = pas > 0
+            continue
+        v, pozitive, _ = pas
+        model[v] = not all(any(adevarat(l) for l in forma.literali(c) if l != v) for c in pozitive)
+    return model
+
+
+class _BazaDP:
+    """
+    Baza de clauze a algoritmului DP, indexata pentru subsumare incrementala:
+    fiecare clauza noua (rezolvent sau clauza scurtata de o unitate) este verificata
+    doar fata de clauzele gasite prin listele ei de aparitii, in ambele sensuri.
+    Tine minte clauzele unitare, literalii care pot fi deveniti puri si o coada de prioritati
+    a variabilelor dupa costul eliminarii, actualizata doar pentru variabilele atinse.
+    """
+
+    def __init__(self, st, forma: Forma):
+        self.forma = forma
+        self.index = forma.index()
+        self.unitati = set()
+        self.candidati_puri: Set[int] = set()
+        self.modificate: Set[int] = set()   # variabile al caror cost trebuie recalculat
+        self._cost: Dict[int, int] = {}     # variabila -> costul curent din coada
+        self._heap: List[Tuple[int, int]] = []
+        self.st = st
+
+    def sterge(self, c) -> None:
+        self.index.sterge(c)
+        self.unitati.discard(c)
+        for l in self.forma.literali(c):
+            # daca l nu mai apare, opusul lui poate fi pur
+            if not self.index.numar(l):
+                self.candidati_puri.add(-l)
+            self.modificate.add(abs(l))
+
+    def adauga(self, c) -> None:
+        """Adauga clauza daca nu e subsumata si scoate clauzele pe care le subsumeaza."""
+        st = self.st
+        if st:
+            t0 = time.perf_counter()
+        forma = self.forma
+        semn = forma.semnatura(c)
+        if self.index.subsumata(c, semn):
+            if st:
+                st.adauga('clauze_subsumate')
+                st.cronometreaza('subsumare', t0)
+            return
+        subsumate = self.index.subsumate_de(c, semn)
+        for d in subsumate:
+            self.sterge(d)
+        self.index.adauga(c, semn)
+        if forma.lungime(c) == 1:
+            self.unitati.add(c)
+        self.modificate.update(abs(l) for l in forma.literali(c))
+        if st:
+            st.adauga('clauze_subsumate', len(subsumate))
+            st.cronometreaza('subsumare', t0)
+
+    def literal_pur(self) -> Optional[int]:
+        """Un literal care apare doar cu un semn, sau None."""
+        index = self.index
+        while self.candidati_puri:
+            l = self.candidati_puri.pop()
+            if index.numar(l) and not index.numar(-l):
+                return l
+        return None
+
+    def alege_variabila(self) -> Tuple[int, int]:
+        """
+        Variabila cu cel mai mic cost de eliminare, impreuna cu costul ei.
+        Intrarile vechi din heap sunt sarite la extragere (stergere lenesa).
+        """
+        index = self.index
+        for v in self.modificate:
+            p, n = index.numar(v), index.numar(-v)
+            if p or n:
+                cost = cost_eliminare(p, n)
+                if self._cost.get(v) != cost:
+                    self._cost[v] = cost
+                    heapq.heappush(self._heap, (cost, v))
+            else:
+                self._cost.pop(v, None)
+        self.modificate.clear()
+        while True:
+            cost, v = self._heap[0]
+            if self._cost.get(v) == cost:
+                return v, cost
+            heapq.heappop(self._heap)
+
 
+def _dp(clauze_initiale: list, st, crestere_maxima: Optional[int],
+        model: bool, forma: Forma) -> Tuple[bool, Optional[Dict[int, bool]]]:
+    # (sat, model ca dictionar variabila -> valoare, doar daca `model` si formula e SAT);
+    # clauzele sunt deja in `forma` si fara tautologii.
+    # Ramificarile (eliminari refuzate de `crestere_maxima`) se parcurg cu o stiva explicita,
+    # nu recursiv, deci numarul lor nu e limitat de stiva Python. O intrare este (clauzele
+    # ramurii, literalul fixat pe ramura, lantul (pasi, lant parinte) al pasilor stramosilor).
+    stiva: List[Tuple[list, Optional[int], Optional[tuple]]] = [(clauze_initiale, None, None)]
+    while stiva:
+        clauze, lit, lant = stiva.pop()
+        if lit is not None:
+            clauze = clauze + [forma.din_literali((lit,))]
+        pasi: Optional[List[Pas]] = [] if model else None
+        rezultat = _dp_ramura(clauze, st, crestere_maxima, pasi, forma)
+        if rezultat is True:
+            if not model:
+                return True, None
+            # modelul ramurii se extinde prin pasii fiecarui stramos, de la cel mai apropiat
+            atribuire = _reconstruieste(pasi, {}, forma)
+            while lant is not None:
+                pasi_stramos, lant = lant
+                atribuire = _reconstruieste(pasi_stramos, atribuire, forma)
+            return True, atribuire
+        if rezultat is not False:
+            # ramificam pe variabila, ca in DPLL: intai v adevarat, apoi v fals
+            variabila, ramase = rezultat
+            lant_copii = (pasi, lant) if model else None
+            stiva.append((ramase, -variabila, lant_copii))
+            stiva.append((ramase, variabila, lant_copii))
+    return False, None
+
+
+def _dp_ramura(clauze_initiale: list, st, crestere_maxima: Optional[int], pasi: Optional[List[Pas]],
+               forma: Forma) -> Union[bool, Tuple[int, list]]:
+    # O ramura a algoritmului: True (SAT), False (UNSAT) sau (variabila, clauzele ramase) cand
+    # eliminarea variabilei e refuzata si trebuie ramificat; pasii facuti se adauga in `pasi`
     # cazuri triviale
-    if not clauze_mod:
+    if not clauze_initiale:
         return True
-    if any(len(c) == 0 for c in clauze_mod):
+    lungime = forma.lungime
+    if any(lungime(c) == 0 for c in clauze_initiale):
         return False
 
-    # continuam pana nu mai raman clauze de procesat
-    while clauze_mod:
-        # verificam din nou pentru clauza goala
-        if any(len(c) == 0 for c in clauze_mod):
-            return False
+    # construim baza indexata; si clauzele initiale trec prin subsumare, ca cele create de
+    # algoritm (de la cele mai scurte, deci aproape tot ce e redundant e prins la inserare,
+    # inainte sa intre in baza)
+    baza = _BazaDP(st, forma)
+    index = baza.index
+    for c in sorted(clauze_initiale, key=lungime):
+        baza.adauga(c)
+    baza.candidati_puri = set(index.aparitii)
 
-        # propagarea unitati: gasim clauza cu un singur literal
-        unit = next((next(iter(c)) for c in clauze_mod if len(c) == 1), None)
-        if unit is not None:
+    # continuam pana nu mai raman clauze de procesat (sau pana expira termenul jobului)
+    verifica = JETON.verifica
+    while index:
+        verifica()
+        # propagarea unitati: luam o clauza cu un singur literal
+        if baza.unitati:
+            (unit,) = forma.literali(baza.unitati.pop())
+            if pasi is not None:
+                pasi.append(unit)
+            if st:
+                st.adauga('propagari_unitare')
+                t0 = time.perf_counter()
             # eliminam clauzele care contin literalul adevarat
+            for c in list(index.cu_literal(unit)):
+                baza.sterge(c)
             # si scoatem literalul opus din restul
-            clauze_mod = {
-                frozenset(c2 - {-unit})
-                for c2 in clauze_mod
-                if unit not in c2
-            }
+            scurtate = list(index.cu_literal(-unit))
+            for c in scurtate:
+                baza.sterge(c)
+            for c in scurtate:
+                c2 = forma.fara(c, -unit)
+                if not lungime(c2):
+                    return False
+                baza.adauga(c2)
+            if st:
+                st.cronometreaza('propagare', t0)
             continue
 
         # eliminarea literalului pur: literali care apar doar cu un semn
-        literali = {l for c in clauze_mod for l in c}
-        pur = next((l for l in literali if -l not in literali), None)
+        pur = baza.literal_pur()
         if pur is not None:
+            if st:
+                st.adauga('literali_puri')
+            if pasi is not None:
+                pasi.append(pur)
             # scoatem toate clauzele in care apare literalul pur
-            clauze_mod = {c for c in clauze_mod if pur not in c}
+            for c in list(index.cu_literal(pur)):
+                baza.sterge(c)
             continue
 
-        # alegem o variabila in functie de frecventa
-        variabila = alege_variabila(clauze_mod)
+        # alegem variabila cea mai ieftin de eliminat
+        variabila, cost = baza.alege_variabila()
+        if crestere_maxima is not None and cost > crestere_maxima:
+            # eliminarea ar umfla baza: ramificam pe variabila, ca in DPLL
+            if st:
+                st.adauga('ramificari')
+            return variabila, list(index)
+        if st:
+            st.adauga('variabile_eliminate')
+            t0 = time.perf_counter()
 
-        # impartim clauzele dupa prezenta variabilei
-        pozitive  = [c for c in clauze_mod if  variabila in c]
-        negative  = [c for c in clauze_mod if -variabila in c]
+        # impartim clauzele dupa prezenta variabilei si le scoatem din baza
+        pozitive = list(index.cu_literal(variabila))
+        negative = list(index.cu_literal(-variabila))
+        for c in pozitive + negative:
+            baza.sterge(c)
+        if pasi is not None:
+            pasi.append((variabila, pozitive, negative))
 
         # generam rezolventii pentru variabila
         rezolventi = set()
+        rezolvent = forma.rezolvent
         for c1 in pozitive:
+            verifica()
             for c2 in negative:
-                r = (set(c1) - { variabila }) | (set(c2) - {-variabila})
+                r = rezolvent(c1, c2, variabila)
                 # sarim rezolventii tautologici
-                if any(l in r and -l in r for l in r):
+                if r is None:
+                    if st:
+                        st.adauga('tautologii_sarite')
                     continue
-                rezolventi.add(frozenset(r))
-
-        # pastram clauzele care nu mentioneaza variabila deloc
-        rest = {c for c in clauze_mod if variabila not in {abs(l) for l in c}}
-
-        # construim noul set de clauze
-        clauze_nou = rest | rezolventi
-
-        # eliminare clauze inutile:
-        # scoatem clauzele care contin toti literali altei clauze
-        clauze_reduse = set(clauze_nou)
-        for c1 in clauze_nou:
-            for c2 in clauze_nou:
-                if c1 is not c2 and c1.issubset(c2):
-                    clauze_reduse.discard(c2)
-
-        clauze_mod = clauze_reduse
+                if not lungime(r):
+                    return False
+                rezolventi.add(r)
+        if st:
+            st.adauga('rezolventi_generati', len(rezolventi))
+            st.cronometreaza('eliminare', t0)
 
-        # daca nu mai avem clauze, e satisfiabila
-        if not clauze_mod:
-            return True
+        # adaugam doar rezolventii noi, cu subsumare inainte si inapoi
+        # (de la cei mai scurti, care subsumeaza cel mai des)
+        for r in sorted(rezolventi, key=lungime):
+            verifica()
+            baza.adauga(r)
 
-    # daca iesim din bucla, nu avem contraditie - SAT
+    # daca nu mai avem clauze, nu avem contradictie - SAT
     return True
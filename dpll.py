@@ -1,18 +1,72 @@
-from typing import Set, FrozenSet
-from masurare_performanta import timp_si_memorie  # decorator ca sa ne spuna cat timp si cata memorie a folosit
-from functools import lru_cache                # ca sa tinem minte rezultatele la sub-formule deja rezolvate
+import time
+from typing import Set, FrozenSet, Optional, Tuple, Dict, List
+from masurare_performanta import timp_si_memorie, Contoare  # decorator ca sa ne spuna cat timp si cata memorie a folosit
+from cache_formule import CacheFormule  # ca sa tinem minte rezultatele la sub-formule deja rezolvate
+from componente import componente as imparte_componente  # sub-formule fara variabile comune
+from anulare import JETON  # anularea cooperativa a jobului curent (termenul din lucrator)
+
+# dimensiunea implicita a cache-ului de sub-formule (numar de intrari)
+CACHE_INTRARI_IMPLICIT = 100_000
 
 @timp_si_memorie
-def dpll(clauze: Set[FrozenSet[int]]) -> bool:
+def dpll(clauze: Set[FrozenSet[int]],
+         cache_intrari: Optional[int] = CACHE_INTRARI_IMPLICIT,
+         cache_octeti: Optional[int] = None,
+         cache_politica: str = 'lru',
+         contoare: bool = False,
+         componente: bool = False,
+         model: bool = False):
     """
     Algoritmul DPLL:
     - face propagare unitati (când o clauză are un singur literal)
     - gaseste literali puri (cele care apar doar cu semn fix)
+    - cu `componente=True`, inainte de ramificare, daca formula se imparte in componente fara
+      variabile comune, le rezolva separat, de la cea mai mica, si se opreste la prima UNSAT;
+      e optional, pentru ca union-find-ul ruleaza la fiecare nod de ramificare
     - apoi, daca mai e nevoie, incearca un literal pe rand si face backtracking
+    Rezultatele sub-formulelor se tin intr-un cache marginit (`cache_intrari` / `cache_octeti`,
+    evictie `cache_politica`); cu `cache_intrari=0` memoizarea se opreste complet.
+    Cu `contoare=True` numara si deciziile, propagarile unitare, literalii puri eliminati
+    si revenirile, plus timpul petrecut construind formulele reduse in fiecare faza.
+    Returneaza (sat, contoarele cache-ului si, la cerere, contoarele interne);
+    cu `model=True`, si modelul (literalii fixati pe drumul reusit) ca al treilea element.
     """
+    st = Contoare() if contoare else None
+    verifica = JETON.verifica
+    # literalii fixati pe drumul curent; pe drumul care reuseste nu se mai scoate nimic,
+    # deci la final contine exact modelul (variabilele care lipsesc pot lua orice valoare)
+    drum: Optional[List[int]] = [] if model else None
+    cache = None
+    if cache_intrari != 0:
+        cache = CacheFormule(cache_intrari, cache_octeti, cache_politica)
 
-    @lru_cache(maxsize=None)
     def rec(clz_fs: FrozenSet[FrozenSet[int]]) -> bool:
+        # cautam mai intai in cache, dupa formula insasi (comparata exact la hit)
+        if cache is None:
+            return rezolva(clz_fs)
+        rezultat = cache.cauta(clz_fs)
+        if rezultat is None:
+            rezultat = rezolva(clz_fs)
+            cache.pune(clz_fs, rezultat)
+        elif rezultat and drum is not None:
+            # cache-ul stie doar ca sub-formula e SAT; refacem drumul ca sa avem modelul
+            # (ramurile esuate sunt tot in cache, deci refacerea e ieftina)
+            return rezolva(clz_fs)
+        return rezultat
+
+    def incearca(l: int, clz_fs: FrozenSet[FrozenSet[int]]) -> bool:
+        # rec pe formula redusa dupa ce l a devenit adevarat, cu l pe drum cat timp reuseste
+        if drum is None:
+            return rec(clz_fs)
+        drum.append(l)
+        if rec(clz_fs):
+            return True
+        drum.pop()
+        return False
+
+    def rezolva(clz_fs: FrozenSet[FrozenSet[int]]) -> bool:
+        # ne oprim (cu `Anulat`) daca jobul si-a depasit termenul
+        verifica()
         # Transformam frozenset in set ca sa putem modifica usor
         clz = set(clz_fs)
 
@@ -28,6 +82,9 @@ def dpll(clauze: Set[FrozenSet[int]]) -> bool:
         for c in clz:
             if len(c) == 1:
                 l = next(iter(c))  # literalul din clauza unitară
+                if st:
+                    st.adauga('propagari_unitare')
+                    t0 = time.perf_counter()
                 # eliminam clauzele care contin l (sunt rezolvate)
                 # si scoatem -l din rest
                 new_clz = frozenset(
@@ -35,19 +92,47 @@ def dpll(clauze: Set[FrozenSet[int]]) -> bool:
                     for c2 in clz
                     if l not in c2
                 )
-                return rec(new_clz)  # reluam cu formula redusa
+                if st:
+                    st.cronometreaza('propagare', t0)
+                return incearca(l, new_clz)  # reluam cu formula redusa
 
         # Cautam literali puri (apare l, dar nu apare -l)
         lit = {l for c in clz for l in c}
         for l in lit:
             if -l not in lit:
+                if st:
+                    st.adauga('literali_puri')
+                    t0 = time.perf_counter()
                 # eliminam toate clauzele in care apare l
                 new_clz = frozenset(c for c in clz if l not in c)
-                return rec(new_clz)  # reluam dupa eliminare
+                if st:
+                    st.cronometreaza('literali_puri', t0)
+                return incearca(l, new_clz)  # reluam dupa eliminare
+
+        # Componentele independente se rezolva separat (fiecare ajunge si in cache),
+        # in loc sa explorem produsul spatiilor lor de cautare
+        if componente:
+            if st:
+                t0 = time.perf_counter()
+            parti = imparte_componente(clz)
+            if st:
+                st.cronometreaza('componente', t0)
+            if len(parti) > 1:
+                if st:
+                    st.adauga('descompuneri')
+                inceput = len(drum) if drum is not None else 0
+                if all(rec(frozenset(p)) for p in sorted(parti, key=len)):
+                    return True
+                if drum is not None:
+                    del drum[inceput:]   # modelele componentelor reusite nu mai conteaza
+                return False
 
         # Daca niciun pas simplu nu a rezolvat tot,
         # alegem un literal oricare
         lit = next(iter(next(iter(clz))))
+        if st:
+            st.adauga('decizii')
+            t0 = time.perf_counter()
 
         # Incercam mai intai sa-l punem adevarat
         true_clz = frozenset(
@@ -55,16 +140,29 @@ def dpll(clauze: Set[FrozenSet[int]]) -> bool:
             for c2 in clz
             if lit not in c2
         )
-        if rec(true_clz):
+        if st:
+            st.cronometreaza('ramificare', t0)
+        if incearca(lit, true_clz):
             return True  # daca reuseste, ne oprim
 
+        if st:
+            st.adauga('backtrackuri')
+            t0 = time.perf_counter()
         # Altfel, incercam varianta opusa (literalul = False)
         false_clz = frozenset(
             c2 - {lit}
             for c2 in clz
             if -lit not in c2
         )
-        return rec(false_clz)
+        if st:
+            st.cronometreaza('ramificare', t0)
+        return incearca(-lit, false_clz)
 
     # Apelul initial, convertim lista de clauze pentru cache
-    return rec(frozenset(clauze))
+    sat = rec(frozenset(clauze))
+    statistici = cache.statistici() if cache is not None else {}
+    if st:
+        statistici.update(st.ca_dict())
+    if drum is not None:
+        return sat, statistici, sorted(drum, key=abs) if sat else None
+    return sat, statistici
@@ -1,8 +1,173 @@
-from typing import Dict, Set, FrozenSet, Optional
+from typing import Dict, Set, FrozenSet, Optional, Iterable, Iterator, Tuple, Union, Callable, List, BinaryIO
+from array import array
 import re
 import os
 import io
 
+# inceputul unei formule noi: 'c formula: <nume>' (numele e grupul capturat)
+_RE_FORMULA = re.compile(rb'^[ \t]*c formula:([^\n]*)$', re.M)
+# sfarsitul datelor: linie care incepe cu '%' sau linia '0'
+_RE_SFARSIT = re.compile(rb'^[ \t]*(?:%|0[ \t\r]*$)', re.M)
+# linii de comentariu ('c ...') si de profil ('p cnf ...')
+_RE_COMENTARIU = re.compile(rb'^[ \t]*c[^\n]*$', re.M)
+_RE_PROFIL = re.compile(rb'^[ \t]*p cnf[^\n]*$', re.M)
+# linie de clauza nevida care nu se termina cu tokenul 0
+_RE_FARA_ZERO = re.compile(rb'^(?=[ \t\r]*[^\s])(?![^\n]*(?<![^ \t])0[ \t\r]*$)[^\n]*$', re.M)
+
+
+class FormulaCompacta:
+    """
+    Reprezentare compacta a unei formule FNC:
+    - `literali`   : array('i') cu toti literalii, fiecare clauza terminata cu 0 (ca in DIMACS)
+    - `inceputuri` : array('i') cu pozitia de start a fiecarei clauze, plus sfarsitul bufferului
+    Clauza i ocupa literali[inceputuri[i] : inceputuri[i+1] - 1].
+    Conversia la multimea de frozenset-uri se face doar la cerere, cu `clauze()`.
+    """
+    __slots__ = ('literali', 'inceputuri')
+
+    def __init__(self, literali: array):
+        if literali and literali[-1] != 0:
+            raise ValueError("Bufferul de literali trebuie sa se termine cu 0.")
+        self.literali = literali
+        self.inceputuri = array('i', [0])
+        poz = 0
+        gaseste = literali.index
+        try:
+            while True:
+                poz = gaseste(0, poz) + 1
+                self.inceputuri.append(poz)
+        except ValueError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self.inceputuri) - 1
+
+    def __iter__(self) -> Iterator[array]:
+        lit = self.literali
+        inc = self.inceputuri
+        for i in range(len(inc) - 1):
+            yield lit[inc[i]:inc[i + 1] - 1]
+
+    def clauze(self) -> Set[FrozenSet[int]]:
+        """Forma folosita de solveri: multime de clauze frozenset."""
+        return {frozenset(c) for c in self}
+
+
+def _formula_din_bloc(bloc: bytes) -> FormulaCompacta:
+    """Converteste in bloc liniile de clauze ale unei formule (comentariile sunt deja scoase)."""
+    gresita = _RE_FARA_ZERO.search(bloc)
+    if gresita:
+        linie = gresita.group(0).strip().decode('utf-8', 'replace')
+        raise ValueError(f"Linie invalida: '{linie}'. Trebuie sa se termine cu 0.")
+    return FormulaCompacta(array('i', map(int, bloc.split())))
+
+
+def iter_formulas(sursa: Union[str, os.PathLike, BinaryIO],
+                  marime_bucata: int = 1 << 20) -> Iterator[Tuple[str, FormulaCompacta]]:
+    """
+    Citeste un fisier DIMACS (cale sau obiect fisier, inclusiv un membru de arhiva tar)
+    si produce perechi (nume, formula compacta), cate un bloc 'c formula:' pe rand.
+    Datele se citesc in bucati de `marime_bucata` bytes; fiecare bucata e taiata pe
+    regiuni cu expresii regulate si fiecare bloc e convertit dintr-o data in `array('i')`,
+    astfel incat memoria ramane proportionala cu cea mai mare formula, nu cu tot fisierul.
+    Textul dinaintea primei 'c formula:' devine formula generica, daca are clauze sau profil.
+    """
+    if isinstance(sursa, (str, os.PathLike)):
+        with open(sursa, 'rb') as f:
+            yield from iter_formulas(f, marime_bucata)
+        return
+
+    curent: Optional[str] = None   # numele blocului deschis (None = inainte de prima formula)
+    bloc: List[bytes] = []          # bucatile de text ale blocului deschis
+    rest = b''
+    gata = False
+
+    def inchide_bloc() -> Optional[Tuple[str, FormulaCompacta]]:
+        text = _RE_COMENTARIU.sub(b'', b''.join(bloc))
+        if curent is None and not (_RE_PROFIL.search(text) or text.split()):
+            return None
+        nume = curent if curent is not None else os.path.basename("<batch>")
+        return nume, _formula_din_bloc(_RE_PROFIL.sub(b'', text))
+
+    while not gata:
+        bucata = sursa.read(marime_bucata)
+        if isinstance(bucata, str):
+            bucata = bucata.encode('utf-8')
+        if bucata:
+            date = rest + bucata
+            k = date.rfind(b'\n') + 1
+            date, rest = date[:k], date[k:]
+        else:
+            date, rest, gata = rest, b'', True
+
+        # daca intalnim '%' sau linia '0', incheiem analiza
+        sfarsit = _RE_SFARSIT.search(date)
+        if sfarsit:
+            date, gata = date[:sfarsit.start()], True
+
+        parti = _RE_FORMULA.split(date)
+        bloc.append(parti[0])
+        for i in range(1, len(parti), 2):
+            pereche = inchide_bloc()
+            if pereche:
+                yield pereche
+            curent = parti[i].strip().decode('utf-8')
+            bloc = [parti[i + 1]]
+
+    pereche = inchide_bloc()
+    if pereche:
+        yield pereche
+
+
+def dimacs_octeti_compact(date: bytes) -> Dict[str, FormulaCompacta]:
+    """
+    Varianta rapida a `_proceseaza_dimacs_linii`, pe un buffer intreg (vezi `iter_formulas`).
+    """
+    return dict(iter_formulas(io.BytesIO(date)))
+
+
+def dimacs_file_compact(cale: str) -> Dict[str, FormulaCompacta]:
+    """
+    Proceseaza un fișier DIMACS pe calea rapida, in forma compacta
+    """
+    return dict(iter_formulas(cale))
+
+
+def ca_clauze(formula: Union[FormulaCompacta, Set[FrozenSet[int]]]) -> Set[FrozenSet[int]]:
+    """Aduce o formula (compacta sau deja multime de clauze) la forma folosita de solveri."""
+    if isinstance(formula, FormulaCompacta):
+        return formula.clauze()
+    return formula
+
+
+def apeleaza_cu_clauze(fn: Callable, formula, **optiuni):
+    """
+    Apeleaza un solver pe o formula, convertind-o din forma compacta doar acum
+    (in procesul lucrator, in afara masurarii solver-ului).
+    """
+    return fn(ca_clauze(formula), **optiuni)
+
+
+def verifica_model(formula: Iterable[Iterable[int]], model: Iterable[int]) -> bool:
+    """
+    Verifica in timp liniar ca `model` (lista literalilor adevarati) satisface fiecare clauza
+    a formulei (compacte sau multime de clauze). Variabilele care lipsesc din model nu conteaza,
+    dar un model care contine si v si -v este respins.
+    Tautologiile (clauze cu v si -v) sunt adevarate sub orice atribuire: solverii si preprocesarea
+    le sterg, deci variabilele care apar doar in ele pot lipsi din model.
+    """
+    adevarati = set(model)
+    if any(-l in adevarati for l in adevarati):
+        return False
+    return all(not adevarati.isdisjoint(c) or _tautologie(c) for c in formula)
+
+
+def _tautologie(clauza: Iterable[int]) -> bool:
+    """Clauza contine un literal si negatia lui?"""
+    literali = set(clauza)
+    return any(-l in literali for l in literali)
+
+
 def _proceseaza_dimacs_linii(linii) -> Dict[str, Set[FrozenSet[int]]]:
     """
     Proceseaza un iterator de lini în format DIMACS
@@ -0,0 +1,66 @@
+import csv
+import json
+from typing import Any, Dict, Optional, TextIO
+
+from pool_lucratori import OK
+
+# formatele de iesire pentru modul neinteractiv (vezi `ScriitorInregistrari`)
+FORMATE_IESIRE = ('jsonl', 'csv')
+
+# coloanele unei inregistrari, in ordinea din CSV
+CAMPURI = ('sursa', 'formula', 'solver', 'stare', 'rezultat', 'durata', 'durata_cpu',
+           'peak_kib', 'eroare', 'statistici')
+
+
+def inregistrare(formula: str, solver: str, stare: str, valoare: Any,
+                 sursa: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Rezultatul unei perechi formula x solver ca dictionar plat:
+    `stare` este starea jobului (ok / timeout / eroare), iar `rezultat` verdictul
+    (SAT / UNSAT / UNK, sau None daca solver-ul nu a raspuns). `sursa` este fisierul
+    din arhiva din care provine formula (None in afara arhivelor).
+    """
+    rez: Dict[str, Any] = dict.fromkeys(CAMPURI)
+    rez.update(sursa=sursa, formula=formula, solver=solver, stare=stare, statistici={})
+    if stare == OK:
+        rez['rezultat'] = 'UNK' if valoare.sat is None else ('SAT' if valoare.sat else 'UNSAT')
+        rez['durata'] = valoare.durata
+        rez['durata_cpu'] = valoare.durata_cpu
+        rez['peak_kib'] = valoare.peak_kib
+        rez['statistici'] = valoare.statistici
+    elif valoare is not None:
+        rez['eroare'] = str(valoare)
+    return rez
+
+
+class ScriitorInregistrari:
+    """
+    Scrie cate o inregistrare (vezi `inregistrare`) pentru fiecare pereche formula x solver,
+    ca JSON Lines sau CSV, si goleste fluxul dupa fiecare, astfel incat consumatorii pot
+    procesa rezultatele in timp ce batch-ul inca ruleaza.
+    Obiectul se apeleaza direct: scriitor(formula, solver, stare, valoare, sursa=None).
+    """
+
+    def __init__(self, flux: TextIO, format: str = 'jsonl'):
+        if format not in FORMATE_IESIRE:
+            raise ValueError(f"Format de iesire necunoscut: '{format}'")
+        self.flux = flux
+        self.format = format
+        self.scrise = 0
+        self._csv = None
+        if format == 'csv':
+            self._csv = csv.DictWriter(flux, fieldnames=CAMPURI)
+            self._csv.writeheader()
+            flux.flush()
+
+    def __call__(self, formula: str, solver: str, stare: str, valoare: Any,
+                 sursa: Optional[str] = None) -> None:
+        rez = inregistrare(formula, solver, stare, valoare, sursa)
+        if self._csv:
+            # statisticile raman un obiect JSON intr-o singura coloana
+            rez['statistici'] = json.dumps(rez['statistici'], ensure_ascii=False, default=str)
+            self._csv.writerow(rez)
+        else:
+            self.flux.write(json.dumps(rez, ensure_ascii=False, default=str) + "\n")
+        self.flux.flush()
+        self.scrise += 1
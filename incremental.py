@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, List, Optional, Any
+
+from cdcl import MotorCDCL
+
+# variabilele de la aceasta valoare in sus sunt rezervate selectorilor de nivel (push/pop)
+PRIMUL_SELECTOR = 1 << 40
+
+
+class SolverIncremental:
+    """
+    Solver SAT incremental, pentru multe interogari inrudite pe aceeasi formula de baza,
+    fara proces nou, fara serializare si fara sa refaca baza de clauze la fiecare apel:
+    - `adauga_clauza` adauga o clauza la nivelul curent
+    - `rezolva(ipoteze)` decide formula sub literalii `ipoteze`, valabili doar pentru acest apel
+    - `push` / `pop` deschid si inchid un nivel: clauzele adaugate intre ele dispar la `pop`
+    Motorul CDCL (vezi `MotorCDCL`) ramane acelasi intre apeluri, deci clauzele invatate,
+    activitatile VSIDS si fazele salvate se pastreaza.
+    Fiecare nivel are un selector s (variabila noua): clauzele lui sunt adaugate ca (C v -s),
+    iar `rezolva` presupune s adevarat. `pop` fixeaza permanent -s, ceea ce satisface toate
+    clauzele nivelului; clauzele invatate din ele contin si -s, deci raman corecte.
+    """
+
+    def __init__(self, clauze: Iterable[Iterable[int]] = (), **optiuni_cdcl):
+        self.motor = MotorCDCL(**optiuni_cdcl)
+        self.selectori: List[int] = []       # selectorul fiecarui nivel deschis, de la cel exterior
+        self._urmatorul_selector = PRIMUL_SELECTOR
+        self._retrase = 0                    # clauze ale nivelurilor inchise, ramase in baza
+        self._pe_nivel: List[int] = []       # cate clauze are fiecare nivel deschis
+        self.apeluri = 0
+        self._ultimul: Optional[bool] = None
+        for c in clauze:
+            self.adauga_clauza(c)
+
+    # ---------------------------------------------------------------- clauze
+
+    def adauga_clauza(self, clauza: Iterable[int]) -> None:
+        """Adauga o clauza (literali DIMACS) la nivelul curent; la nivelul 0 ea este permanenta."""
+        clauza = list(clauza)
+        if any(abs(l) >= PRIMUL_SELECTOR for l in clauza):
+            raise ValueError(f"Variabilele de la {PRIMUL_SELECTOR} in sus sunt rezervate selectorilor.")
+        self._ultimul = None
+        self.motor._revino(0)
+        if self.selectori:
+            clauza.append(-self.selectori[-1])
+            self._pe_nivel[-1] += 1
+        self.motor.adauga_clauza(clauza)
+
+    def push(self) -> None:
+        """Deschide un nivel nou; clauzele adaugate pana la `pop` apartin doar lui."""
+        self.selectori.append(self._urmatorul_selector)
+        self._pe_nivel.append(0)
+        self._urmatorul_selector += 1
+
+    def pop(self) -> None:
+        """Inchide ultimul nivel deschis, retragand clauzele adaugate in el."""
+        if not self.selectori:
+            raise IndexError("pop fara push corespunzator")
+        selector = self.selectori.pop()
+        self._retrase += self._pe_nivel.pop()
+        self._ultimul = None
+        self.motor._revino(0)
+        self.motor.adauga_clauza([-selector])
+        # clauzele retrase raman satisfacute in baza; le scoatem cand ajung sa domine
+        if self._retrase > len(self.motor.clauze) // 2:
+            self.motor.simplifica()
+            self._retrase = 0
+
+    # ---------------------------------------------------------------- cautare
+
+    def rezolva(self, ipoteze: Iterable[int] = ()) -> bool:
+        """
+        True daca formula (clauzele permanente plus cele ale nivelurilor deschise) este
+        satisfiabila cu toti literalii din `ipoteze` adevarati, altfel False.
+        """
+        ipoteze = list(ipoteze)
+        if any(abs(l) >= PRIMUL_SELECTOR for l in ipoteze):
+            raise ValueError(f"Variabilele de la {PRIMUL_SELECTOR} in sus sunt rezervate selectorilor.")
+        motor = self.motor
+        self.apeluri += 1
+        coduri = [motor._cod(l) for l in self.selectori + ipoteze]
+        self._ultimul = motor.rezolva(coduri)
+        return self._ultimul
+
+    def model(self) -> Optional[List[int]]:
+        """Modelul ultimului apel `rezolva` reusit (literali DIMACS, fara selectori), altfel None."""
+        if not self._ultimul:
+            return None
+        return [l for l in self.motor.model() if abs(l) < PRIMUL_SELECTOR]
+
+    def statistici(self) -> Dict[str, Any]:
+        """Contoarele acumulate de la crearea solver-ului (pentru `Masurare.statistici`)."""
+        return {'apeluri': self.apeluri, 'conflicte': self.motor.conflicte,
+                'invatate': self.motor.nr_invatate, 'clauze': len(self.motor.clauze),
+                'niveluri': len(self.selectori)}
@@ -0,0 +1,86 @@
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from iesire import inregistrare
+from masurare_performanta import Masurare
+from pool_lucratori import OK
+
+# fisierul implicit al jurnalului de rezultate
+CALE_JURNAL = 'jurnal_rezultate.jsonl'
+
+# verdictul din inregistrari, inapoi in valoarea data de solver
+_VERDICTE = {'SAT': True, 'UNSAT': False, 'UNK': None}
+
+
+def job_portofoliu(solveri) -> str:
+    """Numele jobului din jurnal pentru o cursa de portofoliu intre `solveri`."""
+    return f"Portofoliu({','.join(sorted(solveri))})"
+
+
+class Jurnal:
+    """
+    Jurnal append-only (JSON Lines) al rezultatelor unui batch: fiecare pereche formula x solver
+    terminata este scrisa (si golita pe disc) imediat ce e gata, ca inregistrare (vezi
+    `iesire.inregistrare`) plus `hash` (hash-ul canonic al formulei originale) si `job`
+    (solver-ul, sau `job_portofoliu` in modul portofoliu).
+    - cu `reluare`, inregistrarile existente sunt citite la deschidere si `cauta` le da inapoi,
+      deci o rulare intrerupta reia doar perechile care nu apucasera sa se termine;
+      fara `reluare`, jurnalul incepe gol
+    - o ultima linie incompleta (procesul oprit in timpul scrierii) este ignorata
+    Contorizeaza cate rezultate au fost reluate din jurnal (`reluate`) si cate scrise (`scrise`).
+    """
+
+    def __init__(self, cale: str = CALE_JURNAL, reluare: bool = False):
+        self.cale = cale
+        self.reluate = 0
+        self.scrise = 0
+        self._terminate: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        if reluare and os.path.isfile(cale):
+            with open(cale, encoding='utf-8') as f:
+                for linie in f:
+                    try:
+                        rez = json.loads(linie)
+                    except ValueError:
+                        continue
+                    self._terminate[rez['hash'], rez['job']] = rez
+        self._flux = open(cale, 'a' if reluare else 'w', encoding='utf-8')
+        if self._flux.tell() and not self._linie_completa():
+            self._flux.write("\n")
+
+    def _linie_completa(self) -> bool:
+        """Fisierul existent se termina cu un sfarsit de linie?"""
+        with open(self.cale, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def __enter__(self) -> "Jurnal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.inchide()
+
+    def inchide(self) -> None:
+        self._flux.close()
+
+    def cauta(self, cheie: str, job: str) -> Optional[Tuple[str, str, Any]]:
+        """
+        Rezultatul jurnalizat al jobului pe formula cu hash-ul `cheie`, ca (solver, stare, valoare),
+        unde (stare, valoare) sunt ca de la un lucrator; None daca jobul nu a fost terminat.
+        """
+        rez = self._terminate.get((cheie, job))
+        if rez is None:
+            return None
+        self.reluate += 1
+        if rez['stare'] != OK:
+            return rez['solver'], rez['stare'], rez['eroare']
+        return rez['solver'], OK, Masurare(_VERDICTE[rez['rezultat']], rez['durata'], durata_cpu=rez['durata_cpu'],
+                                           peak_kib=rez['peak_kib'], statistici=rez['statistici'] or {})
+
+    def scrie(self, cheie: str, job: str, formula: str, solver: str, stare: str, valoare: Any,
+              sursa: Optional[str] = None) -> None:
+        """Adauga rezultatul unui job terminat si il goleste imediat pe disc."""
+        rez = dict(hash=cheie, job=job, **inregistrare(formula, solver, stare, valoare, sursa))
+        self._flux.write(json.dumps(rez, ensure_ascii=False, default=str) + "\n")
+        self._flux.flush()
+        self.scrise += 1
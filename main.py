@@ -2,16 +2,37 @@ import time                                    # Pentru cronometrare globala
 import os                                      # Pentru verificarea existentei fisierelor
 import re                                      # Pentru procesarea liniilor de clauze
 import logging                                 # Pentru nivelul de logare
-import multiprocessing                         # Pentru rularea cu timeout in proces separat
-from multiprocessing import TimeoutError       # Exceptie in cazul timeout-ului
 import tarfile                                 # Pentru arhive tar.gz
-from typing import Set, FrozenSet, Callable, Dict
-
-from fnc import dimacs_text, dimacs_file       # Functi pentru citirea formulelor FNC
+import argparse                                # Pentru optiunile din linia de comanda
+import io                                      # Pentru iesire in memorie (mod tastatura)
+import sys                                     # Pentru stdin/stdout in modul neinteractiv
+import contextlib                              # Pentru mutarea textului pe stderr
+import json                                    # Pentru pragurile calibrate ale solver-ului Auto
+from collections import deque                  # Numele formulelor citite, in ordine
+from functools import partial                  # Solverii rulati pe componente, in lucratori
+from typing import Set, FrozenSet, BinaryIO, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from fnc import iter_formulas, apeleaza_cu_clauze, FormulaCompacta, verifica_model  # Citirea formulelor FNC
 from rezolutie import rezolutie                # Implementarea rezolutiei
 from dp import dp                              # Implementarea algoritmului DP
-from dpll import dpll                          # Implementarea algoritmului DPLL
-from masurare_performanta import logger
+from dpll import dpll, CACHE_INTRARI_IMPLICIT  # Implementarea algoritmului DPLL
+from motor_dpll import dpll_trail              # DPLL pe trail cu literali urmariti
+from cdcl import cdcl                          # CDCL cu VSIDS, restarturi si invatare de clauze
+from clauze_biti import FORME_CLAUZE, PRAG_BITI  # Forma clauzelor in DP / Rezolutie (biti sau frozenset)
+from cautare_locala import walksat, cu_trecere_locala, ALGORITMI  # Cautare locala (incompleta)
+from selectie import auto, MOTOARE             # Alegerea automata a solver-ului dupa trasaturile formulei
+from masurare_performanta import logger, Masurare, NIVELURI_MASURARE, NIVEL_IMPLICIT
+from pool_lucratori import PoolLucratori, OK, TIMEOUT, MEMOUT, EROARE  # Pool persistent de procese, cu limite pe job
+from portofoliu import ruleaza_portofoliu, Castig  # Solverii concureaza, primul raspuns castiga
+from cache_rezultate import CacheRezultate, hash_canonic, CALE_IMPLICITA  # Cache persistent de rezultate
+from preprocesare import preproceseaza, Preprocesare  # Simplificarea comuna, inainte de solveri
+from componente import rezolva_pe_componente, rezolva_paralel  # Sub-formule independente
+from cuburi import ruleaza_cuburi              # Cube-and-conquer pentru formulele grele
+from iesire import ScriitorInregistrari, FORMATE_IESIRE  # Inregistrari JSONL/CSV, cate una pe rezultat
+from jurnal import Jurnal, job_portofoliu, CALE_JURNAL  # Jurnal append-only, pentru reluarea batch-urilor
+
+# O formula poate veni in forma compacta (din fisiere) sau ca multime de clauze (tastatura)
+Formula = Union[FormulaCompacta, Set[FrozenSet[int]]]
 
 # Timeout implicit pentru fiecare solver (in secunde)
 DEFAULT_TIMEOUT = 1000
@@ -20,78 +41,404 @@ DEFAULT_TIMEOUT = 1000
 SOLVERS: Dict[str, Callable[[Set[FrozenSet[int]]], bool]] = {
     'Rezolutie': rezolutie,
     'DP':         dp,
-    'DPLL':       dpll
+    'DPLL':       dpll,
+    'DPLL-Trail': dpll_trail,
+    'CDCL':       cdcl,
+    'WalkSAT':    walksat,
+    'Auto':       auto
 }
 
+# Solverii care pot returna si un model la SAT (optiunea `model=True`), folosit de --verifica
+SOLVERI_CU_MODEL = ('DP', 'DPLL', 'DPLL-Trail', 'CDCL', 'WalkSAT', 'Auto')
+
+# Solverii instrumentati, care accepta `contoare=True` (optiunea --contoare)
+SOLVERI_CU_CONTOARE = ('Rezolutie', 'DP', 'DPLL', 'WalkSAT')
+
+# Solverii incompleti (raspund doar YES sau UNK); nu primesc trecerea locala
+SOLVERI_INCOMPLETI = ('WalkSAT',)
+
+# optiunea "Toate" din meniu: motoarele complete (fara WalkSAT si fara Auto, care doar alege unul)
+SOLVERI_TOATE = {n for n in SOLVERS if n not in SOLVERI_INCOMPLETI and n != 'Auto'}
+
+
+def formateaza_statistici(statistici: Dict[str, int]) -> str:
+    """Contoarele interne ale unui solver, ca sufix pentru linia de rezultat."""
+    if not statistici:
+        return ""
+    return " | " + " ".join(f"{k}={v}" for k, v in statistici.items())
+
+
+def _verdict(sat) -> str:
+    """YES / NO, sau UNK pentru un raspuns necunoscut."""
+    if sat is None:
+        return 'UNK'
+    return 'YES' if sat else 'NO '
+
+
+def _linie_rezultat(nume: str, stare: str, valoare: Masurare, timeout: float) -> (str, (float, float)):
+    """
+    Construieste linia afisata pentru un job terminat in pool si perechea (durata, memorie_peak),
+    care este (None, None) daca solver-ul nu a dat un rezultat.
+    Masuratorile care nu au fost facute (vezi `nivel_masurare`) apar ca '-' si conteaza cu 0.
+    """
+    if stare == OK:
+        dur = f"{valoare.durata:<7.4f}" if valoare.durata is not None else f"{'-':<7}"
+        peak = f"{valoare.peak_kib:<8.1f}" if valoare.peak_kib is not None else f"{'-':<8}"
+        linie = f"{nume:<10} | {_verdict(valoare.sat):<3} | {dur}s | {peak}KiB"
+        return linie + formateaza_statistici(valoare.statistici), (valoare.durata or 0.0, valoare.peak_kib or 0.0)
+    if stare == TIMEOUT:
+        return f"{nume:<10} | TIMED OUT after {timeout}s", (None, None)
+    if stare == MEMOUT:
+        return f"{nume:<10} | MEMOUT: {valoare}", (None, None)
+    return f"{nume:<10} | EROARE: {valoare}", (None, None)
+
+
+def _scrie_linie(linie: str, rezultate_file=None):
+    """Afiseaza linia pe consola si, daca avem fisier de iesire, o scrie si acolo."""
+    print(linie)
+    if rezultate_file:
+        rezultate_file.write(linie + "\n")
+
+
+def _preproceseaza(clauze: Formula, nivel_masurare: str = NIVEL_IMPLICIT) -> (Masurare, Formula, Preprocesare):
+    """
+    Trece formula prin preprocesarea comuna (vezi `preproceseaza`).
+    Returneaza (Masurare, None, p) daca formula a fost decisa deja, altfel (None, formula redusa, p);
+    `p` pastreaza atribuirile si renumerotarea, pentru verificarea modelelor.
+    """
+    t0 = time.perf_counter()
+    p = preproceseaza(clauze)
+    if p.sat is None:
+        return None, p.formula, p
+    durata = time.perf_counter() - t0 if nivel_masurare != 'oprit' else None
+    return Masurare(p.sat, durata, nivel=nivel_masurare, statistici={'preprocesare': 'decis'}), None, p
+
+
+def _cu_model(optiuni: Dict[str, object], nume: str) -> Dict[str, object]:
+    """Optiunile solver-ului `nume`, cu cererea de model adaugata daca solver-ul o accepta."""
+    return dict(optiuni or {}, model=True) if nume in SOLVERI_CU_MODEL else optiuni
+
+
+def _verifica(stare: str, valoare, formula: Formula, p: Optional[Preprocesare] = None):
+    """
+    Verifica modelul unui raspuns YES pe formula originala (vezi `verifica_model`) si noteaza
+    in statistici rezultatul ('ok' sau 'fara_model', daca solver-ul nu a dat model) si durata.
+    Dupa preprocesare `p`, modelul formulei reduse este tradus la variabilele originale si
+    completat cu atribuirile fixate de preprocesare.
+    Un model invalid transforma raspunsul intr-o eroare, deci un YES gresit nu ajunge in rezultate.
+    """
+    if stare != OK or valoare.sat is not True:
+        return stare, valoare
+    t0 = time.perf_counter()
+    model = valoare.model
+    if p is not None and (model is not None or p.sat):
+        model = [p.variabile[l - 1] if l > 0 else -p.variabile[-l - 1] for l in model or ()]
+        model += [v if val else -v for v, val in p.atribuiri.items()]
+    if model is None:
+        rezultat = 'fara_model'
+    elif verifica_model(formula, model):
+        rezultat = 'ok'
+    else:
+        return EROARE, "model invalid (verificarea a esuat)"
+    valoare.statistici = dict(valoare.statistici, verificare=rezultat,
+                              t_verificare=round(time.perf_counter() - t0, 6))
+    return stare, valoare
+
 
 def run_solver(
     nume: str,
     fn: Callable[[Set[FrozenSet[int]]], bool],
     clauze: Set[FrozenSet[int]],
     rezultate_file=None,
-    timeout: float = DEFAULT_TIMEOUT
+    timeout: float = DEFAULT_TIMEOUT,
+    optiuni: Dict[str, object] = None,
+    pool: PoolLucratori = None,
+    preprocesare: bool = False,
+    componente: bool = False,
+    cuburi: int = 0,
+    verificare: bool = False,
+    trecere_locala: int = 0
 ) -> (float, float):
     """
     Ruleaza un solver cu timeout:
+     - `optiuni` sunt transmise solver-ului ca argumente cu nume (de ex. dimensiunea cache-ului)
+     - cu `preprocesare`, formula este intai simplificata; daca e decisa astfel,
+       solver-ul nu mai porneste deloc, altfel primeste formula redusa
+     - cu `componente`, fiecare componenta conexa a formulei devine un job separat in `pool`
+       (in paralel); la prima componenta UNSAT celelalte sunt anulate
+     - cu `cuburi` > 0, formula este impartita prin lookahead in atatea cuburi,
+       rezolvate in paralel pe tot `pool`-ul (vezi `ruleaza_cuburi`); impreuna cu `componente`,
+       ca in `_run_batch`, fiecare cub este impartit in componente rezolvate pe rand de lucrator
+     - cu `verificare`, solverii din SOLVERI_CU_MODEL dau si un model, verificat pe formula
+       originala inainte de afisare (vezi `_verifica`)
+     - cu `trecere_locala` > 0, un solver complet este precedat de atatea flip-uri WalkSAT
+       (vezi `cu_trecere_locala`)
+     - jobul ruleaza in `pool`; daca nu e dat, se foloseste un pool temporar cu un lucrator
      - afiseaza o linie cu rezultatul pe ecran
      - daca `rezultate_file` este dat, scrie aceeasi linie si in fisier
      - returneaza tuple(durata, memorie_peak) sau (None, None) daca s-a atins timeout
     """
-    # Creaza un pool cu un singur worker
-    with multiprocessing.Pool(1) as pool:
-        async_res = pool.apply_async(fn, (clauze,))
-        try:
-            sat, dur, peak, curr = async_res.get(timeout=timeout)
-            linie = f"{nume:<10} | {'YES' if sat else 'NO ':<3} | {dur:<7.4f}s | {peak:<8.1f}KiB"
-            result = (dur, peak)
-        except TimeoutError:
-            linie = f"{nume:<10} | TIMED OUT after {timeout}s"
-            result = (None, None)
-
-    # Afiseaza pe consola
-    print(linie)
-    # Daca avem fisier de iesire, scrie si acolo
-    if rezultate_file:
-        rezultate_file.write(linie + "\n")
+    if pool is None:
+        with PoolLucratori(1) as pool_temporar:
+            return run_solver(nume, fn, clauze, rezultate_file, timeout, optiuni, pool_temporar,
+                              preprocesare, componente, cuburi, verificare, trecere_locala)
+
+    originala, p = clauze, None
+    if preprocesare:
+        decis, clauze, p = _preproceseaza(clauze, (optiuni or {}).get('nivel_masurare', NIVEL_IMPLICIT))
+        if decis:
+            stare, valoare = _verifica(OK, decis, originala, p) if verificare else (OK, decis)
+            linie, result = _linie_rezultat(nume, stare, valoare, timeout)
+            _scrie_linie(linie, rezultate_file)
+            return result
+
+    if verificare:
+        optiuni = _cu_model(optiuni, nume)
+    if cuburi and componente:
+        fn = partial(rezolva_pe_componente, fn)
+    if trecere_locala and nume not in SOLVERI_INCOMPLETI:
+        fn = partial(cu_trecere_locala, fn, flipuri_locale=trecere_locala)
+    if cuburi:
+        stare, valoare = ruleaza_cuburi(pool, fn, clauze, cuburi, optiuni, timeout)
+    elif componente:
+        stare, valoare = rezolva_paralel(pool, fn, clauze, optiuni, timeout)
+    else:
+        (stare, valoare), = pool.executa_ordonat([(apeleaza_cu_clauze, (fn, clauze), optiuni or {}, timeout)])
+    if verificare:
+        stare, valoare = _verifica(stare, valoare, originala, p)
+    linie, result = _linie_rezultat(nume, stare, valoare, timeout)
+    _scrie_linie(linie, rezultate_file)
     return result
 
 
 def _run_batch(
-    formulas: Dict[str, Set[FrozenSet[int]]],
+    formulas: Union[Dict[str, Formula], Iterable[Tuple[str, Formula]]],
     solvers_to_run: Set[str],
-    out
+    out,
+    optiuni_solvers: Dict[str, Dict[str, object]] = None,
+    pool: PoolLucratori = None,
+    nr_lucratori: int = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    portofoliu: bool = False,
+    cache_rezultate: CacheRezultate = None,
+    nivel_masurare: str = NIVEL_IMPLICIT,
+    preprocesare: bool = False,
+    componente: bool = False,
+    cuburi: int = 0,
+    verificare: bool = False,
+    inregistrari: Callable = None,
+    trecere_locala: int = 0,
+    memorie_maxima: Optional[int] = None,
+    jurnal: Jurnal = None,
+    sursa: Optional[str] = None
 ) -> (Dict[str,float], Dict[str,float], Dict[str,int], float):
     """
     Ruleaza solvers_to_run pe fiecare formula din `formulas`,
     afiseaza live si scrie in fisierul `out`.
+    `formulas` poate fi un dictionar nume -> formula sau un iterator de perechi
+    (nume, formula), de ex. `iter_formulas`: formulele se citesc doar cand pool-ul
+    are loc pentru ele, deci rezolvarea incepe inainte ca restul fisierului sa fie citit.
+    `optiuni_solvers` asociaza fiecarui solver optiunile lui (vezi `run_solver`).
+    Toate perechile formula x solver sunt trimise concurent in `pool`
+    (sau intr-un pool nou cu `nr_lucratori` procese), iar rezultatele se scriu
+    in ordinea initiala, pe masura ce sunt gata.
+    In modul `portofoliu`, solverii concureaza pe fiecare formula si se pastreaza
+    doar primul raspuns (vezi `ruleaza_portofoliu`); statisticile se aduna pe castigator.
+    Cu `cache_rezultate`, perechile formula x solver deja rezolvate sunt luate din cache
+    (fara lucrator si fara sa intre in timpii batch-ului), iar rezultatele noi sunt memorate.
+    `nivel_masurare` alege cat de detaliat sunt masurati solverii (vezi NIVELURI_MASURARE).
+    Cu `preprocesare`, fiecare formula este simplificata o singura data, in procesul principal,
+    si doar formula redusa ajunge la solveri; formulele decise astfel nu ajung la niciun
+    lucrator si nu intra in timpii solverilor (vezi `_preproceseaza`).
+    Cu `componente`, fiecare job imparte formula in componente independente si le rezolva
+    pe rand, oprindu-se la prima UNSAT (vezi `rezolva_pe_componente`).
+    Cu `cuburi` > 0 (mod cube-and-conquer, ignorat in portofoliu), formulele se iau pe rand
+    si fiecare solver imparte formula in atatea cuburi, rezolvate in paralel pe tot pool-ul.
+    Cu `verificare`, fiecare raspuns YES este verificat in procesul principal pe formula
+    originala (vezi `_verifica`), inclusiv in portofoliu si pentru formulele decise de preprocesare.
+    `inregistrari` (de ex. un `ScriitorInregistrari`) este apelat cu
+    (formula, solver, stare, valoare) pentru fiecare rezultat, imediat ce este afisat.
+    Cu `trecere_locala` > 0, fiecare solver complet incearca intai atatea flip-uri WalkSAT pe
+    formula, in acelasi job (vezi `cu_trecere_locala`).
+    `memorie_maxima` (bytes) limiteaza memoria fiecarui job din pool-ul nou (ignorat daca `pool`
+    e dat); un job care o depaseste apare ca MEMOUT, iar batch-ul continua cu acelasi pool.
+    Cu `jurnal`, fiecare rezultat este adaugat in jurnal imediat ce este afisat (`sursa` este
+    membrul arhivei, daca e cazul); perechile gasite deja in jurnal (la reluare) nu mai ajung
+    la niciun lucrator, dar se afiseaza si intra in statistici ca si cum ar fi fost rulate acum.
     Returneaza:
       - time_tot  : dict cu timpul total pe fiecare solver
       - mem_tot   : dict cu memoria totala pe fiecare solver
       - counts    : dict cu numarul de rulări pe fiecare solver
       - elapsed_all : durata totala a operatiunii batch
     """
+    if pool is None:
+        if portofoliu and nr_lucratori is None:
+            # in portofoliu vrem cel putin cate un lucrator pentru fiecare solver
+            nr_lucratori = max(os.cpu_count() or 1, len(solvers_to_run))
+        with PoolLucratori(nr_lucratori, memorie_maxima) as pool_nou:
+            return _run_batch(formulas, solvers_to_run, out, optiuni_solvers, pool_nou,
+                              timeout=timeout, portofoliu=portofoliu, cache_rezultate=cache_rezultate,
+                              nivel_masurare=nivel_masurare, preprocesare=preprocesare,
+                              componente=componente, cuburi=cuburi, verificare=verificare,
+                              inregistrari=inregistrari, trecere_locala=trecere_locala,
+                              jurnal=jurnal, sursa=sursa)
+
     start_all = time.time()
+    ordine = list(solvers_to_run)
+    # optiunile fiecarui solver, plus nivelul de masurare cerut pentru tot batch-ul
+    optiuni_solvers = {n: dict((optiuni_solvers or {}).get(n) or {}, nivel_masurare=nivel_masurare)
+                       for n in ordine}
+    if verificare:
+        optiuni_solvers = {n: _cu_model(o, n) for n, o in optiuni_solvers.items()}
+    # functia trimisa lucratorilor pentru fiecare solver
+    functii = {n: partial(rezolva_pe_componente, SOLVERS[n]) if componente else SOLVERS[n]
+               for n in ordine}
+    if trecere_locala:
+        functii = {n: fn if n in SOLVERI_INCOMPLETI else partial(cu_trecere_locala, fn, flipuri_locale=trecere_locala)
+                   for n, fn in functii.items()}
     # Initializam acumulatoarele
     time_tot   = {n: 0.0 for n in solvers_to_run}
     mem_tot    = {n: 0.0 for n in solvers_to_run}
     counts     = {n: 0   for n in solvers_to_run}
 
-    # Pentru fiecare formula in batch
-    for idx, (fname, clauses) in enumerate(formulas.items(), start=1):
-        header = f"\n=== Exercitiul {idx}/{len(formulas)}: {fname} ==="
+    # Numarul total e cunoscut doar pentru dictionare; iteratorii sunt consumati lenes
+    total = f"/{len(formulas)}" if isinstance(formulas, dict) else ""
+    perechi = formulas.items() if isinstance(formulas, dict) else formulas
+    citite = deque()
+    # joburile din jurnal pentru fiecare formula: cate unul pe solver, sau cursa din portofoliu
+    joburi_jurnal = [job_portofoliu(ordine)] if portofoliu else ordine
+
+    def formule_citite():
+        # retinem numele (si cheia din cache) in ordinea citirii, ca sa le afisam langa rezultate;
+        # cheia se calculeaza pe formula originala, inainte de preprocesare; pentru verificare
+        # pastram si formula originala, impreuna cu renumerotarea facuta de preprocesare;
+        # `reluate` sunt rezultatele gasite in jurnal (job -> (solver, stare, valoare))
+        for fname, clauses in perechi:
+            cheie = hash_canonic(clauses) if cache_rezultate or jurnal else None
+            reluate = {}
+            if jurnal:
+                reluate = {job: r for job in joburi_jurnal for r in [jurnal.cauta(cheie, job)] if r}
+            originala = clauses if verificare else None
+            decis = p = None
+            if preprocesare and len(reluate) < len(joburi_jurnal):
+                decis, clauses, p = _preproceseaza(clauses, nivel_masurare)
+            citite.append((fname, cheie, originala, p if verificare else None, reluate))
+            yield clauses, cheie, decis, reluate
+
+    def verificat(stare: str, valoare, originala, p):
+        return _verifica(stare, valoare, originala, p) if verificare else (stare, valoare)
+
+    def din_cache(cheie: str, solver_name: str):
+        # (OK, valoare) ca de la un lucrator, sau None daca nu avem rezultatul memorat
+        memorat = cache_rezultate.cauta(cheie, solver_name) if cache_rezultate else None
+        if memorat is None:
+            return None
+        return OK, Masurare(memorat.sat, memorat.durata, peak_kib=memorat.peak_kib, statistici={'cache': 'hit'})
+
+    def jurnalizeaza(job: str, reluate, fname: str, solver_name: str, stare: str, valoare, cheie: str):
+        # rezultatele reluate din jurnal sunt deja acolo
+        if jurnal and job not in reluate:
+            jurnal.scrie(cheie, job, fname, solver_name, stare, valoare, sursa)
+
+    def acumuleaza(solver_name: str, cheie: str, stare: str, valoare, dur, peak):
+        # rezultatele din cache sau decise de preprocesare nu intra in timpii batch-ului;
+        # cele noi se memoreaza
+        if dur is None or valoare.statistici.get('cache') == 'hit' or 'preprocesare' in valoare.statistici:
+            return
+        time_tot[solver_name] += dur
+        mem_tot[solver_name]  += peak
+        counts[solver_name]   += 1
+        if cache_rezultate and valoare.sat is not None:
+            cache_rezultate.salveaza(cheie, solver_name, valoare.sat, dur, peak)
+
+    if portofoliu:
+        solvers = [(n, functii[n], optiuni_solvers[n]) for n in ordine]
+
+        def formule_portofoliu():
+            # daca oricare solver are deja verdictul memorat, formula nu mai intra in cursa
+            for clauses, cheie, decis, reluate in formule_citite():
+                if reluate:
+                    castigator, stare, valoare = reluate[joburi_jurnal[0]]
+                    yield Castig(None if castigator == 'Portofoliu' else castigator, stare, valoare,
+                                 (valoare.durata or 0.0) if stare == OK else 0.0)
+                    continue
+                if decis:
+                    yield Castig('Preprocesare', OK, decis, decis.durata or 0.0)
+                    continue
+                for n in ordine:
+                    memorat = din_cache(cheie, n)
+                    if memorat:
+                        yield Castig(n, memorat[0], memorat[1], 0.0)
+                        break
+                else:
+                    yield clauses
+
+        castiguri = ruleaza_portofoliu(pool, formule_portofoliu(), solvers, timeout)
+        for idx, (castigator, stare, valoare, perete) in enumerate(castiguri, start=1):
+            fname, cheie, originala, p, reluate = citite.popleft()
+            if not reluate:
+                stare, valoare = verificat(stare, valoare, originala, p)
+            header = f"\n=== Exercitiul {idx}{total}: {fname} (portofoliu) ==="
+            linie, (dur, peak) = _linie_rezultat(castigator or 'Portofoliu', stare, valoare, timeout)
+            if castigator:
+                linie += f" | castigator in {perete:.4f}s"
+                acumuleaza(castigator, cheie, stare, valoare, dur, peak)
+            _scrie_linie(header, out)
+            _scrie_linie(linie, out)
+            jurnalizeaza(joburi_jurnal[0], reluate, fname, castigator or 'Portofoliu', stare, valoare, cheie)
+            if inregistrari:
+                inregistrari(fname, castigator or 'Portofoliu', stare, valoare)
+        elapsed_all = time.time() - start_all
+        return time_tot, mem_tot, counts, elapsed_all
+
+    def cunoscut(solver_name: str, cheie: str, decis, reluate):
+        # rezultatul deja stiut (din jurnal, din preprocesare sau din cache), sau None
+        if solver_name in reluate:
+            return reluate[solver_name][1:]
+        return (OK, decis) if decis else din_cache(cheie, solver_name)
+
+    # Joburile sunt generate lenes, pool-ul le trimite pe masura ce are loc;
+    # rezultatele gasite in jurnal sau in cache trec prin pool fara sa ocupe un lucrator
+    def joburi():
+        for clauses, cheie, decis, reluate in formule_citite():
+            for solver_name in ordine:
+                memorat = cunoscut(solver_name, cheie, decis, reluate)
+                if memorat:
+                    yield None, memorat, None, None
+                else:
+                    yield (apeleaza_cu_clauze, (functii[solver_name], clauses),
+                           optiuni_solvers[solver_name], timeout)
+
+    def rezultate_cuburi():
+        # formulele se iau pe rand, iar fiecare solver foloseste tot pool-ul pentru cuburile ei
+        for clauses, cheie, decis, reluate in formule_citite():
+            for solver_name in ordine:
+                yield cunoscut(solver_name, cheie, decis, reluate) or \
+                    ruleaza_cuburi(pool, functii[solver_name], clauses, cuburi,
+                                   optiuni_solvers[solver_name], timeout)
+
+    rezultate = rezultate_cuburi() if cuburi else pool.executa_ordonat(joburi())
+
+    # Pentru fiecare formula in batch (primul rezultat aduce si numele formulei)
+    for idx, primul in enumerate(rezultate, start=1):
+        fname, cheie, originala, p, reluate = citite.popleft()
+        header = f"\n=== Exercitiul {idx}{total}: {fname} ==="
         print(header);    out.write(header + "\n")
 
         title = "Solver     | SAT | Time(s)  | Peak KiB"
         print(title);     out.write(title + "\n"); out.write("-"*len(title)+"\n")
 
-        # Ruleaza fiecare solver selectat
-        for solver_name in solvers_to_run:
-            fn = SOLVERS[solver_name]
-            dur, peak = run_solver(solver_name, fn, clauses, rezultate_file=out)
-            if dur is not None:
-                time_tot[solver_name] += dur
-                mem_tot[solver_name]  += peak
-                counts[solver_name]   += 1
+        # Rezultatele fiecarui solver selectat, in ordine
+        for i, solver_name in enumerate(ordine):
+            stare, valoare = primul if i == 0 else next(rezultate)
+            if solver_name not in reluate:
+                stare, valoare = verificat(stare, valoare, originala, p)
+            linie, (dur, peak) = _linie_rezultat(solver_name, stare, valoare, timeout)
+            _scrie_linie(linie, out)
+            acumuleaza(solver_name, cheie, stare, valoare, dur, peak)
+            jurnalizeaza(solver_name, reluate, fname, solver_name, stare, valoare, cheie)
+            if inregistrari:
+                inregistrari(fname, solver_name, stare, valoare)
 
         print(); out.write("\n")
 
@@ -99,20 +446,46 @@ def _run_batch(
     return time_tot, mem_tot, counts, elapsed_all
 
 
+def _scrie_statistici_cache(cache_rezultate: CacheRezultate, out):
+    """Cate rezultate au fost servite din cache-ul persistent (daca e folosit)."""
+    if cache_rezultate is None:
+        return
+    line = (f"Servite din cache:          {cache_rezultate.hituri} "
+            f"(din {cache_rezultate.hituri + cache_rezultate.ratari} cautari)\n")
+    print(line); out.write(line)
+
+
+def _scrie_statistici_jurnal(jurnal: Jurnal, out):
+    """Cate rezultate au fost reluate din jurnal si cate au fost adaugate acum (daca e folosit)."""
+    if jurnal is None:
+        return
+    line = f"Reluate din jurnal:         {jurnal.reluate} (adaugate acum: {jurnal.scrise})\n"
+    print(line); out.write(line)
+
+
 def process_file(
-    input_path: str,
+    input_path: Union[str, BinaryIO],
     output_path: str,
-    solvers_to_run: Set[str]
+    solvers_to_run: Set[str],
+    optiuni_solvers: Dict[str, Dict[str, object]] = None,
+    nr_lucratori: int = None,
+    portofoliu: bool = False,
+    **optiuni_batch
 ):
     """
-    Proceseaza un fisier DIMACS in modul batch:
-     1. Citeste formulele cu dimacs_file
-     2. Ruleaza _run_batch pentru toate formulele
+    Proceseaza un fisier DIMACS in modul batch (`input_path` poate fi si un obiect fisier
+    binar deschis, de ex. sys.stdin.buffer):
+     1. Citeste formulele lenes cu iter_formulas (conversia la clauze se face in lucratori)
+     2. Ruleaza _run_batch pentru toate formulele, pe un pool de `nr_lucratori` procese
+        (cu `portofoliu`, doar primul raspuns pe formula; restul optiunilor, de ex.
+        `cache_rezultate`, sunt transmise direct lui _run_batch)
      3. Scrie rezultatele si statisticile generale in `output_path`
     """
-    formulas = dimacs_file(input_path)
     with open(output_path, 'w', encoding='utf-8') as out:
-        time_tot, mem_tot, counts, elapsed_all = _run_batch(formulas, solvers_to_run, out)
+        time_tot, mem_tot, counts, elapsed_all = _run_batch(iter_formulas(input_path), solvers_to_run, out, optiuni_solvers,
+                                                            nr_lucratori=nr_lucratori,
+                                                            portofoliu=portofoliu,
+                                                            **optiuni_batch)
 
         # Scrie statistici generale
         out.write("=== Statistici generale ===\n")
@@ -134,6 +507,8 @@ def process_file(
             f"Timp de executie TOTAL:       {elapsed_all:.4f}s ({elapsed_min:.4f} min)\n"
         )
         print(footer); out.write(footer)
+        _scrie_statistici_cache(optiuni_batch.get('cache_rezultate'), out)
+        _scrie_statistici_jurnal(optiuni_batch.get('jurnal'), out)
 
     print(f"\n>> Rezultatele au fost scrise in '{output_path}' <<")
 
@@ -141,12 +516,18 @@ def process_file(
 def process_tar_archive(
     archive_path: str,
     solvers_to_run: Set[str],
-    output_path: str
+    output_path: str,
+    optiuni_solvers: Dict[str, Dict[str, object]] = None,
+    nr_lucratori: int = None,
+    portofoliu: bool = False,
+    **optiuni_batch
 ):
     """
-    Proceseaza o arhiva .tar.gz:
+    Proceseaza o arhiva .tar.gz (cu `portofoliu`, doar primul raspuns pe formula;
+    restul optiunilor sunt transmise direct lui _run_batch):
      - extrage toate fisierele .cnf/.dimacs
      - pentru fiecare fisier si fiecare formula, apeleaza _run_batch
+       (acelasi pool de `nr_lucratori` procese este refolosit pentru toata arhiva)
      - la final, scrie si afiseaza statisticile pe intreaga arhiva
     """
     if not os.path.isfile(archive_path):
@@ -154,20 +535,17 @@ def process_tar_archive(
         return
 
     try:
-        tar = tarfile.open(archive_path, 'r:gz')
+        # modul flux ('r|gz'): membrii sunt cititi pe rand, fara sa decomprimam arhiva in avans
+        tar = tarfile.open(archive_path, 'r|gz')
     except Exception as e:
         print(f"Nu am putut deschide arhiva: {e}")
         return
 
-    members = [m for m in tar.getmembers()
-               if m.isfile() and m.name.endswith(('.cnf', '.dimacs'))]
-    if not members:
-        print("Nu am gasit fisiere .cnf/.dimacs in arhiva.")
-        tar.close()
-        return
-
-    # Deschidem fisierul de iesire
-    with open(output_path, 'w', encoding='utf-8') as out:
+    # Deschidem fisierul de iesire si pool-ul de lucratori, comun pentru toata arhiva
+    if portofoliu and nr_lucratori is None:
+        nr_lucratori = max(os.cpu_count() or 1, len(solvers_to_run))
+    with open(output_path, 'w', encoding='utf-8') as out, \
+            PoolLucratori(nr_lucratori, optiuni_batch.get('memorie_maxima')) as pool:
         # Avertisment daca s-a ales Rezolutie (poate fi ineficient)
         if 'Rezolutie' in solvers_to_run:
             warn = "(!) Ai ales Rezolutie pe arhiva – poate fi ineficient."
@@ -178,20 +556,27 @@ def process_tar_archive(
         global_mem   = {n: 0.0 for n in solvers_to_run}
         global_count = {n: 0   for n in solvers_to_run}
         archive_start = time.time()
+        nr_fisiere = 0
 
         # Pentru fiecare fisier din arhiva
-        for member in members:
-            header = f"\n=== Fisier in arhiva: {member.name} ==="
-            print(header); out.write(header + "\n")
-
+        for member in tar:
+            if not (member.isfile() and member.name.endswith(('.cnf', '.dimacs'))):
+                continue
             f = tar.extractfile(member)
             if not f:
                 continue
-            text = f.read().decode('utf-8')
-            formulas = dimacs_text(text)
+            nr_fisiere += 1
+            header = f"\n=== Fisier in arhiva: {member.name} ==="
+            print(header); out.write(header + "\n")
 
-            # Ruleaza batch intern si primeste statistici locale
-            time_tot, mem_tot, counts, _ = _run_batch(formulas, solvers_to_run, out)
+            # Ruleaza batch intern (formulele se citesc incremental din membru);
+            # inregistrarile structurate primesc si numele membrului
+            optiuni_membru = dict(optiuni_batch, sursa=member.name)
+            if optiuni_batch.get('inregistrari'):
+                optiuni_membru['inregistrari'] = partial(optiuni_batch['inregistrari'], sursa=member.name)
+            time_tot, mem_tot, counts, _ = _run_batch(iter_formulas(f), solvers_to_run, out,
+                                                      optiuni_solvers, pool, portofoliu=portofoliu,
+                                                      **optiuni_membru)
 
             # Aduna in statistica globala
             for solver in solvers_to_run:
@@ -199,6 +584,10 @@ def process_tar_archive(
                 global_mem [solver]  += mem_tot.get(solver, 0.0)
                 global_count[solver] += counts.get(solver, 0)
 
+        if not nr_fisiere:
+            msg = "Nu am gasit fisiere .cnf/.dimacs in arhiva."
+            print(msg); out.write(msg + "\n")
+
         # Dupa procesarea tuturor fisierelor, afiseaza statisticile globale
         archive_elapsed = time.time() - archive_start
         archive_min     = archive_elapsed / 60.0
@@ -225,6 +614,8 @@ def process_tar_archive(
             f"Timp executie arhiva:       {archive_elapsed:.4f}s ({archive_min:.4f} min)\n"
         )
         print(footer); out.write(footer)
+        _scrie_statistici_cache(optiuni_batch.get('cache_rezultate'), out)
+        _scrie_statistici_jurnal(optiuni_batch.get('jurnal'), out)
 
     tar.close()
     print(f"\n>> Rezultatele au fost scrise in '{output_path}' <<")
@@ -275,21 +666,40 @@ def choose_solvers() -> Set[str]:
      1) Rezolutie
      2) DP
      3) DPLL
-     4) Toate
+     4) DPLL-Trail
+     5) CDCL
+     6) Toate
+     7) WalkSAT (cautare locala, raspunde doar YES sau UNK)
+     8) Auto (alege solver-ul pentru fiecare formula, dupa trasaturile ei)
     """
-    print("\n1) Rezolutie   2) DP   3) DPLL   4) Toate")
-    c = input("Optiune (1-4): ").strip()
+    print("\n1) Rezolutie   2) DP   3) DPLL   4) DPLL-Trail   5) CDCL   6) Toate   7) WalkSAT   8) Auto")
+    c = input("Optiune (1-8): ").strip()
     mapping = {
         '1': {'Rezolutie'},
         '2': {'DP'},
         '3': {'DPLL'},
-        '4': set(SOLVERS.keys())
+        '4': {'DPLL-Trail'},
+        '5': {'CDCL'},
+        '6': set(SOLVERI_TOATE),
+        '7': {'WalkSAT'},
+        '8': {'Auto'}
     }
     return mapping.get(c, set())
 
 
-def interactive_menu():
-    """Bucla principala a meniului interactiv."""
+def interactive_menu(solvers_impliciti: Set[str] = None,
+                     optiuni_solvers: Dict[str, Dict[str, object]] = None,
+                     nr_lucratori: int = None,
+                     portofoliu: bool = False,
+                     **optiuni_batch):
+    """
+    Bucla principala a meniului interactiv.
+    Cu `portofoliu`, solverii alesi concureaza pe fiecare formula (doar verdictul primului).
+    `optiuni_batch` (de ex. `cache_rezultate`) sunt transmise modurilor batch.
+    Daca `solvers_impliciti` e dat (din linia de comanda), nu se mai afiseaza meniul solver-elor.
+    `optiuni_solvers` sunt transmise mai departe fiecarui solver, iar modurile batch
+    folosesc un pool de `nr_lucratori` procese (implicit numarul de nuclee).
+    """
     logger.setLevel(logging.WARNING)
     while True:
         mode = choose_input()
@@ -297,9 +707,10 @@ def interactive_menu():
             print("La revedere!")
             break
         if mode == '3':
-            print("\n(!) Pentru procesarea arhivelor mari, se recomanda sa folositi DPLL, pentru eficienta mai buna.")
+            print("\n(!) Pentru procesarea arhivelor mari, se recomanda sa folositi Auto (8), care alege "
+                  "solver-ul potrivit fiecarei formule.")
 
-        solvers = choose_solvers()
+        solvers = set(solvers_impliciti) if solvers_impliciti else choose_solvers()
         if not solvers:
             print("Niciun solver ales, reincearca.")
             continue
@@ -310,23 +721,258 @@ def interactive_menu():
             if not os.path.isfile(inp):
                 print(f"Eroare: '{inp}' nu exista.")
                 continue
-            process_file(inp, out, solvers)
+            process_file(inp, out, solvers, optiuni_solvers, nr_lucratori, portofoliu, **optiuni_batch)
 
         elif mode == '3':
             arch = input("Cale arhiva (.tar.gz):        ").strip()
             out  = input("Cale fisier iesire (.txt)):   ").strip()
-            process_tar_archive(arch, solvers, out)
+            process_tar_archive(arch, solvers, out, optiuni_solvers, nr_lucratori, portofoliu, **optiuni_batch)
 
         else:  # mode == '2'
             clauze = read_from_keyboard()
+            if portofoliu:
+                _run_batch({'tastatura': clauze}, solvers, io.StringIO(), optiuni_solvers,
+                           nr_lucratori=nr_lucratori, portofoliu=True, **optiuni_batch)
+                continue
             title = "Solver     | SAT | Time(s)  | Peak KiB"
             print("\n" + title)
             print("-"*len(title))
-            for solver_name in solvers:
-                run_solver(solver_name, SOLVERS[solver_name], clauze)
+            with PoolLucratori(nr_lucratori, optiuni_batch.get('memorie_maxima')) as pool:
+                for solver_name in solvers:
+                    optiuni = dict((optiuni_solvers or {}).get(solver_name) or {},
+                                   nivel_masurare=optiuni_batch.get('nivel_masurare', NIVEL_IMPLICIT))
+                    run_solver(solver_name, SOLVERS[solver_name], clauze,
+                               timeout=optiuni_batch.get('timeout', DEFAULT_TIMEOUT), optiuni=optiuni, pool=pool,
+                               preprocesare=optiuni_batch.get('preprocesare', False),
+                               componente=optiuni_batch.get('componente', False),
+                               cuburi=optiuni_batch.get('cuburi', 0),
+                               verificare=optiuni_batch.get('verificare', False),
+                               trecere_locala=optiuni_batch.get('trecere_locala', 0))
 
         print()
 
 
+def _adauga_optiuni_comune(parser: argparse.ArgumentParser, implicite: bool = True) -> None:
+    """
+    Optiunile comune meniului interactiv si subcomenzilor. Pe subcomenzi (`implicite=False`)
+    valorile implicite sunt suprimate, ca sa nu le acopere pe cele date inaintea subcomenzii.
+    """
+    def d(valoare):
+        return valoare if implicite else argparse.SUPPRESS
+
+    parser.add_argument('--solver', action='append', default=d(None), choices=list(SOLVERS.keys()),
+                        help="solver folosit fara a mai intreba (se poate repeta; subcomenzile folosesc implicit DPLL)")
+    parser.add_argument('--cache-intrari', type=int, default=d(CACHE_INTRARI_IMPLICIT),
+                        help="numarul maxim de sub-formule memorate de DPLL")
+    parser.add_argument('--cache-octeti', type=int, default=d(None),
+                        help="limita aproximativa de memorie (bytes) pentru cache-ul DPLL")
+    parser.add_argument('--cache-politica', choices=['lru', 'clock'], default=d('lru'),
+                        help="politica de evictie a cache-ului DPLL")
+    parser.add_argument('--fara-cache', action='store_true', default=d(False),
+                        help="dezactiveaza memoizarea sub-formulelor in DPLL")
+    parser.add_argument('--lucratori', type=int, default=d(None),
+                        help="numarul de procese lucratoare pentru modurile batch (implicit: nr. de nuclee)")
+    parser.add_argument('--timeout', type=float, default=d(DEFAULT_TIMEOUT), metavar='SECUNDE',
+                        help=f"timpul maxim pentru fiecare pereche formula x solver (implicit {DEFAULT_TIMEOUT}s)")
+    parser.add_argument('--memorie', type=float, default=d(None), metavar='MIB',
+                        help="memoria maxima a fiecarui job, in MiB (doar pe Unix); peste ea jobul e MEMOUT")
+    paralel = parser.add_mutually_exclusive_group()
+    paralel.add_argument('--portofoliu', action='store_true', default=d(False),
+                         help="solverii alesi concureaza pe fiecare formula; se pastreaza primul raspuns")
+    paralel.add_argument('--cuburi', type=int, default=d(0), metavar='K',
+                         help="cube-and-conquer: fiecare formula e impartita in K cuburi rezolvate in paralel")
+    parser.add_argument('--masurare', choices=NIVELURI_MASURARE, default=d(NIVEL_IMPLICIT),
+                        help="nivelul de masurare: oprit, timp, rss sau tracemalloc (implicit, cel mai scump)")
+    parser.add_argument('--dp-crestere', type=int, default=d(None), metavar='N',
+                        help="DP refuza eliminarile care ar creste baza cu peste N clauze si ramifica in schimb")
+    parser.add_argument('--dp-clauze', choices=FORME_CLAUZE, default=d('auto'),
+                        help="forma clauzelor in DP: masti de biti, frozenset sau automat (biti pana la "
+                             f"{PRAG_BITI} variabile)")
+    parser.add_argument('--rezolutie-clauze', choices=FORME_CLAUZE, default=d('auto'),
+                        help="forma clauzelor in Rezolutie: masti de biti, frozenset sau automat")
+    parser.add_argument('--rezolutie-latime', type=int, default=d(None), metavar='N',
+                        help="Rezolutie arunca rezolventii cu peste N literali (raspunsul devine UNK, nu YES)")
+    parser.add_argument('--rezolutie-generatii', type=int, default=d(None), metavar='N',
+                        help="Rezolutie se opreste cu UNK dupa N generatii de rezolventi")
+    parser.add_argument('--walksat-algoritm', choices=ALGORITMI, default=d('walksat'),
+                        help="WalkSAT: pas lacom cu zgomot (walksat) sau alegere probabilista (probsat)")
+    parser.add_argument('--walksat-zgomot', type=float, default=d(None), metavar='P',
+                        help="WalkSAT: probabilitatea unui pas aleator (walksat) sau exponentul cb (probsat)")
+    parser.add_argument('--walksat-flipuri', type=int, default=d(None), metavar='N',
+                        help="WalkSAT: flip-uri pe incercare, inainte de restart (implicit proportional cu nr. de variabile)")
+    parser.add_argument('--walksat-restarturi', type=int, default=d(None), metavar='N',
+                        help="WalkSAT: numarul de incercari pana raspunde UNK")
+    parser.add_argument('--walksat-seed', type=int, default=d(0), metavar='S',
+                        help="WalkSAT: samanta generatorului aleator (implicit 0)")
+    parser.add_argument('--trecere-locala', type=int, default=d(0), metavar='N',
+                        help="fiecare solver complet incearca intai N flip-uri WalkSAT (raspuns rapid la SAT)")
+    parser.add_argument('--auto-praguri', default=d(None), metavar='CALE',
+                        help="pragurile de rutare ale solver-ului Auto, ca JSON (de ex. din benchmark.py --calibreaza)")
+    parser.add_argument('--preprocesare', action='store_true', default=d(False),
+                        help="simplifica formulele inainte de solveri (tautologii, duplicate, unitati, literali puri)")
+    parser.add_argument('--componente', action='store_true', default=d(False),
+                        help="imparte fiecare formula in componente independente, rezolvate separat")
+    parser.add_argument('--verifica', action='store_true', default=d(False),
+                        help=f"{', '.join(SOLVERI_CU_MODEL)} dau si un model, verificat la fiecare raspuns YES")
+    parser.add_argument('--contoare', action='store_true', default=d(False),
+                        help=f"{', '.join(SOLVERI_CU_CONTOARE)} raporteaza contoarele interne si timpii pe faze")
+    parser.add_argument('--cache-rezultate', nargs='?', const=CALE_IMPLICITA, default=d(None), metavar='CALE',
+                        help=f"foloseste cache-ul persistent de rezultate (implicit '{CALE_IMPLICITA}')")
+    parser.add_argument('--ocoleste-cache', action='append', default=d([]), metavar='SOLVER',
+                        help="nu citi din cache rezultatele acestui solver (se poate repeta)")
+    parser.add_argument('--invalideaza-cache', action='append', default=d([]), metavar='SOLVER',
+                        help="sterge din cache rezultatele acestui solver inainte de rulare (se poate repeta)")
+    parser.add_argument('--jurnal', nargs='?', const=CALE_JURNAL, default=d(None), metavar='CALE',
+                        help=f"scrie fiecare rezultat, imediat ce e gata, intr-un jurnal JSONL (implicit '{CALE_JURNAL}')")
+    parser.add_argument('--reluare', action='store_true', default=d(False),
+                        help="reia un batch intrerupt: perechile formula x solver din jurnal nu se mai ruleaza")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Optiunile din linia de comanda. Fara subcomanda porneste meniul interactiv;
+    subcomenzile `fisier`, `arhiva` si `stdin` ruleaza batch-ul fara nicio intrebare
+    si scriu rezultatele ca inregistrari JSONL/CSV (vezi `ruleaza_comanda`).
+    """
+    parser = argparse.ArgumentParser(description="Solver SAT pentru formule FNC in format DIMACS")
+    _adauga_optiuni_comune(parser)
+    subcomenzi = parser.add_subparsers(dest='comanda', metavar='COMANDA')
+    for nume, ajutor in (('fisier', "rezolva formulele dintr-un fisier DIMACS"),
+                         ('arhiva', "rezolva fisierele .cnf/.dimacs dintr-o arhiva .tar.gz"),
+                         ('stdin', "rezolva formulele DIMACS citite de la intrarea standard")):
+        sub = subcomenzi.add_parser(nume, help=ajutor, description=ajutor)
+        if nume != 'stdin':
+            sub.add_argument('intrare', help="calea fisierului" if nume == 'fisier' else "calea arhivei")
+        sub.add_argument('--format', choices=FORMATE_IESIRE, default='jsonl',
+                         help="formatul inregistrarilor: JSON Lines (implicit) sau CSV")
+        sub.add_argument('--iesire', default='-', metavar='CALE',
+                         help="fisierul inregistrarilor ('-' = iesirea standard, implicit)")
+        sub.add_argument('--raport', default=None, metavar='CALE',
+                         help="scrie si raportul text obisnuit in acest fisier")
+        sub.add_argument('--silentios', action='store_true',
+                         help="nu afisa raportul text pe stderr")
+        _adauga_optiuni_comune(sub, implicite=False)
+    return parser.parse_args(argv)
+
+
+def optiuni_din_args(args: argparse.Namespace) -> Dict[str, Dict[str, object]]:
+    """Construieste optiunile pe solver din argumentele liniei de comanda."""
+    optiuni: Dict[str, Dict[str, object]] = {
+        'DPLL': {
+            'cache_intrari': 0 if args.fara_cache else args.cache_intrari,
+            'cache_octeti': args.cache_octeti,
+            'cache_politica': args.cache_politica,
+        },
+    }
+    if args.componente:
+        # DPLL imparte in componente si in recursie, nu doar formula de la intrare
+        optiuni['DPLL']['componente'] = True
+    if args.dp_crestere is not None:
+        optiuni['DP'] = {'crestere_maxima': args.dp_crestere}
+    if args.rezolutie_latime is not None or args.rezolutie_generatii is not None:
+        optiuni['Rezolutie'] = {'latime_maxima': args.rezolutie_latime,
+                                'generatii_maxime': args.rezolutie_generatii}
+    for nume, forma in (('DP', args.dp_clauze), ('Rezolutie', args.rezolutie_clauze)):
+        if forma != 'auto':
+            optiuni.setdefault(nume, {})['biti'] = forma == 'biti'
+    optiuni['WalkSAT'] = {'algoritm': args.walksat_algoritm, 'seed': args.walksat_seed}
+    if args.walksat_zgomot is not None:
+        optiuni['WalkSAT']['zgomot' if args.walksat_algoritm == 'walksat' else 'cb'] = args.walksat_zgomot
+    if args.walksat_flipuri is not None:
+        optiuni['WalkSAT']['max_flipuri'] = args.walksat_flipuri
+    if args.walksat_restarturi is not None:
+        optiuni['WalkSAT']['max_restarturi'] = args.walksat_restarturi
+    if args.contoare:
+        # doar solverii instrumentati accepta optiunea
+        for nume in SOLVERI_CU_CONTOARE:
+            optiuni.setdefault(nume, {})['contoare'] = True
+    # Auto transmite motorului ales optiunile lui obisnuite
+    optiuni['Auto'] = {'optiuni_ruta': {m: optiuni[m] for m in MOTOARE if m in optiuni}}
+    if args.auto_praguri:
+        with open(args.auto_praguri, encoding='utf-8') as f:
+            optiuni['Auto']['praguri'] = json.load(f)
+    return optiuni
+
+
+def cache_din_args(args: argparse.Namespace) -> CacheRezultate:
+    """Deschide cache-ul persistent cerut in linia de comanda (sau None)."""
+    if not args.cache_rezultate:
+        return None
+    cache = CacheRezultate(args.cache_rezultate, ocolite=args.ocoleste_cache)
+    if args.invalideaza_cache:
+        cache.invalideaza(args.invalideaza_cache)
+    return cache
+
+
+def jurnal_din_args(args: argparse.Namespace) -> Jurnal:
+    """Deschide jurnalul cerut in linia de comanda (sau None); `--reluare` fara cale il foloseste pe cel implicit."""
+    if not (args.jurnal or args.reluare):
+        return None
+    return Jurnal(args.jurnal or CALE_JURNAL, reluare=args.reluare)
+
+
+def optiuni_batch_din_args(args: argparse.Namespace, cache_rezultate: CacheRezultate = None,
+                           jurnal: Jurnal = None) -> Dict[str, object]:
+    """Optiunile transmise lui _run_batch (prin process_file / process_tar_archive)."""
+    return dict(cache_rezultate=cache_rezultate, jurnal=jurnal, nivel_masurare=args.masurare, timeout=args.timeout,
+                preprocesare=args.preprocesare, componente=args.componente, cuburi=args.cuburi,
+                verificare=args.verifica, trecere_locala=args.trecere_locala,
+                memorie_maxima=int(args.memorie * 2 ** 20) if args.memorie else None)
+
+
+def ruleaza_comanda(args: argparse.Namespace, cache_rezultate: CacheRezultate = None,
+                    jurnal: Jurnal = None) -> int:
+    """
+    Modul neinteractiv (subcomenzile `fisier`, `arhiva`, `stdin`): ruleaza batch-ul fara nicio
+    intrebare si scrie cate o inregistrare pe pereche formula x solver in `--iesire`, imediat ce
+    rezultatul este gata (vezi `ScriitorInregistrari`). Raportul text obisnuit merge pe stderr
+    (nicaieri cu `--silentios`) si, cu `--raport`, intr-un fisier, deci iesirea standard
+    contine doar inregistrarile. Returneaza codul de iesire al procesului.
+    """
+    if args.comanda != 'stdin' and not os.path.isfile(args.intrare):
+        print(f"Eroare: '{args.intrare}' nu exista.", file=sys.stderr)
+        return 2
+    solvers = set(args.solver) if args.solver else {'DPLL'}
+    iesire = sys.stdout if args.iesire == '-' else open(args.iesire, 'w', encoding='utf-8', newline='')
+    text = open(os.devnull, 'w') if args.silentios else sys.stderr
+    raport = args.raport or os.devnull
+    optiuni_batch = optiuni_batch_din_args(args, cache_rezultate, jurnal)
+    optiuni_batch['inregistrari'] = ScriitorInregistrari(iesire, args.format)
+    try:
+        with contextlib.redirect_stdout(text):
+            if args.comanda == 'arhiva':
+                process_tar_archive(args.intrare, solvers, raport, optiuni_din_args(args),
+                                    args.lucratori, args.portofoliu, **optiuni_batch)
+            else:
+                sursa = sys.stdin.buffer if args.comanda == 'stdin' else args.intrare
+                process_file(sursa, raport, solvers, optiuni_din_args(args),
+                             args.lucratori, args.portofoliu, **optiuni_batch)
+    except BrokenPipeError:
+        # consumatorul (de ex. `head`) a inchis fluxul: ne oprim fara traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), iesire.fileno())
+        return 1
+    finally:
+        if iesire is not sys.stdout:
+            iesire.close()
+        if text is not sys.stderr:
+            text.close()
+    return 0
+
+
 if __name__ == '__main__':
-    interactive_menu()
+    args = parse_args()
+    cache_rezultate = cache_din_args(args)
+    jurnal = jurnal_din_args(args)
+    cod = 0
+    try:
+        if args.comanda:
+            cod = ruleaza_comanda(args, cache_rezultate, jurnal)
+        else:
+            interactive_menu(set(args.solver) if args.solver else None, optiuni_din_args(args), args.lucratori,
+                             args.portofoliu, **optiuni_batch_din_args(args, cache_rezultate, jurnal))
+    finally:
+        if cache_rezultate:
+            cache_rezultate.inchide()
+        if jurnal:
+            jurnal.inchide()
+    sys.exit(cod)
@@ -1,49 +1,193 @@
+import sys
 import time
 import tracemalloc
+from dataclasses import dataclass, field
 from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
+try:
+    import resource                            # doar pe sisteme Unix
+except ImportError:                            # pragma: no cover - Windows
+    resource = None
+
 # creeaza un logger dedicat pentru acest modul, folosind numele modulului curent
 logger = logging.getLogger(__name__)
 
+# Nivelurile de masurare, de la cel mai ieftin la cel mai scump:
+#    - oprit       : doar verdictul, fara nicio masuratoare
+#    - timp        : timp de perete si timp CPU
+#    - rss         : timp + cresterea RSS a procesului in timpul apelului, fara cost la alocari
+#    - tracemalloc : timp + varful memoriei alocate de Python (incetineste alocarile)
+NIVELURI_MASURARE = ('oprit', 'timp', 'rss', 'tracemalloc')
+NIVEL_IMPLICIT = 'tracemalloc'
+
+
+@dataclass
+class Masurare:
+    """
+    Rezultatul unui apel de solver, impreuna cu masuratorile cerute.
+    Campurile care nu sunt masurate la nivelul ales raman None.
+    """
+    sat: Optional[bool]                        # verdictul (None = necunoscut)
+    durata: Optional[float] = None             # timp de perete, in secunde
+    durata_cpu: Optional[float] = None         # timp CPU al procesului, in secunde
+    peak_kib: Optional[float] = None           # varful de memorie, in KiB
+    curr: Optional[int] = None                 # memoria alocata la final (bytes, doar la tracemalloc)
+    nivel: str = NIVEL_IMPLICIT                # nivelul de masurare folosit
+    statistici: Dict[str, Any] = field(default_factory=dict)  # contoarele interne ale solver-ului
+    model: Optional[List[int]] = None          # la SAT, literalii adevarati (daca solver-ul il da)
+
+
+def _rss_maxim_kib() -> Optional[float]:
+    """Varful RSS al procesului curent, in KiB (ru_maxrss e in KiB pe Linux, in bytes pe macOS)."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024 if sys.platform == 'darwin' else float(maxrss)
+
+
+def _status_kib(camp: str) -> Optional[float]:
+    """Un camp din /proc/self/status (de ex. VmRSS, VmHWM), in KiB; None in afara Linux."""
+    try:
+        with open('/proc/self/status') as f:
+            for linie in f:
+                if linie.startswith(camp + ':'):
+                    return float(linie.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _inceput_rss() -> Tuple[Optional[float], bool]:
+    """
+    Reperul pentru masurarea RSS a unui apel: pe Linux resetam varful RSS al procesului (VmHWM,
+    prin /proc/self/clear_refs) si pornim de la RSS-ul curent; altfel pornim de la ru_maxrss.
+    Returneaza (reper in KiB, daca varful a fost resetat).
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        rss = _status_kib('VmRSS')
+        if rss is not None:
+            return rss, True
+    except OSError:
+        pass
+    return _rss_maxim_kib(), False
+
+
+def _crestere_rss_kib(inceput: Tuple[Optional[float], bool]) -> Optional[float]:
+    """
+    Cat a crescut RSS-ul procesului in timpul apelului, in KiB. Cu varful resetat este exact
+    varful apelului minus RSS-ul de la inceput. Altfel ru_maxrss (varful pe toata viata
+    lucratorului) doar creste cand apelul depaseste varfurile joburilor anterioare, deci
+    valoarea e o margine inferioara (0 pentru un job mai mic decat unul dinainte).
+    """
+    reper, resetat = inceput
+    if reper is None:
+        return None
+    varf = _status_kib('VmHWM') if resetat else _rss_maxim_kib()
+    return None if varf is None else max(0.0, varf - reper)
+
+
 def timp_si_memorie(fn):
     """
-    Decorator care:
-    1. Porneste monitorizarea memoriei inainte de apelul functiei
-    2. Masoara timpul de executie
-    3. La final, opreste monitorizarea si returneaza
+    Decorator care ruleaza solver-ul si il masoara dupa `nivel_masurare`
+    (vezi NIVELURI_MASURARE; implicit 'tracemalloc', ca inainte):
+    1. Porneste monitorizarea memoriei inainte de apelul functiei (daca nivelul o cere)
+    2. Masoara timpul de executie (perete si CPU)
+    3. La final, opreste monitorizarea si returneaza o `Masurare` cu
        - rezultatul functiei (sat/unsat)
        - durata in secunde
        - varful de memorie folosit (in KiB)
        - memoria curenta alocata (in bytes)
+       - statisticile interne ale solver-ului (dictionar, gol daca solver-ul nu raporteaza nimic)
+    Optiunile suplimentare (de ex. dimensiunea cache-ului) sunt transmise mai departe solver-ului.
+    Un solver poate returna fie doar sat, fie perechea (sat, statistici), fie
+    (sat, statistici, model), unde modelul este lista literalilor adevarati (sau None).
+    La nivelul 'rss', valoarea raportata este cresterea RSS a procesului lucrator in timpul
+    apelului (vezi `_crestere_rss_kib`), nu varful lui pe toata viata: lucratorii din pool sunt
+    refolositi, iar joburile anterioare nu trebuie sa se vada in masuratoarea jobului curent.
     """
     @wraps(fn)
-    def wrapper(clause):
-        # Incepem sa urmarim alocarile de memorie
-        tracemalloc.start()
+    def wrapper(clause, nivel_masurare: str = NIVEL_IMPLICIT, **optiuni):
+        if nivel_masurare not in NIVELURI_MASURARE:
+            raise ValueError(f"Nivel de masurare necunoscut: '{nivel_masurare}'")
 
-        # Retinem momentul de start
-        t0 = time.perf_counter()
+        if nivel_masurare == 'oprit':
+            sat = fn(clause, **optiuni)
+            masurare = Masurare(sat, nivel=nivel_masurare)
+        else:
+            # Incepem sa urmarim alocarile de memorie, doar la nivelul complet
+            if nivel_masurare == 'tracemalloc':
+                tracemalloc.start()
+            elif nivel_masurare == 'rss':
+                reper_rss = _inceput_rss()
 
-        # Apelam functia originala (de ex. dpll, dp sau resolution)
-        sat = fn(clause)
+            # Retinem momentul de start (perete si CPU)
+            t0 = time.perf_counter()
+            c0 = time.process_time()
 
-        # Calculam cat a durat efectiv
-        dur = time.perf_counter() - t0
+            # Apelam functia originala (de ex. dpll, dp sau resolution); daca ea se opreste
+            # cu o exceptie (de ex. anulare sau MemoryError), monitorizarea nu ramane pornita
+            try:
+                sat = fn(clause, **optiuni)
+            except BaseException:
+                if nivel_masurare == 'tracemalloc':
+                    tracemalloc.stop()
+                raise
 
-        # Luam statistici de memorie:
-        #    curr = memoria curenta alocata acum,
-        #    peak = varful de memorie atins in timpul executiei
-        curr, peak = tracemalloc.get_traced_memory()
+            # Calculam cat a durat efectiv
+            masurare = Masurare(sat, time.perf_counter() - t0, time.process_time() - c0,
+                                nivel=nivel_masurare)
 
-        # Oprim monitorizarea memoriei
-        tracemalloc.stop()
+            if nivel_masurare == 'tracemalloc':
+                # Luam statistici de memorie:
+                #    curr = memoria curenta alocata acum,
+                #    peak = varful de memorie atins in timpul executiei
+                curr, peak = tracemalloc.get_traced_memory()
+                # Oprim monitorizarea memoriei
+                tracemalloc.stop()
+                masurare.peak_kib = peak / 1024
+                masurare.curr = curr
+            elif nivel_masurare == 'rss':
+                masurare.peak_kib = _crestere_rss_kib(reper_rss)
 
-        # Returnam toate informatiile utile:
-        #    - sat: boolean (True/False)
-        #    - dur: timp in secunde
-        #    - peak/1024: varf de memorie in KiB
-        #    - curr: memoria curenta in bytes
-        return sat, dur, peak / 1024, curr
+        # Separam statisticile interne (si modelul), daca solver-ul le-a raportat
+        if isinstance(masurare.sat, tuple):
+            if len(masurare.sat) == 3:
+                masurare.sat, masurare.statistici, masurare.model = masurare.sat
+            else:
+                masurare.sat, masurare.statistici = masurare.sat
+
+        return masurare
 
     return wrapper
+
+
+class Contoare:
+    """
+    Contoare interne si timpi pe faze pentru un singur apel de solver.
+    Solverii creeaza un obiect doar cand li se cere (`contoare=True`) si pastreaza altfel None,
+    deci cand sunt dezactivate costul ramane o singura verificare `if st:` pe punct de masura.
+    """
+    __slots__ = ('valori', 'timpi')
+
+    def __init__(self):
+        self.valori: Dict[str, int] = {}
+        self.timpi: Dict[str, float] = {}
+
+    def adauga(self, nume: str, n: int = 1) -> None:
+        """Creste contorul `nume` cu `n`."""
+        self.valori[nume] = self.valori.get(nume, 0) + n
+
+    def cronometreaza(self, faza: str, t0: float) -> None:
+        """Adauga la faza `faza` timpul scurs de la `t0` (obtinut cu time.perf_counter())."""
+        self.timpi[faza] = self.timpi.get(faza, 0.0) + time.perf_counter() - t0
+
+    def ca_dict(self) -> Dict[str, Any]:
+        """Contoarele, plus timpii pe faze (secunde) cu prefixul 't_', pentru `Masurare.statistici`."""
+        d: Dict[str, Any] = dict(self.valori)
+        d.update((f"t_{faza}", round(t, 6)) for faza, t in self.timpi.items())
+        return d
+
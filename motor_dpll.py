@@ -0,0 +1,229 @@
+from typing import Set, FrozenSet, List, Dict, Iterable
+from masurare_performanta import timp_si_memorie  # decorator care masoara timpul si memoria
+
+# valorile posibile ale unui literal
+NEATRIBUIT = 0
+ADEVARAT = 1
+FALS = -1
+
+
+class MotorDPLL:
+    """
+    Motor DPLL care lucreaza pe o singura baza de clauze mutabila:
+    - variabilele sunt renumerotate intern 0..n-1, iar literalul v / -v devine 2*v / 2*v+1
+      (negarea unui literal intern este `p ^ 1`)
+    - atribuirile se pun pe un trail, impartit pe niveluri de decizie
+    - propagarea unitatilor foloseste doi literali urmariti (two watched literals) pe clauza
+    - backtracking-ul scoate atribuirile de pe trail, fara sa copieze formula
+    Eliminarea literalilor puri nu se face aici: pe un trail ar costa mai mult decat castiga.
+    """
+
+    def __init__(self, clauze: Iterable[Iterable[int]] = ()):
+        self.var_id: Dict[int, int] = {}      # variabila originala -> index intern
+        self.variabile: List[int] = []        # index intern -> variabila originala
+        self.aparitii: List[int] = []         # numar de aparitii pe literal intern (pt. ordinea deciziilor)
+        self.clauze: List[List[int]] = []     # baza de clauze (literali interni)
+        self.urmariti: List[List[int]] = []   # literal -> indicii clauzelor care il urmaresc
+        self.valoare: List[int] = []          # literal -> ADEVARAT / FALS / NEATRIBUIT
+        self.nivel: List[int] = []            # variabila -> nivelul de decizie la care a fost atribuita
+        self.motiv: List[int] = []            # variabila -> clauza care a fortat-o (-1 pentru decizii)
+        self.trail: List[int] = []            # literalii adevarati, in ordinea atribuirii
+        self.limite: List[int] = []           # pozitia din trail unde incepe fiecare nivel de decizie
+        self.inversat: List[bool] = []        # pentru fiecare nivel: decizia a fost deja inversata?
+        self.cap_coada = 0                    # urmatorul literal din trail de propagat
+        self.inconsistent = False             # am gasit deja clauza vida la nivelul 0
+        self._ordine: List[int] = []          # variabilele in ordinea in care le incercam
+
+        for cl in clauze:
+            self.adauga_clauza(cl)
+
+    # ---------------------------------------------------------------- clauze
+
+    def _cod(self, lit: int) -> int:
+        """Traduce un literal DIMACS in literal intern, creand variabila daca e noua."""
+        v = self.var_id.get(abs(lit))
+        if v is None:
+            v = len(self.variabile)
+            self.var_id[abs(lit)] = v
+            self.variabile.append(abs(lit))
+            self.aparitii += [0, 0]
+            self.urmariti += [[], []]
+            self.valoare += [NEATRIBUIT, NEATRIBUIT]
+            self.nivel.append(0)
+            self.motiv.append(-1)
+            self._ordine = []
+        return 2 * v + (lit < 0)
+
+    def adauga_clauza(self, clauza: Iterable[int]) -> None:
+        """
+        Adauga o clauza (literali DIMACS) in baza. Se apeleaza doar la nivelul 0:
+        - tautologiile si clauzele deja satisfacute sunt ignorate
+        - literalii falsi la nivelul 0 sunt scosi
+        - clauza vida marcheaza formula ca inconsistenta, iar unitatea se atribuie direct
+        """
+        lits = []
+        for lit in set(self._cod(l) for l in clauza):
+            val = self.valoare[lit]
+            if val == ADEVARAT or lit ^ 1 in lits:
+                return
+            if val == NEATRIBUIT:
+                lits.append(lit)
+        for lit in lits:
+            self.aparitii[lit] += 1
+
+        if not lits:
+            self.inconsistent = True
+        elif len(lits) == 1:
+            self._atribuie(lits[0], -1)
+        else:
+            self._adauga_urmarita(lits)
+
+    def _adauga_urmarita(self, lits: List[int]) -> int:
+        """Pune clauza in baza si urmareste primii doi literali. Returneaza indicele clauzei."""
+        ci = len(self.clauze)
+        self.clauze.append(lits)
+        self.urmariti[lits[0]].append(ci)
+        self.urmariti[lits[1]].append(ci)
+        return ci
+
+    # ----------------------------------------------------------------- trail
+
+    def _atribuie(self, p: int, motiv: int) -> None:
+        """Face literalul intern `p` adevarat la nivelul curent si il pune pe trail."""
+        self.valoare[p] = ADEVARAT
+        self.valoare[p ^ 1] = FALS
+        self.nivel[p >> 1] = len(self.limite)
+        self.motiv[p >> 1] = motiv
+        self.trail.append(p)
+
+    def _decide(self, p: int, inversat: bool = False) -> None:
+        """Deschide un nivel nou de decizie cu literalul `p`."""
+        self.limite.append(len(self.trail))
+        self.inversat.append(inversat)
+        self._atribuie(p, -1)
+
+    def _revino(self, nivel: int) -> None:
+        """Anuleaza toate atribuirile facute peste `nivel`, scotandu-le de pe trail."""
+        if len(self.limite) <= nivel:
+            return
+        poz = self.limite[nivel]
+        valoare = self.valoare
+        for p in self.trail[poz:]:
+            valoare[p] = NEATRIBUIT
+            valoare[p ^ 1] = NEATRIBUIT
+        del self.trail[poz:]
+        del self.limite[nivel:]
+        del self.inversat[nivel:]
+        self.cap_coada = poz
+
+    def _propaga(self) -> int:
+        """
+        Propaga literalii de pe trail care nu au fost inca procesati.
+        Returneaza indicele unei clauze in conflict sau -1 daca nu a aparut conflict.
+        """
+        valoare = self.valoare
+        clauze = self.clauze
+        urmariti = self.urmariti
+        trail = self.trail
+
+        while self.cap_coada < len(trail):
+            p = trail[self.cap_coada]
+            self.cap_coada += 1
+            fals = p ^ 1                  # literalul care tocmai a devenit fals
+            lista = urmariti[fals]
+            i = j = 0
+            n = len(lista)
+            while i < n:
+                ci = lista[i]
+                i += 1
+                c = clauze[ci]
+                # pastram literalul fals pe pozitia 1
+                if c[0] == fals:
+                    c[0], c[1] = c[1], fals
+                # daca celalalt literal urmarit e adevarat, clauza e satisfacuta
+                if valoare[c[0]] == ADEVARAT:
+                    lista[j] = ci
+                    j += 1
+                    continue
+                # cautam un inlocuitor care nu e fals
+                for k in range(2, len(c)):
+                    if valoare[c[k]] != FALS:
+                        c[1], c[k] = c[k], fals
+                        urmariti[c[1]].append(ci)
+                        break
+                else:
+                    # nu exista inlocuitor: clauza e unitara sau in conflict
+                    lista[j] = ci
+                    j += 1
+                    if valoare[c[0]] == FALS:
+                        lista[j:] = lista[i:]
+                        return ci
+                    self._atribuie(c[0], ci)
+            del lista[j:]
+        return -1
+
+    def model(self) -> List[int]:
+        """Atribuirea curenta, ca lista de literali DIMACS adevarati (dupa un `rezolva` reusit)."""
+        valoare = self.valoare
+        return [v if valoare[2 * i] == ADEVARAT else -v
+                for i, v in enumerate(self.variabile) if valoare[2 * i] != NEATRIBUIT]
+
+    # ---------------------------------------------------------------- cautare
+
+    def _alege_literal(self) -> int:
+        """
+        Alege urmatorul literal de decizie: variabila neatribuita cu cele mai multe aparitii,
+        cu polaritatea care apare mai des. Returneaza -1 daca toate variabilele sunt atribuite.
+        """
+        if not self._ordine:
+            ap = self.aparitii
+            self._ordine = sorted(range(len(self.variabile)),
+                                  key=lambda v: ap[2 * v] + ap[2 * v + 1], reverse=True)
+        valoare = self.valoare
+        for v in self._ordine:
+            if valoare[2 * v] == NEATRIBUIT:
+                return 2 * v if self.aparitii[2 * v] >= self.aparitii[2 * v + 1] else 2 * v + 1
+        return -1
+
+    def rezolva(self) -> bool:
+        """
+        Cautarea DPLL cu backtracking cronologic pe trail:
+        - decidem un literal si propagam
+        - la conflict revenim la ultima decizie neinversata si incercam literalul opus
+        True daca toate variabilele au fost atribuite fara conflict, False daca nu mai avem ce inversa.
+        """
+        if self.inconsistent:
+            return False
+        self._revino(0)
+        if self._propaga() >= 0:
+            return False
+
+        while True:
+            p = self._alege_literal()
+            if p < 0:
+                return True
+            self._decide(p)
+            while self._propaga() >= 0:
+                # scoatem nivelurile a caror decizie a fost deja incercata in ambele sensuri
+                niv = len(self.limite)
+                while niv and self.inversat[niv - 1]:
+                    niv -= 1
+                if not niv:
+                    return False
+                decizie = self.trail[self.limite[niv - 1]]
+                self._revino(niv - 1)
+                self._decide(decizie ^ 1, True)
+
+
+@timp_si_memorie
+def dpll_trail(clauze: Set[FrozenSet[int]], model: bool = False):
+    """
+    DPLL pe trail cu literali urmariti: aceleasi raspunsuri ca `dpll`,
+    dar fara sa reconstruiasca formula la fiecare pas.
+    Cu `model=True` returneaza si atribuirea gasita, la SAT (vezi `MotorDPLL.model`).
+    """
+    motor = MotorDPLL(clauze)
+    sat = motor.rezolva()
+    if not model:
+        return sat
+    return sat, {}, motor.model() if sat else None
@@ -0,0 +1,320 @@
+import os
+import signal
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Dict, Any, Deque
+
+from anulare import JETON, Anulat, SEMNAL_ANULARE
+
+try:
+    import resource                            # doar pe sisteme Unix
+except ImportError:                            # pragma: no cover - Windows
+    resource = None
+
+# starile posibile ale unui job terminat
+OK = 'ok'
+TIMEOUT = 'timeout'
+MEMOUT = 'memout'
+EROARE = 'eroare'
+ANULAT = 'anulat'
+
+# dupa termen, un lucrator mai are atatea secunde sa raporteze singur TIMEOUT (anulare
+# cooperativa, vezi `anulare.JETON`) inainte sa fie oprit fortat si inlocuit
+GRATIE_ANULARE = 1.0
+
+# un job: (functie, argumente pozitionale, argumente cu nume, timeout in secunde sau None)
+Job = Tuple[Callable, tuple, Dict[str, Any], Optional[float]]
+
+
+def _spatiu_adrese() -> int:
+    """Spatiul de adrese curent al procesului, in bytes (0 daca nu se poate citi, in afara Linux)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _limiteaza_memoria(octeti: Optional[int]) -> None:
+    """
+    Limita moale RLIMIT_AS a lucratorului: spatiul de adrese curent plus `octeti`, deci
+    jobul poate aloca cel mult atat peste interpretorul deja incarcat (None = fara limita).
+    Limita tare ramane neschimbata, ca limita moale sa poata fi ridicata dupa job.
+    """
+    _, tare = resource.getrlimit(resource.RLIMIT_AS)
+    moale = resource.RLIM_INFINITY if octeti is None else _spatiu_adrese() + octeti
+    if tare != resource.RLIM_INFINITY:
+        moale = tare if moale == resource.RLIM_INFINITY else min(moale, tare)
+    resource.setrlimit(resource.RLIMIT_AS, (moale, tare))
+
+
+def _bucla_lucrator(conn, anulat, memorie_maxima: Optional[int] = None) -> None:
+    """
+    Bucla unui proces lucrator: primeste joburi pe conexiune si trimite inapoi rezultatele.
+    Fiecare job ruleaza cu termenul lui in `JETON` (solverii care il verifica se opresc singuri,
+    iar jobul devine TIMEOUT, lucratorul preluand jobul urmator) si, cu `memorie_maxima`, cu limita
+    de memorie a jobului: o alocare peste limita ridica MemoryError (sau, din unele cai interne ale
+    interpretorului, SystemError), iar jobul devine MEMOUT. Dupa un MEMOUT lucratorul se opreste,
+    pentru ca starea interpretorului dupa o alocare esuata nu mai e de incredere.
+    `anulat` (valoare partajata) este id-ul ultimului job anulat de procesul principal, care
+    trimite apoi SEMNAL_ANULARE: jobul curent se opreste ca la termen doar daca e chiar acela,
+    iar un job anulat inainte sa fi inceput se opreste la prima verificare.
+    """
+    limitat = memorie_maxima is not None and resource is not None
+    job_id = None
+
+    def la_anulare(*_):
+        if anulat.value == job_id:
+            JETON.anuleaza()
+
+    if SEMNAL_ANULARE is not None:
+        signal.signal(SEMNAL_ANULARE, la_anulare)
+    while True:
+        try:
+            mesaj = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if mesaj is None:
+            break
+        job_id, fn, args, kwargs, timeout = mesaj
+        JETON.porneste(timeout)
+        la_anulare()
+        if limitat:
+            _limiteaza_memoria(memorie_maxima)
+        try:
+            raspuns = (OK, fn(*args, **kwargs))
+        except Anulat:
+            raspuns = (TIMEOUT, None)
+        except MemoryError:
+            raspuns = _memout(memorie_maxima)
+        except SystemError as e:
+            # sub RLIMIT_AS, o alocare esuata iese uneori ca "error return without exception set"
+            raspuns = _memout(memorie_maxima) if limitat else (EROARE, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            raspuns = (EROARE, f"{type(e).__name__}: {e}")
+        finally:
+            JETON.opreste()
+            if limitat:
+                _limiteaza_memoria(None)
+        conn.send(raspuns)
+        if raspuns[0] == MEMOUT:
+            break   # procesul principal inlocuieste lucratorul
+
+
+def _memout(memorie_maxima: Optional[int]) -> Tuple[str, str]:
+    """Raspunsul unui job care a ramas fara memorie."""
+    return (MEMOUT, f"limita de memorie depasita ({memorie_maxima / 2 ** 20:.0f} MiB)"
+            if memorie_maxima else "memorie insuficienta")
+
+
+class _Lucrator:
+    """Un proces lucrator impreuna cu capatul nostru de conexiune si jobul pe care il ruleaza."""
+
+    def __init__(self, ctx, memorie_maxima: Optional[int] = None):
+        self.conn, capat_copil = ctx.Pipe()
+        self.anulat = ctx.RawValue('q', -1)   # id-ul jobului anulat, citit de lucrator
+        self.proces = ctx.Process(target=_bucla_lucrator, args=(capat_copil, self.anulat, memorie_maxima),
+                                  daemon=True)
+        self.proces.start()
+        capat_copil.close()
+        self.job: Optional[int] = None        # id-ul jobului curent (None = liber)
+        self.termen: Optional[float] = None   # momentul (perf_counter) la care lucratorul e oprit fortat
+
+    def elibereaza(self) -> None:
+        self.job = None
+        self.termen = None
+
+    @property
+    def ignorat(self) -> bool:
+        """Jobul curent a fost anulat, deci raspunsul lui se ignora."""
+        return self.job is not None and self.anulat.value == self.job
+
+    def opreste(self, fortat: bool = False) -> None:
+        if fortat:
+            self.proces.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.proces.join(1)
+        if self.proces.is_alive():
+            self.proces.kill()
+            self.proces.join()
+        self.conn.close()
+
+
+class PoolLucratori:
+    """
+    Pool persistent de N procese lucratoare, refolosit pentru toate joburile unui batch:
+    - joburile se trimit cu `trimite` si ruleaza in paralel pe lucratorii liberi
+    - fiecare job are propriul timeout; solverii care verifica `anulare.JETON` se opresc
+      singuri la termen si lucratorul raporteaza TIMEOUT; un lucrator care nu raspunde nici
+      dupa GRATIE_ANULARE secunde este oprit si inlocuit, fara sa afecteze restul pool-ului
+    - cu `memorie_maxima` (bytes), fiecare job are si o limita de memorie (RLIMIT_AS, doar
+      pe Unix); un job care o depaseste se termina cu MEMOUT, iar lucratorul lui este inlocuit
+    - `executa_ordonat` consuma un iterator de joburi si da rezultatele in ordinea initiala
+    """
+
+    def __init__(self, nr_lucratori: Optional[int] = None, memorie_maxima: Optional[int] = None):
+        self.nr_lucratori = max(1, nr_lucratori or os.cpu_count() or 1)
+        self.memorie_maxima = memorie_maxima
+        self._ctx = multiprocessing.get_context()
+        self._lucratori = [_Lucrator(self._ctx, memorie_maxima) for _ in range(self.nr_lucratori)]
+        self._asteptare: Deque[Tuple[int, Job]] = deque()
+        self._gata: Deque[Tuple[int, str, Any]] = deque()
+        self._urmatorul_id = 0
+
+    def __enter__(self) -> "PoolLucratori":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.inchide()
+
+    def inchide(self) -> None:
+        """Opreste toti lucratorii; cei ocupati sunt opriti fortat."""
+        for l in self._lucratori:
+            l.opreste(fortat=l.job is not None)
+        self._lucratori = []
+
+    # ------------------------------------------------------------- joburi
+
+    def trimite(self, fn: Callable, args: tuple = (), kwargs: Dict[str, Any] = None,
+                timeout: Optional[float] = None) -> int:
+        """Pune un job in coada si returneaza id-ul lui."""
+        job_id = self._urmatorul_id
+        self._urmatorul_id += 1
+        self._asteptare.append((job_id, (fn, args, kwargs or {}, timeout)))
+        self._distribuie()
+        return job_id
+
+    def anuleaza(self, job_id: int) -> None:
+        """
+        Anuleaza un job: daca inca asteapta, e scos din coada; daca ruleaza, lucratorul lui
+        primeste SEMNAL_ANULARE, care expira `anulare.JETON`: solverii care il verifica se opresc
+        singuri, iar lucratorul ramane in pool (raspunsul lui se ignora). Un lucrator care nu se
+        opreste in GRATIE_ANULARE secunde (sau fara semnale, pe Windows) este oprit si inlocuit.
+        Jobul apare imediat ca ANULAT in rezultate.
+        """
+        for i, (jid, _) in enumerate(self._asteptare):
+            if jid == job_id:
+                del self._asteptare[i]
+                self._gata.append((job_id, ANULAT, None))
+                return
+        for i, l in enumerate(self._lucratori):
+            if l.job == job_id and not l.ignorat:
+                self._gata.append((job_id, ANULAT, None))
+                if SEMNAL_ANULARE is not None and l.proces.is_alive():
+                    l.anulat.value = job_id
+                    os.kill(l.proces.pid, SEMNAL_ANULARE)
+                    termen = time.perf_counter() + GRATIE_ANULARE
+                    l.termen = termen if l.termen is None else min(l.termen, termen)
+                else:
+                    self._inlocuieste(i)
+                    self._distribuie()
+                return
+
+    def in_lucru(self) -> int:
+        """Numarul de joburi trimise si inca neraportate (in coada sau in executie)."""
+        return len(self._asteptare) + sum(l.job is not None and not l.ignorat for l in self._lucratori)
+
+    def _inlocuieste(self, i: int) -> None:
+        self._lucratori[i].opreste(fortat=True)
+        self._lucratori[i] = _Lucrator(self._ctx, self.memorie_maxima)
+
+    def _distribuie(self) -> None:
+        """Trimite joburile din coada catre lucratorii liberi."""
+        for l in self._lucratori:
+            if not self._asteptare:
+                return
+            if l.job is None:
+                job_id, (fn, args, kwargs, timeout) = self._asteptare.popleft()
+                l.conn.send((job_id, fn, args, kwargs, timeout))
+                l.job = job_id
+                l.termen = time.perf_counter() + timeout + GRATIE_ANULARE if timeout is not None else None
+
+    def urmatorul_rezultat(self) -> Optional[Tuple[int, str, Any]]:
+        """
+        Asteapta pana se termina un job si returneaza (id, stare, valoare),
+        unde stare este OK, TIMEOUT, MEMOUT, EROARE sau ANULAT.
+        Returneaza None daca nu mai exista joburi trimise.
+        """
+        while True:
+            if self._gata:
+                return self._gata.popleft()
+            self._distribuie()
+            ocupati = [l for l in self._lucratori if l.job is not None]
+            if not ocupati:
+                return None
+
+            termene = [l.termen for l in ocupati if l.termen is not None]
+            asteptare = max(0.0, min(termene) - time.perf_counter()) if termene else None
+            pregatite = wait([l.conn for l in ocupati], asteptare)
+
+            for l in ocupati:
+                if l.conn in pregatite:
+                    try:
+                        stare, valoare = l.conn.recv()
+                    except (EOFError, OSError):
+                        # lucratorul a murit in timpul jobului: il inlocuim
+                        job_id, ignorat = l.job, l.ignorat
+                        self._inlocuieste(self._lucratori.index(l))
+                        if not ignorat:
+                            self._gata.append((job_id, EROARE, "lucratorul s-a oprit neasteptat"))
+                        continue
+                    # un job anulat a fost deja raportat ca ANULAT
+                    if not l.ignorat:
+                        self._gata.append((l.job, stare, valoare))
+                    if stare == MEMOUT:
+                        # lucratorul se opreste singur dupa MEMOUT
+                        self._lucratori[self._lucratori.index(l)] = _Lucrator(self._ctx, self.memorie_maxima)
+                        l.opreste()
+                    else:
+                        l.elibereaza()
+
+            acum = time.perf_counter()
+            for i, l in enumerate(self._lucratori):
+                if l.job is not None and l.termen is not None and l.termen <= acum \
+                        and not l.conn.poll():
+                    job_id, ignorat = l.job, l.ignorat
+                    self._inlocuieste(i)
+                    if not ignorat:
+                        self._gata.append((job_id, TIMEOUT, None))
+
+    def executa_ordonat(self, joburi: Iterable[Job],
+                        fereastra: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Ruleaza joburile concurent si produce (stare, valoare) in ordinea in care au fost date.
+        Joburile se citesc lenes din iterator: cel mult `fereastra` (implicit 2*N) sunt
+        trimise si neraportate in acelasi timp.
+        Un job cu functia None are rezultatul deja cunoscut (de ex. din cache): argumentele
+        lui sunt chiar (stare, valoare), care se produc la randul lor, fara niciun lucrator.
+        """
+        fereastra = fereastra or 2 * self.nr_lucratori
+        sursa = iter(joburi)
+        ids: Deque[int] = deque()
+        rezultate: Dict[int, Tuple[str, Any]] = {}
+        epuizat = False
+
+        while True:
+            while not epuizat and len(ids) < fereastra:
+                try:
+                    fn, args, kwargs, timeout = next(sursa)
+                except StopIteration:
+                    epuizat = True
+                    break
+                if fn is None:
+                    job_id = self._urmatorul_id
+                    self._urmatorul_id += 1
+                    rezultate[job_id] = args
+                else:
+                    job_id = self.trimite(fn, args, kwargs, timeout)
+                ids.append(job_id)
+            if not ids:
+                return
+            while ids[0] not in rezultate:
+                job_id, stare, valoare = self.urmatorul_rezultat()
+                rezultate[job_id] = (stare, valoare)
+            yield rezultate.pop(ids.popleft())
@@ -0,0 +1,85 @@
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any, Set, FrozenSet, Deque, Union, NamedTuple
+
+from pool_lucratori import PoolLucratori, OK
+from fnc import FormulaCompacta, apeleaza_cu_clauze
+
+# un solver din portofoliu: (nume, functie, optiuni)
+SolverPortofoliu = Tuple[str, Callable, Dict[str, Any]]
+
+
+class Castig(NamedTuple):
+    """Rezultatul portofoliului pentru o formula."""
+    castigator: Optional[str]   # solver-ul care a raspuns primul (None daca niciunul nu a reusit)
+    stare: str                  # starea jobului castigator (sau a ultimului job)
+    valoare: Any                # rezultatul jobului, ca in PoolLucratori
+    durata_perete: float        # timpul de la trimiterea formulei pana la raspuns
+
+
+def ruleaza_portofoliu(
+    pool: PoolLucratori,
+    formule: Iterable[Union[FormulaCompacta, Set[FrozenSet[int]], Castig]],
+    solvers: List[SolverPortofoliu],
+    timeout: Optional[float] = None,
+    fereastra: Optional[int] = None
+) -> Iterator[Castig]:
+    """
+    Modul portofoliu: pentru fiecare formula porneste toti solverii in paralel in `pool`
+    si pastreaza primul raspuns definitiv (sat True/False); ceilalti solveri ai formulei
+    sunt anulati imediat (vezi `PoolLucratori.anuleaza`: se opresc singuri si lucratorii lor
+    raman in pool; doar cei care nu se opresc in GRATIE_ANULARE secunde sunt inlocuiti).
+    Produce cate un `Castig` pe formula, in ordinea formulelor.
+    Un element de intrare care e deja `Castig` (de ex. un rezultat din cache) trece direct.
+    Cel mult `fereastra` formule (implicit cat incap in pool, minim una) sunt in lucru simultan.
+    """
+    fereastra = fereastra or max(1, pool.nr_lucratori // max(1, len(solvers)))
+    sursa = iter(formule)
+    ordine: Deque[int] = deque()                         # formulele in lucru, in ordine
+    start: Dict[int, float] = {}                         # formula -> momentul trimiterii
+    ramase: Dict[int, Set[int]] = {}                     # formula -> joburi inca neraportate
+    job_formula: Dict[int, Tuple[int, str]] = {}         # job -> (formula, nume solver)
+    rezultat: Dict[int, Castig] = {}
+    urmatoarea = 0
+    epuizat = False
+
+    while True:
+        # completam fereastra cu formule noi
+        while not epuizat and len(ordine) < fereastra:
+            try:
+                clauze = next(sursa)
+            except StopIteration:
+                epuizat = True
+                break
+            idx = urmatoarea
+            urmatoarea += 1
+            ordine.append(idx)
+            start[idx] = time.perf_counter()
+            ramase[idx] = set()
+            if isinstance(clauze, Castig):
+                rezultat[idx] = clauze
+                continue
+            for nume, fn, optiuni in solvers:
+                job_id = pool.trimite(apeleaza_cu_clauze, (fn, clauze), optiuni, timeout)
+                job_formula[job_id] = (idx, nume)
+                ramase[idx].add(job_id)
+        if not ordine:
+            return
+
+        while ordine[0] not in rezultat:
+            job_id, stare, valoare = pool.urmatorul_rezultat()
+            idx, nume = job_formula.pop(job_id, (None, None))
+            if idx is None or idx in rezultat or idx not in ramase:
+                continue    # job strain sau formula are deja un castigator (de ex. joburi anulate)
+            ramase[idx].discard(job_id)
+            perete = time.perf_counter() - start[idx]
+            if stare == OK and valoare.sat is not None:
+                rezultat[idx] = Castig(nume, stare, valoare, perete)
+                for alt_job in ramase[idx]:
+                    pool.anuleaza(alt_job)
+            elif not ramase[idx]:
+                rezultat[idx] = Castig(None, stare, valoare, perete)
+
+        idx = ordine.popleft()
+        del start[idx], ramase[idx]
+        yield rezultat.pop(idx)
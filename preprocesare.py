@@ -0,0 +1,198 @@
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set
+
+from fnc import FormulaCompacta
+
+try:
+    import numpy as np                         # varianta vectorizata (optionala)
+except ImportError:                            # pragma: no cover - fara NumPy
+    np = None
+
+# sub acest numar de literali, costul fix al apelurilor NumPy depaseste castigul
+PRAG_VECTORIZAT = 256
+
+
+class Preprocesare(NamedTuple):
+    """Rezultatul preprocesarii unei formule."""
+    sat: Optional[bool]                  # True/False daca formula a fost decisa, altfel None
+    formula: Optional[FormulaCompacta]   # formula redusa si renumerotata (None daca e decisa)
+    atribuiri: Dict[int, bool]           # variabile originale fixate (unitati si literali puri)
+    variabile: List[int]                 # variabile[i - 1] = variabila originala a variabilei noi i
+    statistici: Dict[str, int]           # tautologii, duplicate, unitati, puri, variabile/clauze ramase
+
+
+def preproceseaza(formula: Iterable[Iterable[int]], vectorizat: Optional[bool] = None) -> Preprocesare:
+    """
+    Preprocesarea comuna tuturor solverilor, inainte de a trimite formula la un lucrator:
+    1. scoate tautologiile, literalii repetati si clauzele duplicate
+    2. propaga unitatile si elimina literalii puri, iterat pana la punct fix
+    3. renumeroteaza variabilele ramase la 1..k
+    Formula redusa este echivalenta ca satisfiabilitate cu cea initiala; daca devine
+    vida (SAT) sau contine clauza vida (UNSAT), `sat` este decis si niciun solver nu mai e necesar.
+    Cu `vectorizat` (implicit: daca NumPy e instalat si formula are cel putin PRAG_VECTORIZAT
+    literali) pasii se fac pe o matrice clauze x literali; altfel, sau pentru formule cu
+    clauze foarte inegale, pe multimi Python.
+    """
+    if not isinstance(formula, FormulaCompacta):
+        formula = _compacta(formula)
+    if vectorizat is None:
+        vectorizat = np is not None and len(formula.literali) >= PRAG_VECTORIZAT
+    if vectorizat:
+        if np is None:
+            raise ImportError("Preprocesarea vectorizata necesita NumPy.")
+        nr_clauze = len(formula)
+        latime = max((b - a - 1 for a, b in zip(formula.inceputuri, formula.inceputuri[1:])), default=0)
+        # matricea ar fi mult mai mare decat formula (o clauza foarte lunga): varianta Python
+        if nr_clauze * latime <= 8 * len(formula.literali) + 1024:
+            return _preproceseaza_numpy(formula)
+    return _preproceseaza_python(formula)
+
+
+def _compacta(clauze: Iterable[Iterable[int]]) -> FormulaCompacta:
+    literali = array('i')
+    for c in clauze:
+        literali.extend(c)
+        literali.append(0)
+    return FormulaCompacta(literali)
+
+
+def _decisa(sat: bool, atribuiri: Dict[int, bool], statistici: Dict[str, int]) -> Preprocesare:
+    statistici['variabile_ramase'] = 0
+    statistici['clauze_ramase'] = 0
+    return Preprocesare(sat, None, atribuiri, [], statistici)
+
+
+def _preproceseaza_python(formula: FormulaCompacta) -> Preprocesare:
+    statistici = {'tautologii': 0, 'duplicate': 0, 'unitati': 0, 'puri': 0}
+    atribuiri: Dict[int, bool] = {}
+
+    clauze: Set[FrozenSet[int]] = set()
+    for c in formula:
+        c = frozenset(c)
+        if any(-l in c for l in c):
+            statistici['tautologii'] += 1
+            continue
+        clauze.add(c)
+    statistici['duplicate'] = len(formula) - statistici['tautologii'] - len(clauze)
+
+    while True:
+        if frozenset() in clauze:
+            return _decisa(False, atribuiri, statistici)
+        unitati = {next(iter(c)) for c in clauze if len(c) == 1}
+        if any(-u in unitati for u in unitati):
+            return _decisa(False, atribuiri, statistici)
+        literali = {l for c in clauze for l in c}
+        puri = {l for l in literali if -l not in literali} - unitati
+        if not unitati and not puri:
+            break
+        statistici['unitati'] += len(unitati)
+        statistici['puri'] += len(puri)
+        adevarati = unitati | puri
+        for l in adevarati:
+            atribuiri[abs(l)] = l > 0
+        falsi = {-l for l in adevarati}
+        clauze = {c - falsi for c in clauze if not c & adevarati}
+
+    if not clauze:
+        return _decisa(True, atribuiri, statistici)
+
+    variabile = sorted({abs(l) for c in clauze for l in c})
+    nou = {v: i for i, v in enumerate(variabile, start=1)}
+    literali = array('i')
+    for c in clauze:
+        literali.extend(nou[l] if l > 0 else -nou[-l] for l in sorted(c, key=abs))
+        literali.append(0)
+    statistici['variabile_ramase'] = len(variabile)
+    statistici['clauze_ramase'] = len(clauze)
+    return Preprocesare(None, FormulaCompacta(literali), atribuiri, variabile, statistici)
+
+
+def _preproceseaza_numpy(formula: FormulaCompacta) -> Preprocesare:
+    statistici = {'tautologii': 0, 'duplicate': 0, 'unitati': 0, 'puri': 0}
+    atribuiri: Dict[int, bool] = {}
+
+    # matricea clauze x literali, completata cu 0 (un rand pe clauza)
+    lit = np.frombuffer(formula.literali, dtype=np.int32).astype(np.int64)
+    inceputuri = np.frombuffer(formula.inceputuri, dtype=np.int32).astype(np.int64)
+    lungimi = np.diff(inceputuri) - 1
+    if not len(lungimi):
+        return _decisa(True, atribuiri, statistici)
+    if (lungimi == 0).any():
+        return _decisa(False, atribuiri, statistici)
+    nenule = lit[lit != 0]
+    rand = np.repeat(np.arange(len(lungimi)), lungimi)
+    coloana = np.arange(len(nenule)) - np.repeat(np.cumsum(lungimi) - lungimi, lungimi)
+    m = np.zeros((len(lungimi), int(lungimi.max())), dtype=np.int64)
+    m[rand, coloana] = nenule
+
+    # sortam fiecare rand dupa variabila (golurile la final) si scoatem literalii repetati
+    m = _sorteaza_randuri(m)
+    repetat = (m[:, 1:] == m[:, :-1]) & (m[:, 1:] != 0)
+    if repetat.any():
+        m[:, 1:][repetat] = 0
+        m = _sorteaza_randuri(m)
+
+    # tautologie: doi literali vecini pe aceeasi variabila, cu semne diferite
+    tautologie = ((np.abs(m[:, 1:]) == np.abs(m[:, :-1])) & (m[:, 1:] != m[:, :-1])
+                  & (m[:, 1:] != 0)).any(axis=1)
+    statistici['tautologii'] = int(tautologie.sum())
+    m = m[~tautologie]
+    ramase = len(m)
+    if ramase:
+        m = np.unique(m, axis=0)
+    statistici['duplicate'] = ramase - len(m)
+
+    nr_var = int(np.abs(m).max()) if m.size else 0
+    valoare = np.zeros(nr_var + 1, dtype=np.int64)   # +1 adevarat, -1 fals, 0 neatribuit
+    while len(m):
+        # scoatem clauzele satisfacute si literalii falsi
+        v = valoare[np.abs(m)] * np.sign(m)
+        m = np.where(v == -1, 0, m)[~(v == 1).any(axis=1)]
+        lungimi = (m != 0).sum(axis=1)
+        if (lungimi == 0).any():
+            return _decisa(False, _atribuiri(valoare), statistici)
+
+        unitati = np.unique(m[lungimi == 1].sum(axis=1))
+        if np.intersect1d(unitati[unitati > 0], -unitati[unitati < 0]).size:
+            return _decisa(False, _atribuiri(valoare), statistici)
+        pozitive = np.bincount(m[m > 0], minlength=nr_var + 1)
+        negative = np.bincount(-m[m < 0], minlength=nr_var + 1)
+        puri = np.concatenate((np.flatnonzero((pozitive > 0) & (negative == 0)),
+                               -np.flatnonzero((negative > 0) & (pozitive == 0))))
+        puri = np.setdiff1d(puri, unitati)
+        if not len(unitati) and not len(puri):
+            break
+        statistici['unitati'] += len(unitati)
+        statistici['puri'] += len(puri)
+        noi = np.concatenate((unitati, puri))
+        valoare[np.abs(noi)] = np.sign(noi)
+    atribuiri = _atribuiri(valoare)
+
+    if not len(m):
+        return _decisa(True, atribuiri, statistici)
+
+    # renumerotam variabilele ramase la 1..k
+    variabile = np.unique(np.abs(m[m != 0]))
+    nou = np.zeros(nr_var + 1, dtype=np.int64)
+    nou[variabile] = np.arange(1, len(variabile) + 1)
+    m = np.sign(m) * nou[np.abs(m)]
+
+    # inapoi la forma compacta: literalii nenuli ai fiecarui rand, urmati de 0
+    lungimi = (m != 0).sum(axis=1)
+    plat = np.insert(m[m != 0], np.cumsum(lungimi), 0)
+    literali = array('i')
+    literali.frombytes(plat.astype(np.int32).tobytes())
+    statistici['variabile_ramase'] = len(variabile)
+    statistici['clauze_ramase'] = len(m)
+    return Preprocesare(None, FormulaCompacta(literali), atribuiri, variabile.tolist(), statistici)
+
+
+def _sorteaza_randuri(m):
+    """Sorteaza fiecare rand dupa (variabila, semn), cu golurile (0) la final."""
+    cheie = np.where(m == 0, np.iinfo(np.int64).max, np.abs(m) * 2 + (m < 0))
+    return np.take_along_axis(m, np.argsort(cheie, axis=1, kind='stable'), axis=1)
+
+
+def _atribuiri(valoare) -> Dict[int, bool]:
+    fixate = np.flatnonzero(valoare)
+    return dict(zip(fixate.tolist(), (valoare[fixate] > 0).tolist()))
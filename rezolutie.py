@@ -1,96 +1,130 @@
-from typing import Set, FrozenSet, Dict
-from masurare_performanta import timp_si_memorie # decorator care masoara timpul si memoria
+import time
+from typing import Set, FrozenSet, Optional
+from masurare_performanta import timp_si_memorie, Contoare # decorator care masoara timpul si memoria
+from clauze_biti import alege_forma
+from anulare import JETON  # anularea cooperativa a jobului curent (termenul din lucrator)
 
 @timp_si_memorie
-def rezolutie(clauze: Set[FrozenSet[int]]) -> bool:
+def rezolutie(clauze: Set[FrozenSet[int]], contoare: bool = False,
+              latime_maxima: Optional[int] = None, generatii_maxime: Optional[int] = None,
+              biti: Optional[bool] = None):
     """
-    Rezolutie optimizata prin set-of-support + index pe literali + grupare pe lungime.
+    Rezolutie optimizata prin set-of-support + index de subsumare (liste de aparitii + semnaturi).
     “suport” (Set-Of-Support) e o multime de clauze proaspat adaugate,
     pe care le combinam cu clauzele deja stabilite (baza) pentru a genera
     doar rezolventi noi. La fiecare pas:
     1. luam fiecare clauza din “suport” si o rezolvam cu clauzele din “baza”
-    2. colectam noii rezolventi intr-un set temporar
-    3. actualizam “suport” cu acest nou set, iar clauzele vechi din “suport” raman in “baza”
+    2. pastram doar rezolventii care nu sunt subsumati de baza sau de alt rezolvent nou
+    3. rezolventii noi scot din baza clauzele pe care le subsumeaza (mai slabe),
+       apoi devin urmatorul “suport”
     False la prima clauza vida (UNSAT), altfel True cand nu mai pot aparea clauze noi (SAT).
+    Limite optionale, dupa care raspunsul este None (necunoscut):
+    - `latime_maxima`: rezolventii mai lungi sunt aruncati (deci SAT nu mai poate fi dedus)
+    - `generatii_maxime`: numarul maxim de generatii de rezolventi
+    Cu `contoare=True` returneaza si (generatii, rezolventi, tautologii, redundante,
+    clauze subsumate inapoi, rezolventi prea lungi) plus timpii pe faze.
+    `biti` alege forma clauzelor (vezi `clauze_biti.alege_forma`): masti de biti (True),
+    frozenset (False) sau automat dupa numarul de variabile (None).
     """
-    # multimea initiala de clauze
-    baza: Set[FrozenSet[int]] = set(clauze)
-
-    # grupam clauzele dupa lungime, pentru verificare rapida de redundant
-    dupa_lungime: Dict[int, Set[FrozenSet[int]]] = {}
-    for cl in baza:
-        dupa_lungime.setdefault(len(cl), set()).add(cl)
-
-    # index literal - clauze care contin literalul
-    index_lit: Dict[int, Set[FrozenSet[int]]] = {}
-    for cl in baza:
-        for lit in cl:
-            index_lit.setdefault(lit, set()).add(cl)
-    obt_lit = index_lit.get  # shortcut pentru acces
+    st = Contoare() if contoare else None
+    sat = _rezolutie(clauze, st, latime_maxima, generatii_maxime, biti)
+    return (sat, st.ca_dict()) if st else sat
+
+
+def _rezolutie(clauze: Set[FrozenSet[int]], st, latime_maxima: Optional[int],
+               generatii_maxime: Optional[int], biti: Optional[bool] = None) -> Optional[bool]:
+    forma = alege_forma(clauze, biti)
+    literali, lungime, rezolvent = forma.literali, forma.lungime, forma.rezolvent
+    # baza indexata cu clauzele initiale (tautologiile sunt mereu adevarate si nu conteaza)
+    baza = forma.index()
+    for cl in clauze:
+        if not cl:
+            return False
+        cl = forma.din_literali(cl)
+        if not forma.tautologie(cl):
+            baza.adauga(cl)
+    obt_lit = baza.cu_literal  # shortcut pentru acces
 
     # SOS (set-of-support) porneste cu toate clauzele initiale
-    suport: Set[FrozenSet[int]] = set(baza)
+    suport = set(baza)
+    verifica = JETON.verifica
+    generatii = 0
+    taiate = False   # am aruncat vreun rezolvent prea lung?
 
     while suport:
-        urmator_suport: Set[FrozenSet[int]] = set()
-
-        # pentru fiecare clauza din suport
+        if generatii_maxime is not None and generatii >= generatii_maxime:
+            return None
+        generatii += 1
+        # rezolventii noi ai generatiei, indexati si ei ca sa se subsumeze intre ei
+        noi = forma.index()
+        if st:
+            st.adauga('generatii')
+
+        # pentru fiecare clauza din suport (sarim clauzele subsumate intre timp);
+        # ne oprim (cu `Anulat`) daca jobul si-a depasit termenul
         for cl1 in suport:
-            for lit in cl1:
+            verifica()
+            if cl1 not in baza:
+                continue
+            for lit in literali(cl1):
                 # luam doar clauzele din baza care contin literalul opus
-                for cl2 in obt_lit(-lit, ()):
-                    # construim rezolventul
-                    rez = (set(cl1) - {lit}) | (set(cl2) - {-lit})
-
-                    # sarim tautologiile (lit si -lit in aceeasi clauza)
-                    valid = True
-                    for l in rez:
-                        if -l in rez:
-                            valid = False
-                            break
-                    if not valid:
+                for cl2 in obt_lit(-lit):
+                    # construim rezolventul; None daca e tautologie (lit si -lit in aceeasi clauza)
+                    rez = rezolvent(cl1, cl2, lit)
+                    if rez is None:
+                        if st:
+                            st.adauga('tautologii')
                         continue
-
-                    rez_fs = frozenset(rez)
+                    if st:
+                        st.adauga('rezolventi')
 
                     # UNSAT imediat daca clauza vida
-                    if not rez_fs:
+                    n = lungime(rez)
+                    if not n:
                         return False
 
-                    # daca deja exista in baza sau in lista urmatoarelor, sarim
-                    if rez_fs in baza or rez_fs in urmator_suport:
+                    if latime_maxima is not None and n > latime_maxima:
+                        if st:
+                            st.adauga('prea_lungi')
+                        taiate = True
                         continue
 
-                    # verificare rapida de acoperire:
-                    # exista deja o clauza de lungime <= len(rez_fs) care e subset?
-                    len_rez = len(rez_fs)
-                    redundant = False
-                    for lung in range(1, len_rez + 1):
-                        for cl_exist in dupa_lungime.get(lung, ()):
-                            if cl_exist <= rez_fs:
-                                redundant = True
-                                break
-                        if redundant:
-                            break
-                    if redundant:
+                    # subsumare inainte: exista deja o clauza (veche sau noua) inclusa in rez?
+                    if st:
+                        t0 = time.perf_counter()
+                    semn = forma.semnatura(rez)
+                    if baza.subsumata(rez, semn) or noi.subsumata(rez, semn):
+                        if st:
+                            st.adauga('redundante')
+                            st.cronometreaza('redundanta', t0)
                         continue
-
-                    # clauza noua utila
-                    urmator_suport.add(rez_fs)
-
-        # daca nu s-au generat rezolventi noi, formula e SAT
-        if not urmator_suport:
-            return True
-
-        # adaugam rezolventi noi in baza, index si grupari
-        for r in urmator_suport:
-            baza.add(r)
-            dupa_lungime.setdefault(len(r), set()).add(r)
-            for lit in r:
-                index_lit.setdefault(lit, set()).add(r)
+                    # subsumare inapoi printre rezolventii noi
+                    for d in noi.subsumate_de(rez, semn):
+                        noi.sterge(d)
+                    noi.adauga(rez, semn)
+                    if st:
+                        st.cronometreaza('redundanta', t0)
+
+        # daca nu s-au generat rezolventi noi, formula e SAT (daca nu am aruncat nimic)
+        if not noi:
+            return None if taiate else True
+
+        # rezolventii noi scot din baza clauzele mai slabe, apoi intra in baza
+        if st:
+            t0 = time.perf_counter()
+        for r in noi:
+            verifica()
+            subsumate = baza.subsumate_de(r)
+            for d in subsumate:
+                baza.sterge(d)
+            if st:
+                st.adauga('subsumate_inapoi', len(subsumate))
+            baza.adauga(r, noi.semnaturi[r])
+        if st:
+            st.cronometreaza('subsumare_inapoi', t0)
 
         # pregatim urmatoarea generatie de procesat
-        suport = urmator_suport
+        suport = set(noi)
 
     # daca s-a golit suport fara clauza vida, SAT
-    return True
+    return None if taiate else True
@@ -0,0 +1,284 @@
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from masurare_performanta import timp_si_memorie
+from dp import dp
+from motor_dpll import dpll_trail
+from cdcl import cdcl
+
+# rutele posibile ale solver-ului automat: doua cazuri polinomiale, apoi motoarele generale
+RUTE = ('2-SAT', 'Horn', 'DP', 'DPLL-Trail', 'CDCL')
+
+# pragurile de rutare (vezi `alege_ruta`), calibrate pe suita implicita din benchmark.py;
+# se pot recalibra (`calibreaza`). Acolo DP nu castiga pe nicio formula generala, deci
+# ruta DP este oprita implicit (0 variabile).
+PRAGURI_IMPLICITE: Dict[str, int] = {
+    'dp_variabile': 0,        # DP pana la atatea variabile
+    'trail_clauze': 500,      # DPLL-Trail pana la atatea clauze, CDCL peste
+}
+
+
+class Caracteristici(NamedTuple):
+    """Trasaturile ieftine ale unei formule, calculate intr-o singura trecere (vezi `caracteristici`)."""
+    variabile: int
+    clauze: int
+    raport: float                  # clauze / variabile
+    histograma: Dict[int, int]     # lungimea clauzei -> numarul de clauze
+    frac_horn: float               # fractia clauzelor Horn (cel mult un literal pozitiv)
+    frac_2sat: float               # fractia clauzelor cu cel mult doi literali
+
+    def ca_dict(self) -> Dict[str, Any]:
+        """Trasaturile scalare, pentru `Masurare.statistici`."""
+        return {'variabile': self.variabile, 'clauze': self.clauze, 'raport': round(self.raport, 3),
+                'frac_horn': round(self.frac_horn, 3), 'frac_2sat': round(self.frac_2sat, 3)}
+
+
+def caracteristici(clauze: Iterable[Iterable[int]]) -> Caracteristici:
+    """Numar de variabile si clauze, raportul lor, histograma lungimilor si fractiile Horn / 2-SAT."""
+    variabile: Set[int] = set()
+    histograma: Dict[int, int] = {}
+    n = horn = doi = 0
+    for c in clauze:
+        n += 1
+        k = pozitivi = 0
+        for l in c:
+            k += 1
+            pozitivi += l > 0
+            variabile.add(abs(l))
+        histograma[k] = histograma.get(k, 0) + 1
+        horn += pozitivi <= 1
+        doi += k <= 2
+    return Caracteristici(len(variabile), n, n / len(variabile) if variabile else 0.0,
+                          dict(sorted(histograma.items())), horn / n if n else 1.0, doi / n if n else 1.0)
+
+
+def alege_ruta(car: Caracteristici, praguri: Optional[Dict[str, int]] = None) -> str:
+    """
+    Ruta unei formule dupa trasaturile ei:
+    1. toate clauzele au cel mult doi literali -> '2-SAT' (componente tare conexe, timp liniar)
+    2. toate clauzele sunt Horn -> 'Horn' (propagare de unitati, timp liniar)
+    3. cel mult `dp_variabile` variabile -> 'DP'
+    4. cel mult `trail_clauze` clauze -> 'DPLL-Trail'
+    5. altfel 'CDCL'
+    Pragurile lipsa din `praguri` se iau din PRAGURI_IMPLICITE.
+    """
+    praguri = dict(PRAGURI_IMPLICITE, **(praguri or {}))
+    if car.frac_2sat == 1.0:
+        return '2-SAT'
+    if car.frac_horn == 1.0:
+        return 'Horn'
+    if car.variabile <= praguri['dp_variabile']:
+        return 'DP'
+    if car.clauze <= praguri['trail_clauze']:
+        return 'DPLL-Trail'
+    return 'CDCL'
+
+
+# ---------------------------------------------------------------- cazuri polinomiale
+
+
+def _tarjan(graf: List[List[int]]) -> List[int]:
+    """
+    Componentele tare conexe (Tarjan, iterativ, fara limita de recursivitate):
+    comp[nod] = numarul componentei, in ordine topologica inversa (prima terminata e o destinatie).
+    """
+    n = len(graf)
+    index = [-1] * n
+    low = [0] * n
+    comp = [-1] * n
+    pe_stiva = [False] * n
+    stiva: List[int] = []
+    contor = nr_comp = 0
+    for s in range(n):
+        if index[s] != -1:
+            continue
+        index[s] = low[s] = contor
+        contor += 1
+        stiva.append(s)
+        pe_stiva[s] = True
+        apeluri = [(s, 0)]
+        while apeluri:
+            v, i = apeluri[-1]
+            if i < len(graf[v]):
+                apeluri[-1] = (v, i + 1)
+                w = graf[v][i]
+                if index[w] == -1:
+                    index[w] = low[w] = contor
+                    contor += 1
+                    stiva.append(w)
+                    pe_stiva[w] = True
+                    apeluri.append((w, 0))
+                elif pe_stiva[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            apeluri.pop()
+            if apeluri:
+                u = apeluri[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stiva.pop()
+                    pe_stiva[w] = False
+                    comp[w] = nr_comp
+                    if w == v:
+                        break
+                nr_comp += 1
+    return comp
+
+
+def doi_sat(clauze: Iterable[Iterable[int]]) -> Tuple[bool, Optional[List[int]]]:
+    """
+    2-SAT in timp liniar: fiecare clauza (a v b) da implicatiile -a -> b si -b -> a (o unitate a,
+    -a -> a). Formula e UNSAT exact cand un literal si opusul lui sunt in aceeasi componenta
+    tare conexa; altfel x e adevarat daca componenta lui x vine dupa cea a lui -x in ordinea
+    topologica. Returneaza (sat, model ca literali DIMACS la SAT).
+    """
+    var_id: Dict[int, int] = {}
+    variabile: List[int] = []
+    muchii: List[Tuple[int, int]] = []
+
+    def nod(l: int) -> int:
+        v = var_id.get(abs(l))
+        if v is None:
+            v = var_id[abs(l)] = len(variabile)
+            variabile.append(abs(l))
+        return 2 * v + (l < 0)
+
+    for c in clauze:
+        c = list(c)
+        if len(c) > 2:
+            raise ValueError("Formula nu este 2-SAT (clauza cu peste doi literali)")
+        if not c:
+            return False, None
+        a, b = (c[0], c[0]) if len(c) == 1 else c
+        x, y = nod(a), nod(b)
+        if a == -b:
+            continue                         # tautologie
+        muchii.append((x ^ 1, y))
+        muchii.append((y ^ 1, x))
+
+    graf: List[List[int]] = [[] for _ in range(2 * len(variabile))]
+    for u, w in muchii:
+        graf[u].append(w)
+    comp = _tarjan(graf)
+    model = []
+    for i, v in enumerate(variabile):
+        if comp[2 * i] == comp[2 * i + 1]:
+            return False, None
+        model.append(v if comp[2 * i] < comp[2 * i + 1] else -v)
+    return True, model
+
+
+def horn(clauze: Iterable[Iterable[int]]) -> Tuple[bool, Optional[List[int]]]:
+    """
+    Formule Horn (cel mult un literal pozitiv pe clauza) in timp liniar: pornind de la fapte,
+    o variabila devine adevarata cand toate premisele (literalii negati) unei clauze sunt
+    adevarate; o clauza fara concluzie cu toate premisele adevarate da UNSAT. Modelul este cel
+    minimal: variabilele nederivate sunt false. Returneaza (sat, model ca literali DIMACS la SAT).
+    """
+    concluzie: List[Optional[int]] = []      # literalul pozitiv al clauzei, sau None
+    ramase: List[int] = []                   # premise inca nesatisfacute
+    premisa_in: Dict[int, List[int]] = {}    # variabila -> clauzele in care apare negata
+    variabile: Set[int] = set()
+    adevarate: Set[int] = set()
+    coada: List[int] = []
+    for c in clauze:
+        c = set(c)
+        pozitivi = [l for l in c if l > 0]
+        if len(pozitivi) > 1:
+            raise ValueError("Formula nu este Horn (clauza cu mai multi literali pozitivi)")
+        variabile.update(abs(l) for l in c)
+        if pozitivi and -pozitivi[0] in c:
+            continue                         # tautologie
+        ci = len(concluzie)
+        concluzie.append(pozitivi[0] if pozitivi else None)
+        ramase.append(len(c) - len(pozitivi))
+        for l in c:
+            if l < 0:
+                premisa_in.setdefault(-l, []).append(ci)
+        if not ramase[ci]:
+            if concluzie[ci] is None:
+                return False, None           # clauza vida
+            coada.append(concluzie[ci])
+
+    while coada:
+        v = coada.pop()
+        if v in adevarate:
+            continue
+        adevarate.add(v)
+        for ci in premisa_in.get(v, ()):
+            ramase[ci] -= 1
+            if not ramase[ci]:
+                if concluzie[ci] is None:
+                    return False, None
+                if concluzie[ci] not in adevarate:
+                    coada.append(concluzie[ci])
+    return True, sorted((v if v in adevarate else -v for v in variabile), key=abs)
+
+
+# ---------------------------------------------------------------- solver-ul automat
+
+# motoarele generale ale rutelor, cu aceleasi optiuni ca in SOLVERS
+MOTOARE = {'DP': dp, 'DPLL-Trail': dpll_trail, 'CDCL': cdcl}
+
+
+@timp_si_memorie
+def auto(clauze: Set[FrozenSet[int]], praguri: Optional[Dict[str, int]] = None,
+         optiuni_ruta: Optional[Dict[str, Dict[str, Any]]] = None, model: bool = False):
+    """
+    Solver automat: calculeaza trasaturile formulei (vezi `caracteristici`), alege ruta
+    (vezi `alege_ruta`, cu `praguri`) si rezolva formula pe ea. `optiuni_ruta` tine optiunile
+    fiecarui motor general (de ex. forma clauzelor sau contoarele DP), ca in `optiuni_solvers`.
+    Ruta aleasa si trasaturile apar in statistici (`ruta=...`), alaturi de cele ale motorului.
+    """
+    car = caracteristici(clauze)
+    ruta = alege_ruta(car, praguri)
+    statistici: Dict[str, Any] = dict(ruta=ruta, **car.ca_dict())
+    if ruta in MOTOARE:
+        optiuni = dict((optiuni_ruta or {}).get(ruta) or {}, nivel_masurare='oprit')
+        if model:
+            optiuni['model'] = True
+        masurare = MOTOARE[ruta](clauze, **optiuni)
+        sat, lista = masurare.sat, masurare.model
+        statistici.update(masurare.statistici)
+    else:
+        sat, lista = (doi_sat if ruta == '2-SAT' else horn)(clauze)
+    if model:
+        return sat, statistici, lista if sat else None
+    return sat, statistici
+
+
+# ---------------------------------------------------------------- calibrare
+
+
+def calibreaza(masuratori: List[Tuple[Caracteristici, Dict[str, Optional[float]]]],
+               penalizare: Optional[float] = None) -> Dict[str, int]:
+    """
+    Pragurile care minimizeaza timpul total al rutelor pe `masuratori`: perechi
+    (trasaturile formulei, durata fiecarui motor general pe ea; None = timeout / eroare).
+    Cautare pe grila: candidatii sunt 0 si valorile observate. Formulele 2-SAT si Horn nu
+    depind de praguri si sunt ignorate; o durata lipsa costa `penalizare`
+    (implicit de zece ori cea mai mare durata masurata).
+    """
+    generale = [(car, durate) for car, durate in masuratori
+                if alege_ruta(car, {'dp_variabile': -1, 'trail_clauze': -1}) == 'CDCL']
+    if not generale:
+        return dict(PRAGURI_IMPLICITE)
+    if penalizare is None:
+        penalizare = 10 * max((d for _, durate in generale for d in durate.values() if d is not None),
+                              default=1.0)
+
+    def cost(ruta: str, durate: Dict[str, Optional[float]]) -> float:
+        d = durate.get(ruta)
+        return penalizare if d is None else d
+
+    cel_mai_bun: Tuple[float, int, int] = (float('inf'), 0, 0)
+    for prag_dp in sorted({0} | {car.variabile for car, _ in generale}):
+        # formulele care raman pentru DPLL-Trail / CDCL la acest prag DP
+        dp_total = sum(cost('DP', d) for car, d in generale if car.variabile <= prag_dp)
+        rest = [(car.clauze, d) for car, d in generale if car.variabile > prag_dp]
+        for prag_trail in sorted({0} | {n for n, _ in rest}):
+            total = dp_total + sum(cost('DPLL-Trail' if n <= prag_trail else 'CDCL', d) for n, d in rest)
+            if total < cel_mai_bun[0]:
+                cel_mai_bun = (total, prag_dp, prag_trail)
+    return {'dp_variabile': cel_mai_bun[1], 'trail_clauze': cel_mai_bun[2]}
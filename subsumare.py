@@ -0,0 +1,138 @@
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set
+
+Clauza = FrozenSet[int]
+
+# multime goala folosita ca valoare implicita la cautarea in listele de aparitii
+_GOL: FrozenSet[Clauza] = frozenset()
+
+
+def semnatura(clauza: Clauza) -> int:
+    """
+    Semnatura unei clauze: o masca pe 64 de biti cu cate un bit pentru fiecare literal
+    (codul 2*v + semn, modulo 64). Daca c este inclusa in d, atunci semn(c) & ~semn(d) == 0,
+    deci majoritatea perechilor care nu se subsumeaza sunt respinse fara comparatie de multimi.
+    """
+    s = 0
+    for l in clauza:
+        s |= 1 << (((l << 1) if l > 0 else ((-l << 1) | 1)) & 63)
+    return s
+
+
+class IndexSubsumare:
+    """
+    Baza de clauze cu liste de aparitii (literal -> clauze) si semnaturi,
+    pentru subsumare incrementala:
+    - `subsumata(c)`   : exista deja o clauza d inclusa in c? (subsumare inainte)
+    - `subsumate_de(c)`: clauzele d care il includ pe c (subsumare inapoi)
+    Candidatii se iau doar din listele de aparitii ale literalilor lui c, iar semnaturile
+    filtreaza candidatii inainte de comparatia propriu-zisa, deci costul depinde de
+    clauzele atinse, nu de dimensiunea intregii baze.
+    """
+
+    def __init__(self):
+        self.aparitii: Dict[int, Set[Clauza]] = {}
+        self.semnaturi: Dict[Clauza, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.semnaturi)
+
+    def __contains__(self, clauza: Clauza) -> bool:
+        return clauza in self.semnaturi
+
+    def __iter__(self) -> Iterator[Clauza]:
+        return iter(self.semnaturi)
+
+    def cu_literal(self, lit: int) -> Set[Clauza]:
+        """Clauzele care contin literalul `lit` (multimea interna, nu se modifica din afara)."""
+        return self.aparitii.get(lit, _GOL)
+
+    def numar(self, lit: int) -> int:
+        """Numarul de clauze care contin literalul `lit`."""
+        return len(self.aparitii.get(lit, _GOL))
+
+    def adauga(self, clauza: Clauza, semn: Optional[int] = None) -> None:
+        if clauza in self.semnaturi:
+            return
+        self.semnaturi[clauza] = semnatura(clauza) if semn is None else semn
+        for l in clauza:
+            ap = self.aparitii.get(l)
+            if ap is None:
+                self.aparitii[l] = {clauza}
+            else:
+                ap.add(clauza)
+
+    def sterge(self, clauza: Clauza) -> None:
+        del self.semnaturi[clauza]
+        for l in clauza:
+            ap = self.aparitii[l]
+            ap.discard(clauza)
+            if not ap:
+                del self.aparitii[l]
+
+    def subsumata(self, clauza: Clauza, semn: Optional[int] = None) -> bool:
+        """
+        True daca baza contine o clauza inclusa in `clauza` (sau egala cu ea).
+        `semn` este semnatura clauzei, daca a fost deja calculata.
+        """
+        if clauza in self.semnaturi:
+            return True
+        s = semnatura(clauza) if semn is None else semn
+        n = len(clauza)
+        semnaturi = self.semnaturi
+        for l in clauza:
+            for d in self.aparitii.get(l, _GOL):
+                if len(d) <= n and not (semnaturi[d] & ~s) and d <= clauza:
+                    return True
+        return False
+
+    def subsumate_de(self, clauza: Clauza, semn: Optional[int] = None) -> List[Clauza]:
+        """Clauzele din baza care includ strict `clauza`."""
+        if not clauza:
+            return [d for d in self.semnaturi if d]
+        # orice clauza care include `clauza` contine si literalul ei cel mai rar
+        aparitii = self.aparitii
+        rar = min(clauza, key=lambda l: len(aparitii.get(l, _GOL)))
+        s = semnatura(clauza) if semn is None else semn
+        n = len(clauza)
+        semnaturi = self.semnaturi
+        return [d for d in aparitii.get(rar, _GOL)
+                if len(d) > n and not (s & ~semnaturi[d]) and clauza < d]
+
+
+
+class ClauzeMultimi:
+    """
+    Forma clasica a clauzelor: frozenset de literali DIMACS, indexate cu `IndexSubsumare`.
+    DP si Rezolutie lucreaza doar prin aceste operatii, deci pot folosi la fel si forma
+    pe masti de biti (vezi `clauze_biti.ClauzeBiti`).
+    """
+
+    def din_literali(self, literali) -> Clauza:
+        return frozenset(literali)
+
+    def literali(self, clauza: Clauza) -> Clauza:
+        return clauza
+
+    def lungime(self, clauza: Clauza) -> int:
+        return len(clauza)
+
+    def semnatura(self, clauza: Clauza) -> int:
+        return semnatura(clauza)
+
+    def tautologie(self, clauza: Clauza) -> bool:
+        return any(-l in clauza for l in clauza)
+
+    def fara(self, clauza: Clauza, lit: int) -> Clauza:
+        """Clauza fara literalul `lit`."""
+        return clauza - {lit}
+
+    def rezolvent(self, c1: Clauza, c2: Clauza, lit: int) -> Optional[Clauza]:
+        """Rezolventul lui c1 (care contine `lit`) cu c2 (care contine -`lit`); None daca e tautologie."""
+        r = (c1 - {lit}) | (c2 - {-lit})
+        return None if any(-l in r for l in r) else r
+
+    def index(self) -> IndexSubsumare:
+        return IndexSubsumare()
+
+
+MULTIMI = ClauzeMultimi()